@@ -0,0 +1,140 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from constants import PREFETCH_WINDOW, MINIGAME_PRELOAD
+from opcodes import Background, Character, Sound, Music, Minigame
+from minigame_registry import minigame_registry
+from surface_cache import surface_cache, normalize
+from sound_cache import sound_cache
+from music_engine import music_engine
+from presenter import presenter
+
+class AssetPrefetcher:
+    """Decodes the assets of upcoming script commands on a worker thread.
+
+    The runner calls `update(idx)` as it reaches each opcode; the next
+    `window` opcodes of the compiled script are scanned and their images and sounds
+    are loaded in the background (music tracks are handed to the music engine). Finished images are moved into the shared
+    surface cache on the main thread, so any display conversion happens
+    there and later `load_image` calls are plain cache hits.
+    """
+
+    def __init__(self, window=PREFETCH_WINDOW):
+        self.window = window
+        self.ops = []
+        self.screen_size = None
+        self.scanned_to = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._images = {}
+        self._sounds = {}
+
+        # Hit: asset was ready when the runner asked for it.
+        # Late: asset was still decoding and the runner had to wait.
+        # Miss: asset was never scheduled (outside the window).
+        self.hits = 0
+        self.late = 0
+        self.misses = 0
+
+    def reset(self, ops, screen_size):
+        """Start prefetching for a new script run, dropping pending work."""
+        for jobs in (self._images, self._sounds):
+            for future in jobs.values():
+                future.cancel()
+            jobs.clear()
+        self.ops = ops
+        self.screen_size = screen_size
+        self.scanned_to = 0
+
+    def update(self, idx):
+        """Schedule assets for opcodes in (idx, idx + window]."""
+        start = max(idx + 1, self.scanned_to)
+        end = min(len(self.ops), idx + 1 + self.window)
+        for op in self.ops[start:end]:
+            self._schedule(op)
+        self.scanned_to = max(self.scanned_to, end)
+
+    def _schedule(self, op):
+        if isinstance(op, Background):
+            self._schedule_image(op.file, self.screen_size)
+        elif isinstance(op, Character):
+            self._schedule_image(op.file, presenter.asset_size(op.size))
+        elif isinstance(op, Sound) and op.file:
+            if op.file not in self._sounds and not sound_cache.contains(op.file):
+                self._sounds[op.file] = self._executor.submit(sound_cache.load, op.file)
+        elif isinstance(op, Music):
+            music_engine.preload(op.file)
+        elif isinstance(op, Minigame) and MINIGAME_PRELOAD:
+            minigame_registry.preload(op.kind)
+
+    def _schedule_image(self, path, size, mode="auto"):
+        key = surface_cache.make_key(path, size, mode)
+        if key in self._images or surface_cache.contains(path, size, mode):
+            return
+        self._images[key] = self._executor.submit(self._decode_image, path, size)
+
+    @staticmethod
+    def _decode_image(path, size):
+        # Runs on the worker: decode and scale only, conversion needs the display
+        surface = pygame.image.load(path)
+        if size and surface.get_size() != tuple(size):
+            surface = pygame.transform.scale(surface, size)
+        return surface
+
+    def _claim(self, jobs, key):
+        """Pop a scheduled job's result, counting whether it was ready in time."""
+        future = jobs.pop(key, None)
+        if future is None:
+            self.misses += 1
+            return None
+        if future.done():
+            self.hits += 1
+        else:
+            self.late += 1
+        try:
+            return future.result()
+        except Exception as e:
+            logging.error(f"Prefetch failed for {key}: {e}")
+            return None
+
+    def load_image(self, path, size=None, mode="auto"):
+        """Return a display-ready surface, using the prefetched decode if any."""
+        key = surface_cache.make_key(path, size, mode)
+        if key not in self._images:
+            if not surface_cache.contains(path, size, mode):
+                self.misses += 1
+            return surface_cache.load(path, size, mode)
+        surface = self._claim(self._images, key)
+        if surface is None:
+            return surface_cache.load(path, size, mode)
+        surface_cache.check_format()
+        surface = normalize(surface, key[2])
+        surface_cache.put(key, surface)
+        return surface
+
+    def load_sound(self, path):
+        """Return the Sound for `path` from the shared cache, waiting on its prefetch if any."""
+        if path not in self._sounds:
+            if not sound_cache.contains(path):
+                self.misses += 1
+            return sound_cache.load(path)
+        sound = self._claim(self._sounds, path)
+        return sound if sound is not None else sound_cache.load(path)
+
+    def stats(self):
+        """Return hit/late/miss counters for tuning the look-ahead window."""
+        scheduled = self.hits + self.late
+        return {
+            'window': self.window,
+            'hits': self.hits,
+            'late': self.late,
+            'misses': self.misses,
+            'late_rate': self.late / scheduled if scheduled else 0.0
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Asset prefetcher: {self.stats()}")
+
+    def shutdown(self):
+        """Stop the worker thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import wave
+import shutil
+import hashlib
+import logging
+import threading
+import subprocess
+import pygame
+from constants import AUDIO_CACHE_DIR, AUDIO_EFFECT_DIRS, AUDIO_MUSIC_DIRS
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg")
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+class AudioCache:
+    """Pre-decoded copies of the game's audio, built offline.
+
+    `build()` transcodes sound effects to PCM WAV (decoded with the mixer
+    and written with the `wave` module) and music to OGG (with ffmpeg, if
+    it is installed; otherwise music is left as it is). Outputs are named
+    by the SHA-1 of their source under cache/audio, and manifest.json maps
+    each source to its hash and output. At runtime `resolve(path)` returns
+    the transcoded file when the source still hashes the same, and the
+    source itself otherwise, so a stale or missing cache only costs speed.
+    Lookups are thread-safe: the prefetcher resolves from its worker.
+    """
+
+    def __init__(self, cache_dir=AUDIO_CACHE_DIR):
+        self.base_dir = os.path.dirname(os.path.abspath(__file__))
+        self.cache_dir = os.path.join(self.base_dir, cache_dir)
+        self.manifest_file = os.path.join(self.cache_dir, "manifest.json")
+        self._manifest = None
+        self._resolved = {}
+        self._lock = threading.RLock()
+
+        # Counters
+        self.cached = 0
+        self.stale = 0
+        self.uncached = 0
+
+    def _key(self, path):
+        return os.path.relpath(os.path.abspath(path), self.base_dir).replace(os.sep, "/")
+
+    def _load_manifest(self):
+        if self._manifest is None:
+            try:
+                with open(self.manifest_file, encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_file)
+
+    def _is_current(self, path, entry):
+        """Check a manifest entry against its source: mtime/size first, then the hash."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if (entry.get('mtime'), entry.get('size')) == (st.st_mtime_ns, st.st_size):
+            return True
+        return entry.get('hash') == _file_hash(path)
+
+    def resolve(self, path):
+        """Return the transcoded file for `path` if it is up to date, else `path`."""
+        with self._lock:
+            resolved = self._resolved.get(path)
+            if resolved is not None:
+                return resolved
+            resolved = path
+            entry = self._load_manifest().get(self._key(path))
+            if entry is None:
+                self.uncached += 1
+            else:
+                output = os.path.join(self.cache_dir, entry['output'])
+                if os.path.exists(output) and self._is_current(path, entry):
+                    resolved = output
+                    self.cached += 1
+                else:
+                    self.stale += 1
+            self._resolved[path] = resolved
+            return resolved
+
+    def sources(self):
+        """Yield (source path, kind) for every audio file the build covers."""
+        for kind, dirs in (("effect", AUDIO_EFFECT_DIRS), ("music", AUDIO_MUSIC_DIRS)):
+            for rel_dir in dirs:
+                folder = os.path.join(self.base_dir, rel_dir)
+                if not os.path.isdir(folder):
+                    continue
+                for name in sorted(os.listdir(folder)):
+                    if name.lower().endswith(AUDIO_EXTENSIONS):
+                        yield os.path.join(folder, name), kind
+
+    def build(self):
+        """Transcode every out-of-date source. Returns {source: output or None}."""
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        ffmpeg = shutil.which("ffmpeg")
+        results = {}
+        for path, kind in self.sources():
+            key = self._key(path)
+            entry = manifest.get(key)
+            if entry and os.path.exists(os.path.join(self.cache_dir, entry['output'])) and self._is_current(path, entry):
+                results[key] = entry['output']
+                continue
+
+            digest = _file_hash(path)
+            try:
+                if kind == "effect":
+                    output = self._to_wav(path, digest)
+                elif ffmpeg:
+                    output = self._to_ogg(ffmpeg, path, digest)
+                else:
+                    logging.info(f"ffmpeg not found, leaving {key} as it is")
+                    output = None
+            except (pygame.error, OSError, subprocess.CalledProcessError) as e:
+                logging.warning(f"Could not transcode {key}: {e}")
+                output = None
+
+            if output is None:
+                manifest.pop(key, None)
+            else:
+                st = os.stat(path)
+                manifest[key] = {'hash': digest, 'output': output, 'mtime': st.st_mtime_ns, 'size': st.st_size}
+            results[key] = output
+        self._remove_orphans()
+        self._save_manifest()
+        with self._lock:
+            self._resolved.clear()
+        return results
+
+    def _to_wav(self, path, digest):
+        """Decode with the mixer and write the samples as PCM WAV."""
+        output = f"{digest}.wav"
+        frequency, size, channels = pygame.mixer.get_init()
+        raw = pygame.mixer.Sound(path).get_raw()
+        if size < 0 and abs(size) == 8:
+            # WAV stores 8-bit samples unsigned
+            raw = bytes((b + 128) & 0xFF for b in raw)
+        tmp_path = os.path.join(self.cache_dir, output + ".tmp")
+        with wave.open(tmp_path, "wb") as f:
+            f.setnchannels(channels)
+            f.setsampwidth(abs(size) // 8)
+            f.setframerate(frequency)
+            f.writeframes(raw)
+        os.replace(tmp_path, os.path.join(self.cache_dir, output))
+        return output
+
+    def _to_ogg(self, ffmpeg, path, digest):
+        output = f"{digest}.ogg"
+        tmp_path = os.path.join(self.cache_dir, output + ".tmp.ogg")
+        subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-i", path, "-c:a", "libvorbis", "-q:a", "5", tmp_path],
+                       check=True)
+        os.replace(tmp_path, os.path.join(self.cache_dir, output))
+        return output
+
+    def _remove_orphans(self):
+        """Delete outputs no manifest entry points at (their source changed or went away)."""
+        keep = {entry['output'] for entry in self._manifest.values()} | {"manifest.json"}
+        for name in os.listdir(self.cache_dir):
+            if name not in keep:
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def disk_bytes(self):
+        """Return the total size of the cache directory."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        return sum(os.path.getsize(os.path.join(self.cache_dir, n)) for n in os.listdir(self.cache_dir))
+
+    def stats(self):
+        """Return how many lookups used the transcoded file."""
+        return {
+            'cached': self.cached,
+            'stale': self.stale,
+            'uncached': self.uncached
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Audio cache: {self.stats()}")
+
+
+# Shared instance used by the sound cache and music loading
+audio_cache = AudioCache()
+
+
+def _decode_ms(path, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pygame.mixer.Sound(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    # Build step and report: python audio_cache.py
+    logging.basicConfig(level=logging.INFO)
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.init()
+    start = time.perf_counter()
+    results = audio_cache.build()
+    print(f"built {sum(1 for o in results.values() if o)}/{len(results)} files in {time.perf_counter() - start:.2f} s")
+
+    source_bytes = 0
+    for key, output in results.items():
+        source = os.path.join(audio_cache.base_dir, key)
+        source_bytes += os.path.getsize(source)
+        if output is None:
+            print(f"  {key:60s} (not transcoded)")
+        elif output.endswith(".wav"):
+            before = _decode_ms(source)
+            after = _decode_ms(os.path.join(audio_cache.cache_dir, output))
+            print(f"  {key:60s} {before:7.2f} ms -> {after:6.2f} ms")
+        else:
+            print(f"  {key:60s} -> {output}")
+    print(f"sources {source_bytes / 1e6:.1f} MB, cache {audio_cache.disk_bytes() / 1e6:.1f} MB")
@@ -0,0 +1,129 @@
+import time
+import logging
+from constants import AUTOSAVE_SLOTS, AUTOSAVE_REBASE_FRACTION
+from save_writer import save_writer
+import snapshot
+
+class Autosaver:
+    """Writes autosaves into rotating `autosave_N` slots as deltas.
+
+    The first autosave (or the first after the previous delta grew past
+    `rebase_fraction` of its base) writes a full snapshot to
+    `autosave_base.sav`; every autosave slot then holds only what changed
+    since it (see `snapshot.encode_delta`), typically a few dozen bytes.
+    The writer keeps the previous base as its `.bak`, which deltas made
+    against it fall back to. Files live in the SaveSystem folder and are
+    indexed and loaded like any other slot.
+    """
+
+    def __init__(self, save_system, slots=AUTOSAVE_SLOTS, rebase_fraction=AUTOSAVE_REBASE_FRACTION):
+        self.save_system = save_system
+        self.slots = max(1, slots)
+        self.rebase_fraction = rebase_fraction
+        self._base = None       # (Snapshot, bytes) of the full snapshot deltas are made against
+        self._base_read = False
+        self._next = None
+
+        # Counters
+        self.saves = 0
+        self.rebases = 0
+        self.delta_bytes = 0
+        self.base_bytes = 0
+        self.encode_seconds = 0.0
+
+    def _read_base(self):
+        """Pick up the base a previous session left, so its autosaves stay readable."""
+        try:
+            with open(self.save_system.slot_path("autosave_base"), "rb") as f:
+                data = f.read()
+            return snapshot.decode(data), data
+        except (OSError, ValueError):
+            return None
+
+    def _next_slot(self):
+        if self._next is None:
+            # Carry on after the newest autosave on disk
+            slots = self.save_system.index.slots()
+            autos = [slot for slot in slots if isinstance(slot, str) and slot.startswith("autosave_")]
+            newest = max(autos, key=lambda slot: slots[slot].get('timestamp') or "", default=None)
+            self._next = int(newest[len("autosave_"):]) % self.slots if newest else 0
+        slot = f"autosave_{self._next + 1}"
+        self._next = (self._next + 1) % self.slots
+        return slot
+
+    def save(self, state, frame=None):
+        """Queue an autosave of a Snapshot (with a thumbnail of `frame` if given) and return its slot."""
+        start = time.perf_counter()
+        slot = self._next_slot()
+        self.save_system.stamp(state)
+        if frame is not None:
+            self.save_system.capture_thumbnail(state, slot, frame)
+        if not self._base_read:
+            self._base, self._base_read = self._read_base(), True
+
+        delta = None
+        if self._base is not None:
+            delta = snapshot.encode_delta(state, *self._base)
+            if len(delta) > self.rebase_fraction * len(self._base[1]):
+                delta = None
+        if delta is None:
+            base_data = snapshot.encode(state)
+            self._base = (state, base_data)
+            save_writer.write(self.save_system.slot_path("autosave_base"), base_data)
+            delta = snapshot.encode_delta(state, *self._base)
+            self.rebases += 1
+            self.base_bytes += len(base_data)
+
+        self.save_system.write_slot(slot, state, delta)
+        self.saves += 1
+        self.delta_bytes += len(delta)
+        self.encode_seconds += time.perf_counter() - start
+        return slot
+
+    def stats(self):
+        """Return autosave counts, average delta size and main-thread cost per autosave."""
+        return {
+            'saves': self.saves,
+            'rebases': self.rebases,
+            'avg_delta_bytes': self.delta_bytes // self.saves if self.saves else 0,
+            'base_bytes': self.base_bytes,
+            'avg_cost_ms': round(self.encode_seconds * 1000 / self.saves, 3) if self.saves else 0.0
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Autosaver: {self.stats()}")
+
+
+if __name__ == "__main__":
+    # Autosave a growing game into a scratch folder and compare with full saves
+    import os
+    import tempfile
+    import pygame
+    from save_system import SaveSystem
+    from snapshot import Snapshot
+
+    pygame.init()
+    os.chdir(tempfile.mkdtemp())
+    save_system = SaveSystem()
+    autosaver = Autosaver(save_system)
+    state = Snapshot(index=0, chapter="Chapter 1", music="sounds/music/intrigue.mp3", music_loop=True,
+                     gallery=["car_1"], minigames={'quiz': 4}, history=range(0, 4000, 2))
+    full_seconds = full_bytes = 0
+    for i in range(200):
+        state.index += 12
+        state.history += range(state.index - 10, state.index, 2)
+        if i % 50 == 49:
+            state.chapter = f"Chapter {i // 50 + 2}"
+        autosaver.save(state.copy())
+        start = time.perf_counter()
+        full_bytes += len(snapshot.encode(state))
+        full_seconds += time.perf_counter() - start
+    save_system.flush()
+
+    print(f"autosave: {autosaver.stats()}")
+    print(f"full save instead: {full_bytes // 200} bytes, {full_seconds * 1000 / 200:.3f} ms encode")
+    print(f"writer: {save_writer.stats()}")
+    newest = save_system.load_game(f"autosave_{(200 - 1) % autosaver.slots + 1}")
+    assert newest.as_dict() == dict(state.as_dict(), timestamp=newest.timestamp)
+    pygame.quit()
@@ -3,14 +3,13 @@ import pygame
 import sys
 import random
 import math
+from surface_cache import load_image
+from minigame_host import minigame_host, QUIT_GAME
+from font_registry import get_font
 
-# Initialize pygame
-pygame.init()
-
-# Screen setup
+# Screen setup; the window itself is created by start_cosmic_challenge
 WIDTH, HEIGHT = 1535, 810
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Cosmic Challenge")
+screen = None
 
 # Colors
 WHITE = (255, 255, 255)
@@ -24,13 +23,13 @@ ORANGE = (255, 150, 50)
 DARK_BLUE = (10, 10, 40)
 GRAY = (100, 100, 100)
 
-# Fonts
-title_font = pygame.font.Font(None, 72)
-font = pygame.font.Font(None, 48)
-small_font = pygame.font.Font(None, 32)
+# Fonts are created by start_cosmic_challenge, not at import (the module may be imported on a background thread)
+title_font = None
+font = None
+small_font = None
 
 # Game variables
-clock = pygame.time.Clock()
+clock = minigame_host.clock
 FPS = 60
 
 # Background particles (starfield)
@@ -47,19 +46,22 @@ for _ in range(100):
 # Get the directory of this file
 base_dir = os.path.dirname(__file__)
 
-# Load images
-try:
-    background = pygame.image.load(os.path.join(base_dir, "way.png"))
-    background = pygame.transform.scale(background, (WIDTH, HEIGHT))
-    player_image = pygame.image.load(os.path.join(base_dir, "car.png"))
-    player_image = pygame.transform.scale(player_image, (200, 200))
-    obstacle_image = pygame.image.load(os.path.join(base_dir, "cars.png"))
-    obstacle_image = pygame.transform.scale(obstacle_image, (200, 200))
-except:
-    # Fallback if images not found
-    background = None
-    player_image = None
-    obstacle_image = None
+# Images are loaded on first start, not at import
+background = None
+player_image = None
+obstacle_image = None
+
+def load_images():
+    global background, player_image, obstacle_image
+    try:
+        background = load_image(os.path.join(base_dir, "way.png"), (WIDTH, HEIGHT))
+        player_image = load_image(os.path.join(base_dir, "car.png"), (200, 200))
+        obstacle_image = load_image(os.path.join(base_dir, "cars.png"), (200, 200))
+    except:
+        # Fallback if images not found
+        background = None
+        player_image = None
+        obstacle_image = None
 
 # Player setup
 player_size = 100
@@ -285,10 +287,15 @@ def draw_exit_button():
 def start_cosmic_challenge():
     global running, game_active, level_complete, all_levels_complete, current_level, max_unlocked_level, score, obstacles
     global player_x, player_y, screen  # Add screen to global variables
+    global title_font, font, small_font
 
     # Initialize the game in windowed mode
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))  # Start in windowed mode
+    screen = minigame_host.set_mode((WIDTH, HEIGHT))  # Start in windowed mode
     pygame.display.set_caption("Cosmic Challenge")
+    load_images()
+    title_font = get_font(None, 72)
+    font = get_font(None, 48)
+    small_font = get_font(None, 32)
 
     # Reset game variables
     running = True
@@ -303,18 +310,17 @@ def start_cosmic_challenge():
     # Main game loop
     frame_count = 0
     while running:
-        for event in pygame.event.get():
+        for event in minigame_host.get_events():
             if event.type == pygame.QUIT:
-                running = False
+                return QUIT_GAME
             
             if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = minigame_host.mouse_pos()
                 
                 # Check if the Exit button is clicked
                 exit_rect = pygame.Rect(WIDTH - 150, HEIGHT - 80, 120, 50)
                 if exit_rect.collidepoint(mouse_pos):
-                    # Switch to fullscreen mode and exit the game loop
-                    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+                    # Exit the game loop; the host gives the window back to the novel
                     return  # Exit the game and return control to the main script
                 
                 if not game_active and not level_complete:
@@ -384,5 +390,5 @@ def start_cosmic_challenge():
         # Draw the Exit button on all screens
         draw_exit_button()
         
-        pygame.display.flip()
+        minigame_host.flip()
         clock.tick(FPS)
\ No newline at end of file
@@ -0,0 +1,132 @@
+import logging
+import pygame
+from constants import MIXER_BUSES
+
+class Voice:
+    """What one mixer channel is currently playing."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.sound = None
+        self.priority = 0
+        self.started = 0
+        self.volume = 1.0
+
+    def busy(self):
+        return self.sound is not None and self.channel.get_busy()
+
+
+class ChannelPool:
+    """Hands out mixer channels by named bus instead of fixed channel numbers.
+
+    Each bus in MIXER_BUSES owns a fixed number of voices. `play()` uses a
+    free voice of the bus; when all are busy it steals the one with the
+    lowest priority, oldest first, or drops the new sound if every voice
+    outranks it. Volume is per bus: a gain change updates that bus's
+    channels only, the shared Sound objects are never touched.
+    """
+
+    def __init__(self, buses=MIXER_BUSES):
+        self.limits = dict(buses)
+        self.gains = {bus: 1.0 for bus in self.limits}
+        self.master = 1.0
+        self.muted = False
+        self._voices = {}
+        self._pending = set()
+        self._clock = 0
+
+        # Counters per bus for tuning the limits
+        self.played = {bus: 0 for bus in self.limits}
+        self.stolen = {bus: 0 for bus in self.limits}
+        self.dropped = {bus: 0 for bus in self.limits}
+
+    def _setup(self):
+        """Reserve the channels on first use, once the mixer is up."""
+        if self._voices or not pygame.mixer.get_init():
+            return bool(self._voices)
+        total = sum(self.limits.values())
+        pygame.mixer.set_num_channels(total)
+        # Keep Sound.play() from picking our channels behind our back
+        pygame.mixer.set_reserved(total)
+        index = 0
+        for bus, limit in self.limits.items():
+            self._voices[bus] = [Voice(pygame.mixer.Channel(index + i)) for i in range(limit)]
+            index += limit
+        return True
+
+    def volume(self, bus):
+        """Return the effective gain of a bus (master, bus gain and mute)."""
+        return 0.0 if self.muted else self.master * self.gains[bus]
+
+    def play(self, sound, bus='sfx', priority=0, loops=0, volume=1.0, fade_ms=0):
+        """Play `sound` on `bus` and return its channel, or None if it was dropped."""
+        if sound is None or not self._setup():
+            return None
+        voices = self._voices[bus]
+        voice = next((v for v in voices if not v.busy()), None)
+        if voice is None:
+            victim = min(voices, key=lambda v: (v.priority, v.started))
+            if victim.priority > priority:
+                self.dropped[bus] += 1
+                return None
+            victim.channel.stop()
+            self.stolen[bus] += 1
+            voice = victim
+
+        self._clock += 1
+        voice.sound, voice.priority, voice.started, voice.volume = sound, priority, self._clock, volume
+        voice.channel.set_volume(volume * self.volume(bus))
+        voice.channel.play(sound, loops=loops, fade_ms=fade_ms)
+        self.played[bus] += 1
+        return voice.channel
+
+    def stop(self, bus, fade_ms=0):
+        """Stop every voice on a bus."""
+        for voice in self._voices.get(bus, ()):
+            if fade_ms:
+                voice.channel.fadeout(fade_ms)
+            else:
+                voice.channel.stop()
+            voice.sound = None
+
+    def playing(self, bus):
+        """Return the sounds currently playing on a bus."""
+        return [v.sound for v in self._voices.get(bus, ()) if v.busy()]
+
+    def set_gain(self, bus, gain):
+        """Change one bus's gain; applied with the next `apply()`."""
+        self.gains[bus] = max(0.0, min(1.0, gain))
+        self._pending.add(bus)
+
+    def set_master(self, gain):
+        """Change the master gain of every bus; applied with the next `apply()`."""
+        self.master = max(0.0, min(1.0, gain))
+        self._pending.update(self.gains)
+
+    def set_muted(self, muted):
+        """Mute or unmute everything; applied with the next `apply()`."""
+        self.muted = muted
+        self._pending.update(self.gains)
+
+    def apply(self):
+        """Push pending gain changes: one update per channel of each changed bus."""
+        if not self._pending:
+            return
+        for bus in self._pending:
+            gain = self.volume(bus)
+            for voice in self._voices.get(bus, ()):
+                voice.channel.set_volume(voice.volume * gain)
+        self._pending.clear()
+
+    def stats(self):
+        """Return played/stolen/dropped counts per bus."""
+        return {bus: {'played': self.played[bus], 'stolen': self.stolen[bus], 'dropped': self.dropped[bus]}
+                for bus in self.limits}
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Channel pool: {self.stats()}")
+
+
+# Shared instance: the script runner, SoundManager and minigames all play through it
+channel_pool = ChannelPool()
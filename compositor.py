@@ -0,0 +1,146 @@
+import logging
+import pygame
+from presenter import presenter
+
+# Bottom to top. The first two are flattened into one opaque scene surface.
+LAYER_ORDER = ('background', 'characters', 'chrome', 'text', 'overlay')
+SCENE_LAYERS = ('background', 'characters')
+
+_UNSET = object()
+
+class Layer:
+    """A cached list of (surface, position) sprites and the key it was built from."""
+
+    def __init__(self, name):
+        self.name = name
+        self.key = _UNSET
+        self.sprites = []
+        self.rebuilds = 0
+
+    def rects(self):
+        return [surface.get_rect(topleft=pos) for surface, pos in self.sprites]
+
+
+class Compositor:
+    """Composes the screen from cached layers, rebuilding a layer only when its key changes.
+
+    Callers describe each layer with `set_layer(name, key, build)`; `build()`
+    is only called when `key` differs from the last frame and returns the
+    layer's sprites as a list of (surface, position). Background and
+    characters are flattened into one opaque surface, so an unchanged scene
+    costs a single blit. `compose(screen)` redraws only what changed, from
+    the scene upward and clipped to each changed region, so translucent
+    layers are blended once per frame, and marks those regions on the
+    shared presenter.
+    """
+
+    def __init__(self, size, fill=(255, 255, 255)):
+        self.size = tuple(size)
+        self.fill = fill
+        self.layers = {name: Layer(name) for name in LAYER_ORDER}
+        self._scene = None
+        self._scene_stale = True
+        self.scene_rebuilds = 0
+        self._dirty = []
+        self._full = True
+
+    def set_layer(self, name, key, build):
+        """Rebuild layer `name` from `build()` if `key` changed. Returns True if it was rebuilt."""
+        layer = self.layers[name]
+        if layer.key is not _UNSET and layer.key == key:
+            return False
+        old_rects = layer.rects()
+        layer.sprites = build() or []
+        layer.key = key
+        layer.rebuilds += 1
+        if name in SCENE_LAYERS:
+            self._scene_stale = True
+        if name == 'background':
+            self._full = True
+        else:
+            self._dirty += old_rects + layer.rects()
+        return True
+
+    def clear_layer(self, name):
+        """Remove everything from layer `name`."""
+        self.set_layer(name, None, list)
+
+    def invalidate(self):
+        """Redraw and push the whole screen on the next compose (something else drew over it)."""
+        self._full = True
+
+    def _rebuild_scene(self):
+        if self._scene is None or self._scene.get_size() != self.size:
+            self._scene = pygame.Surface(self.size).convert()
+        self._scene.fill(self.fill)
+        for name in SCENE_LAYERS:
+            for surface, pos in self.layers[name].sprites:
+                self._scene.blit(surface, pos)
+        self._scene_stale = False
+        self.scene_rebuilds += 1
+
+    def compose(self, screen):
+        """Draw the changed parts of the frame onto `screen` and mark them on the presenter."""
+        if self._scene_stale:
+            self._rebuild_scene()
+
+        ui = [(surface, pos, surface.get_rect(topleft=pos))
+              for name in LAYER_ORDER if name not in SCENE_LAYERS
+              for surface, pos in self.layers[name].sprites]
+        if self._full:
+            screen.blit(self._scene, (0, 0))
+            for surface, pos, _ in ui:
+                screen.blit(surface, pos)
+            presenter.mark_all()
+        else:
+            # Restore the scene under whatever UI moved or changed, then draw the UI
+            # back over it inside that rect only; pixels outside are left as they are
+            clip = screen.get_clip()
+            for rect in self._dirty:
+                screen.set_clip(rect)
+                screen.blit(self._scene, rect, rect)
+                for surface, pos, sprite_rect in ui:
+                    if sprite_rect.colliderect(rect):
+                        screen.blit(surface, pos)
+                presenter.mark(rect)
+            screen.set_clip(clip)
+
+        self._dirty = []
+        self._full = False
+
+    def stats(self):
+        """Return how often each layer (and the flattened scene) was rebuilt."""
+        counts = {name: layer.rebuilds for name, layer in self.layers.items()}
+        counts['scene'] = self.scene_rebuilds
+        return counts
+
+    def log_stats(self):
+        """Log the rebuild counters."""
+        logging.info(f"Compositor rebuilds: {self.stats()}")
+
+
+if __name__ == "__main__":
+    # Many partial redraws under a translucent layer leave the same frame as one full compose
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    background = pygame.Surface((1280, 720))
+    background.fill((40, 90, 160))
+    box = pygame.Surface((1280, 200), pygame.SRCALPHA)
+    box.fill((255, 255, 255, 120))
+    font = pygame.font.Font(None, 32)
+
+    compositor = Compositor((1280, 720))
+    compositor.set_layer('background', 'bg', lambda: [(background, (0, 0))])
+    compositor.set_layer('chrome', 'box', lambda: [(box, (0, 520))])
+    for i in range(30):
+        compositor.set_layer('text', i, lambda: [(font.render(f"Line {i}" * (1 + i % 4), True, (0, 0, 0)), (20, 560))])
+        compositor.compose(screen)
+
+    expected = pygame.Surface((1280, 720)).convert()
+    compositor.invalidate()
+    compositor.compose(expected)
+    assert pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(expected, "RGB")
+    print(f"30 partial redraws match a full compose: {compositor.stats()}")
+    pygame.quit()
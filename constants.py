@@ -1,8 +1,10 @@
 import pygame
 
-# Define constants
-WINDOW_WIDTH = 1000
-WINDOW_HEIGHT = 800
+# Internal render resolution: the game draws on a canvas this size and the
+# presenter scales it to the display, so layouts and cached assets never
+# depend on the monitor
+WINDOW_WIDTH = 1280
+WINDOW_HEIGHT = 720
 
 # Define colors
 WHITE = (255, 255, 255)
@@ -10,6 +12,75 @@ BLACK = (0, 0, 0)
 GRAY = (128, 128, 128)
 LIGHT_GRAY = (200, 200, 200)
 
+# Memory budget for the shared surface cache (bytes)
+SURFACE_CACHE_BUDGET = 256 * 1024 * 1024
+
+# Number of upcoming script commands whose assets are prefetched
+PREFETCH_WINDOW = 8
+
+# Where compiled scripts and other derived build artifacts are cached
+SCRIPT_CACHE_DIR = "cache"
+
+# Fraction of the screen that can change before a full flip beats pushing dirty rects
+PRESENTER_FULL_FLIP_FRACTION = 0.5
+
+# Wrapped layouts kept by the text layout cache, and the byte budget for rendered lines
+TEXT_LAYOUT_CACHE_SIZE = 512
+TEXT_LINE_CACHE_BUDGET = 16 * 1024 * 1024
+
+# Bundled TTFs checked by the font registry before the system fonts
+FONT_DIR = "fonts"
+
+# Import minigame modules in the background once their command enters the prefetch window
+MINIGAME_PRELOAD = True
+
+# Low-end mode (or `--low-end`): render at a smaller canvas and let the presenter upscale it
+LOW_END_MODE = False
+LOW_END_RENDER_SIZE = (960, 540)
+
+# RLE-accelerate colorkeyed sprites when they are converted to the display format
+SURFACE_RLE = True
+
+# Memory budget for the shared sound effect cache (bytes of decoded samples)
+SOUND_CACHE_BUDGET = 64 * 1024 * 1024
+
+# Transcoded audio (`python audio_cache.py`): effects become WAV, music OGG
+AUDIO_CACHE_DIR = "cache/audio"
+AUDIO_EFFECT_DIRS = ("sounds/sound_effects",)
+AUDIO_MUSIC_DIRS = ("sounds/music",)
+
+# Mixer voices per bus; music needs two so tracks can crossfade
+MIXER_BUSES = {'music': 2, 'ambient': 2, 'sfx': 8, 'ui': 2, 'minigame': 6}
+
+# Music crossfade length, and how far and how fast music ducks under these buses
+MUSIC_CROSSFADE_MS = 1500
+MUSIC_DUCK_GAIN = 0.4
+MUSIC_DUCK_MS = 400
+MUSIC_DUCK_BUSES = ('sfx',)
+
+# Decoded tracks kept besides the playing and starting ones; each is tens of MB of PCM
+MUSIC_PRELOAD_TRACKS = 1
+
+# How long the "Saved" indicator stays up after a save reached the disk (ms)
+SAVE_STATUS_MS = 1500
+
+# Save snapshot sections bigger than this are zlib-compressed (bytes)
+SNAPSHOT_COMPRESS_BYTES = 4096
+
+# Dialogue steps kept for rewinding, and the most surface memory they may keep alive (bytes)
+REWIND_STEPS = 500
+REWIND_BUDGET = 96 * 1024 * 1024
+
+# Rotating autosave slots, the time between autosaves (ms), and when a delta
+# has grown past this fraction of its full snapshot, start a new one
+AUTOSAVE_SLOTS = 3
+AUTOSAVE_INTERVAL_MS = 5 * 60 * 1000
+AUTOSAVE_REBASE_FRACTION = 0.5
+
+# Size of the save-slot thumbnails, and how many decoded ones the load menu keeps
+THUMBNAIL_SIZE = (160, 90)
+THUMBNAIL_CACHE_SIZE = 64
+
 # Initialize fonts
 pygame.font.init()
 FONT = pygame.font.Font(None, 36)
@@ -1,6 +1,9 @@
 import pygame
+from bisect import bisect_left
 from typing import Optional, List, Tuple
 from datetime import datetime
+from text_layout import text_layout, render_line
+from font_registry import get_font
 
 class DialogueManager:
     def __init__(self, screen_width: int, screen_height: int):
@@ -8,15 +11,24 @@ class DialogueManager:
         self.screen_height = screen_height
         self.dialogue_box_height = 200
         self.padding = 20
-        self.font = pygame.font.SysFont('Arial', 28)
-        self.name_font = pygame.font.SysFont('Arial', 32, bold=True)
+        self.font = get_font('Arial', 28)
+        self.name_font = get_font('Arial', 32, bold=True)
         
-        # Animation settings
-        self.chars_per_frame = 2
+        # Animation settings; the reveal is timed, so it looks the same at any frame rate
+        self.chars_per_second = 120
         self.current_text = ""
-        self.display_text = ""
         self.speaker = None
         self.is_animating = False
+
+        # Typewriter state: the box is drawn once per line of dialogue, and only the
+        # wrapped lines whose revealed part grew are redrawn, as whole prefixes
+        self.box_color = (255, 255, 255, 230)
+        self.text_color = (0, 0, 0)
+        self._box = None
+        self._lines = []    # (wrapped line, offset in current_text of each of its characters, y)
+        self._drawn = 0     # characters of current_text drawn on the box
+        self._revealed = 0  # characters of current_text revealed so far
+        self._start_ticks = 0
         
         # Add dialogue history
         self.dialogue_history = []
@@ -25,62 +37,85 @@ class DialogueManager:
     def start_dialogue(self, text: str, speaker: Optional[str] = None):
         """Start new dialogue."""
         self.current_text = text
-        self.display_text = ""
         self.speaker = speaker
         self.is_animating = True
-        
+
+        # Create the dialogue box once for the whole line
+        self._box = pygame.Surface((self.screen_width, self.dialogue_box_height), pygame.SRCALPHA)
+        self._box.fill(self.box_color)
+
+        # Draw speaker name if present
+        y_offset = self.padding
+        if self.speaker:
+            name_surf = render_line(self.speaker, self.name_font, (0, 0, 0))
+            self._box.blit(name_surf, (self.padding, y_offset))
+            y_offset += name_surf.get_height() + 5
+
+        # Wrap the full text up front; wrapping collapses whitespace, so remember
+        # where in the text each character of a wrapped line comes from
+        self._lines = []
+        cursor = 0
+        for line in self._wrap_text(text):
+            offsets = []
+            for word in line.split(' '):
+                start = text.index(word, cursor)
+                if offsets:
+                    offsets.append(start - 1)  # The space before the word
+                offsets.extend(range(start, start + len(word)))
+                cursor = start + len(word)
+            self._lines.append((line, offsets, y_offset))
+            y_offset += self.font.get_linesize()
+
+        self._drawn = 0
+        self._revealed = 0
+        self._start_ticks = pygame.time.get_ticks()
+
+    @property
+    def display_text(self) -> str:
+        """The part of the current text revealed so far."""
+        return self.current_text[:self._revealed]
+
+    def reveal_all(self):
+        """Skip the typewriter effect and show the whole line."""
+        self._revealed = len(self.current_text)
+        self.is_animating = False
+
     def update(self) -> bool:
         """Update dialogue animation. Returns True if animation is complete."""
         if self.is_animating:
-            if len(self.display_text) < len(self.current_text):
-                self.display_text = self.current_text[:len(self.display_text) + self.chars_per_frame]
-            else:
+            elapsed = pygame.time.get_ticks() - self._start_ticks
+            self._revealed = min(len(self.current_text), elapsed * self.chars_per_second // 1000)
+            if self._revealed >= len(self.current_text):
                 self.is_animating = False
         return not self.is_animating
-                
+
     def draw(self, screen: pygame.Surface) -> pygame.Surface:
         """Draw dialogue box and text."""
-        # Create dialogue box
-        box_surface = pygame.Surface((self.screen_width, self.dialogue_box_height), pygame.SRCALPHA)
-        box_surface.fill((255, 255, 255, 230))
-        
-        # Draw speaker name if present
-        y_offset = self.padding
-        if self.speaker:
-            name_surf = self.name_font.render(self.speaker, True, (0, 0, 0))
-            box_surface.blit(name_surf, (self.padding, y_offset))
-            y_offset += name_surf.get_height() + 5
-            
-        # Draw text
-        wrapped_lines = self._wrap_text(self.display_text)
-        for line in wrapped_lines:
-            text_surf = self.font.render(line, True, (0, 0, 0))
-            box_surface.blit(text_surf, (self.padding, y_offset))
-            y_offset += self.font.get_linesize()
-            
-        return box_surface
-        
+        if self._box is None:
+            # Drawn without start_dialogue: show the text as-is
+            self.start_dialogue(self.current_text, self.speaker)
+            self.reveal_all()
+
+        # Only lines that gained characters since the last frame are redrawn; each is
+        # rendered as one string so kerning matches the finished line
+        if self._revealed > self._drawn:
+            for line, offsets, y in self._lines:
+                shown = bisect_left(offsets, self._revealed)
+                if shown == bisect_left(offsets, self._drawn):
+                    continue
+                if shown == len(line):
+                    surface = render_line(line, self.font, self.text_color)
+                else:
+                    surface = self.font.render(line[:shown], True, self.text_color)
+                self._box.fill(self.box_color, surface.get_rect(topleft=(self.padding, y)))
+                self._box.blit(surface, (self.padding, y))
+            self._drawn = self._revealed
+        return self._box
+
+
     def _wrap_text(self, text: str) -> List[str]:
         """Wrap text to fit the dialogue box width."""
-        words = text.split()
-        lines = []
-        current_line = []
-        current_width = 0
-        
-        for word in words:
-            word_surface = self.font.render(word + ' ', True, (0, 0, 0))
-            word_width = word_surface.get_width()
-            
-            if current_width + word_width <= self.screen_width - 2 * self.padding:
-                current_line.append(word)
-                current_width += word_width
-            else:
-                lines.append(' '.join(current_line))
-                current_line = [word]
-                current_width = word_width
-                
-        lines.append(' '.join(current_line))
-        return lines
+        return list(text_layout.wrap(text, self.font, self.screen_width - 2 * self.padding))
 
     def add_to_history(self, speaker, text):
         """Add dialogue entry to history."""
@@ -114,10 +149,68 @@ class DialogueManager:
             
             text_lines = self._wrap_text(entry['text'])
             for line in text_lines:
-                text_surface = self.font.render(line, True, (0, 0, 0))
+                text_surface = render_line(line, self.font, (0, 0, 0))
                 history_surface.blit(text_surface, (100, y_offset))
                 y_offset += self.font.get_linesize()
             
             y_offset += 20
         
-        return history_surface
\ No newline at end of file
+        return history_surface
+
+def _redraw_everything(manager, text):
+    # The old per-frame draw: new box, re-wrap and re-render all visible text
+    box = pygame.Surface((manager.screen_width, manager.dialogue_box_height), pygame.SRCALPHA)
+    box.fill((255, 255, 255, 230))
+    y_offset = manager.padding
+    for line in list(text_layout.wrap(text, manager.font, manager.screen_width - 2 * manager.padding)):
+        box.blit(manager.font.render(line, True, (0, 0, 0)), (manager.padding, y_offset))
+        y_offset += manager.font.get_linesize()
+    return box
+
+
+if __name__ == "__main__":
+    # Per-frame typewriter cost for a 300-character line: python dialogue_manager.py
+    import os
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    text = ("The engine light flickered as we pulled over; Anaira checked the oil, the coolant "
+            "and the belts, then laughed because the problem was a loose gas cap all along. ") * 2
+    text = text[:300]
+    manager = DialogueManager(1280, 720)
+    manager.start_dialogue(text, "Anaira")
+
+    def timed(step, frames=50):
+        start = time.perf_counter()
+        for _ in range(frames):
+            step()
+        return (time.perf_counter() - start) / frames * 1e6
+
+    for shown in (30, 150, 290):
+        manager._drawn = shown
+        manager._revealed = shown + 2  # two new characters this frame
+
+        def incremental():
+            manager._drawn = shown
+            manager.draw(screen)
+
+        old = timed(lambda: _redraw_everything(manager, text[:shown + 2]))
+        new = timed(incremental)
+        print(f"{shown:3d} chars shown: full redraw {old:8.1f} us/frame, incremental {new:6.1f} us/frame")
+
+    # Revealed a few characters at a time, the finished box matches whole lines rendered at once
+    text = "AV Wa  To: kerned pairs,\nuneven   spacing and a line long enough to wrap onto a second one " * 2
+    manager.start_dialogue(text, "Anaira")
+    for revealed in range(0, len(text) + 3, 3):
+        manager._revealed = min(len(text), revealed)
+        manager.draw(screen)
+        assert manager.display_text == text[:manager._revealed]
+    expected = pygame.Surface(manager._box.get_size(), pygame.SRCALPHA)
+    expected.fill(manager.box_color)
+    expected.blit(render_line("Anaira", manager.name_font, (0, 0, 0)), (manager.padding, manager.padding))
+    for line, _, y in manager._lines:
+        expected.blit(render_line(line, manager.font, manager.text_color), (manager.padding, y))
+    assert pygame.image.tobytes(manager._box, "RGBA") == pygame.image.tobytes(expected, "RGBA")
+    print("typewriter reveal matches the fully rendered lines")
+    pygame.quit()
@@ -0,0 +1,69 @@
+import pygame
+from presenter import presenter
+from music_engine import music_engine
+
+# How long an idle screen sleeps before returning control anyway, so that
+# background work driven from the loop (prefetching, timers) still runs.
+IDLE_TIMEOUT_MS = 250
+
+# Idle timeout while music is starting or ducking, so the gain ramps stay smooth
+AUDIO_TIMEOUT_MS = 30
+
+def wait_events(animating=False, clock=None, fps=60, timeout=IDLE_TIMEOUT_MS):
+    """Return pending events without busy-spinning.
+
+    While something on screen is animating the loop runs on timed frames
+    (`clock.tick(fps)`) and just drains the queue. Otherwise the thread
+    blocks in `pygame.event.wait` until an event arrives or `timeout` ms
+    pass, so a player reading text costs next to no CPU. Either way the
+    music engine gets its `update()`.
+    """
+    music_engine.update()
+    if animating:
+        if clock:
+            clock.tick(fps)
+        return _to_canvas(pygame.event.get())
+
+    if music_engine.active():
+        timeout = min(timeout, AUDIO_TIMEOUT_MS)
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return _to_canvas([event] + pygame.event.get())
+
+
+def _to_canvas(events):
+    """Translate mouse positions from display to canvas coordinates."""
+    if presenter.scale_path in (None, "none"):
+        return events
+    return [pygame.event.Event(e.type, dict(e.dict, pos=presenter.to_canvas(e.pos))) if hasattr(e, 'pos') else e
+            for e in events]
+
+
+def _measure(seconds, step):
+    """Return (CPU seconds, wall seconds) spent calling `step` for `seconds`."""
+    import time
+    cpu, wall = time.process_time(), time.perf_counter()
+    while time.perf_counter() - wall < seconds:
+        step()
+    return time.process_time() - cpu, time.perf_counter() - wall
+
+
+if __name__ == "__main__":
+    # Headless idle-cost benchmark: python event_loop.py
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((320, 240))
+
+    def busy():
+        for _ in pygame.event.get():
+            pass
+
+    clock = pygame.time.Clock()
+    for name, step in [("busy-spin (old)", busy),
+                       ("timed frames", lambda: wait_events(True, clock)),
+                       ("event wait (idle)", lambda: wait_events())]:
+        cpu, wall = _measure(3.0, step)
+        print(f"{name:18s} CPU {100 * cpu / wall:5.1f}% of one core")
+    pygame.quit()
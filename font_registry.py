@@ -0,0 +1,194 @@
+import io
+import os
+import json
+import time
+import logging
+import threading
+import pygame
+from constants import FONT_DIR, SCRIPT_CACHE_DIR
+
+# (family, size, bold) warmed at startup: dialogue, menus, gallery and GUI
+COMMON_FONTS = [
+    (None, 24, False), (None, 28, False), (None, 32, False), (None, 36, False),
+    (None, 42, False), (None, 50, False),
+    ('arial', 20, False), ('arial', 28, False), ('arial', 32, True)
+]
+
+class FontRegistry:
+    """Resolves and creates each (family, size, bold) font once.
+
+    A family is looked up as `fonts/<family>.ttf` (or `<family>-bold.ttf`)
+    first, then through a single `pygame.font.match_font` call whose result
+    is remembered in cache/fonts.json, so later runs never scan the system
+    font directories. Unknown families fall back to pygame's default font.
+    Bold is only synthesized when the resolved face isn't bold itself
+    (`arialbd.ttf`, `Ubuntu-B.ttf` and the like are used as they are).
+    Returned fonts are shared: don't call set_bold/set_italic on them.
+    """
+
+    def __init__(self, font_dir=FONT_DIR, cache_dir=SCRIPT_CACHE_DIR):
+        # Relative to the game folder; minigames may be imported before main.py chdirs
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        self.font_dir = os.path.join(base_dir, font_dir)
+        self.paths_file = os.path.join(base_dir, cache_dir, "fonts.json")
+        self._fonts = {}
+        self._data = {}  # font file -> its bytes
+        self._paths = None
+        self._lock = threading.RLock()
+        self._warm_thread = None
+
+        # Counters: font files read after startup warming are hot-path misses
+        self.lookups = 0
+        self.created = 0
+        self.read_after_warm = 0
+        self.warm_seconds = None
+
+    def _load_paths(self):
+        try:
+            with open(self.paths_file, encoding="utf-8") as f:
+                paths = json.load(f)
+        except (OSError, ValueError):
+            paths = {}
+        # Drop entries whose file has gone away (fonts uninstalled, moved machine)
+        return {k: v for k, v in paths.items() if v is None or os.path.exists(v)}
+
+    def _save_paths(self):
+        try:
+            os.makedirs(os.path.dirname(self.paths_file), exist_ok=True)
+            tmp_path = self.paths_file + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._paths, f, indent=2)
+            os.replace(tmp_path, self.paths_file)
+        except OSError as e:
+            logging.warning(f"Could not write font path cache {self.paths_file}: {e}")
+
+    def resolve(self, family, bold=False):
+        """Return the font file for a family, or None for pygame's default font."""
+        if family is None:
+            return None
+        family = family.lower()
+        key = f"{family}{'-bold' if bold else ''}"
+        with self._lock:
+            if self._paths is None:
+                self._paths = self._load_paths()
+            if key in self._paths:
+                return self._paths[key]
+
+            path = None
+            for name in (f"{key}.ttf", f"{family}.ttf"):
+                candidate = os.path.join(self.font_dir, name)
+                if os.path.exists(candidate):
+                    path = candidate
+                    break
+            if path is None:
+                path = pygame.font.match_font(family, bold=bold) or pygame.font.match_font(family)
+            if path is None:
+                logging.warning(f"Font '{family}' not found, using the default font")
+            self._paths[key] = path
+            self._save_paths()
+            return path
+
+    def _read(self, path):
+        """Return a font file's bytes, reading it once; None if it can't be read."""
+        with self._lock:
+            if path not in self._data:
+                try:
+                    with open(path, "rb") as f:
+                        self._data[path] = f.read()
+                except OSError as e:
+                    logging.warning(f"Could not read font {path}: {e}")
+                    self._data[path] = None
+                if self._warm_thread is not None and not self._warm_thread.is_alive():
+                    self.read_after_warm += 1
+            return self._data[path]
+
+    def get(self, family=None, size=24, bold=False):
+        """Return the shared font for (family, size, bold)."""
+        key = (family.lower() if family else None, size, bold)
+        font = self._fonts.get(key)
+        self.lookups += 1
+        if font is not None:
+            return font
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is None:
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                path = self.resolve(key[0], bold)
+                data = self._read(path) if path else None
+                # pygame scales the default font's sizes, so it is still opened by None
+                font = pygame.font.Font(io.BytesIO(data) if data else None, size)
+                # get_bold() reports the face's own style; synthesize bold only without a bold face
+                if bold and not font.get_bold():
+                    font.set_bold(True)
+                self._fonts[key] = font
+                self.created += 1
+            return font
+
+    def warm(self, specs=COMMON_FONTS):
+        """Resolve and read the files for `specs` on a background thread.
+
+        SDL_ttf isn't thread-safe, so the Fonts themselves are still created
+        by get() on the main thread, from the bytes already in memory.
+        """
+        def run():
+            start = time.perf_counter()
+            for family, size, bold in specs:
+                path = self.resolve(family, bold)
+                if path:
+                    self._read(path)
+            self.warm_seconds = time.perf_counter() - start
+
+        self._warm_thread = threading.Thread(target=run, name="font-warm", daemon=True)
+        self._warm_thread.start()
+        return self._warm_thread
+
+    def stats(self):
+        """Return lookup/creation counters."""
+        return {
+            'fonts': len(self._fonts),
+            'lookups': self.lookups,
+            'created': self.created,
+            'read_after_warm': self.read_after_warm,
+            'warm_seconds': self.warm_seconds
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Font registry: {self.stats()}")
+
+
+# Shared instance
+font_registry = FontRegistry()
+
+def get_font(family=None, size=24, bold=False):
+    """Return a shared font from the registry."""
+    return font_registry.get(family, size, bold)
+
+
+if __name__ == "__main__":
+    # Startup/lookup cost: python font_registry.py
+    pygame.font.init()
+
+    start = time.perf_counter()
+    pygame.font.SysFont('Arial', 28)
+    print(f"SysFont, first call (system scan)  {1000 * (time.perf_counter() - start):8.2f} ms")
+    start = time.perf_counter()
+    for _ in range(100):
+        pygame.font.SysFont('Arial', 28)
+    print(f"SysFont, per call                  {10 * (time.perf_counter() - start):8.2f} ms")
+
+    registry = FontRegistry()
+    start = time.perf_counter()
+    registry.warm().join()
+    print(f"registry warm ({len(COMMON_FONTS)} fonts)            {1000 * (time.perf_counter() - start):8.2f} ms")
+    assert registry.created == 0  # Fonts are only created on this (the main) thread
+    start = time.perf_counter()
+    for family, size, bold in COMMON_FONTS:
+        registry.get(family, size, bold)
+    print(f"create warmed fonts (main thread)  {1000 * (time.perf_counter() - start):8.2f} ms")
+    start = time.perf_counter()
+    for _ in range(100):
+        registry.get('arial', 28)
+    print(f"registry get, per call             {10 * (time.perf_counter() - start):8.4f} ms")
+    print(registry.stats())
@@ -2,9 +2,8 @@ import pygame
 import random
 import sys
 import time
-
-# Initialize pygame
-pygame.init()
+from font_registry import get_font
+from minigame_host import minigame_host, QUIT_GAME
 
 # Constants
 SCREEN_WIDTH = 1535
@@ -29,15 +28,19 @@ MAX_TRIALS = 3
 BASE_SCORE = 1000
 TRIAL_PENALTY = 100  # -100 per extra trial
 
-# Set up the display
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Car Fuse Memory Game")
-font = pygame.font.SysFont('Arial', FONT_SIZE)
-large_font = pygame.font.SysFont('Arial', LARGE_FONT_SIZE)
-title_font = pygame.font.SysFont('Arial', TITLE_FONT_SIZE)
+# The display and fonts are set up when the game starts, not at import
+# (the module may be imported on a background thread)
+screen = None
+font = None
+large_font = None
+title_font = None
 
 class FuseMemoryGame:
     def __init__(self):
+        global font, large_font, title_font
+        font = get_font('Arial', FONT_SIZE)
+        large_font = get_font('Arial', LARGE_FONT_SIZE)
+        title_font = get_font('Arial', TITLE_FONT_SIZE)
         self.reset_game()
         
     def reset_game(self):
@@ -264,15 +267,18 @@ class FuseMemoryGame:
         exit_text = font.render("EXIT", True, (255, 255, 255))
         screen.blit(exit_text, (SCREEN_WIDTH - 150 + 60 - exit_text.get_width() // 2, SCREEN_HEIGHT - 80 + 25 - exit_text.get_height() // 2))
     def start_game_loop(self):
-        clock = pygame.time.Clock()
+        global screen
+        screen = minigame_host.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Car Fuse Memory Game")
+        clock = minigame_host.clock
         running = True
         while running:
-            for event in pygame.event.get():
+            for event in minigame_host.get_events():
                 if event.type == pygame.QUIT:
-                    running = False
+                    return QUIT_GAME
                 
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
+                    mouse_pos = minigame_host.mouse_pos()
                     
                     # Check if the Exit button is clicked
                     if (SCREEN_WIDTH - 150 <= mouse_pos[0] <= SCREEN_WIDTH - 150 + 120 and
@@ -293,6 +299,6 @@ class FuseMemoryGame:
                             self.reset_game()
             
             self.draw()
-            pygame.display.flip()
+            minigame_host.flip()
             clock.tick(60)
         
@@ -1,6 +1,7 @@
 import json
 import os
 import pygame
+from font_registry import get_font
 
 class GallerySystem:
     def __init__(self):
@@ -67,8 +68,8 @@ class GallerySystem:
 
     def draw(self, screen):
         """Draw gallery items on screen."""
-        font = pygame.font.Font(None, 36)
-        small_font = pygame.font.Font(None, 24)
+        font = get_font(None, 36)
+        small_font = get_font(None, 24)
         
         if not self.gallery_items:
             # Draw "No items available" message
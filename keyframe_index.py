@@ -0,0 +1,76 @@
+from opcodes import Background, Character, HideCharacter, Dialogue, Sound, Music, StopMusic
+
+class Keyframe:
+    """Visual and audio state in effect just before a script command runs.
+
+    `character` is the Character opcode on screen, so restoring it needs no
+    lookup into the CHARACTERS table.
+    """
+    __slots__ = ('background', 'character', 'position', 'ambient', 'music', 'music_loop', 'chapter')
+
+    def __init__(self, background=None, character=None, position=None, ambient=None,
+                 music=None, music_loop=False, chapter=None):
+        self.background = background
+        self.character = character
+        self.position = position
+        self.ambient = ambient
+        self.music = music
+        self.music_loop = music_loop
+        self.chapter = chapter
+
+    def copy(self):
+        return Keyframe(self.background, self.character, self.position, self.ambient,
+                        self.music, self.music_loop, self.chapter)
+
+
+class KeyframeIndex:
+    """Precomputed state at every command, so resuming never replays the script.
+
+    `state_at(idx)` returns the background, character, ambient loop and music
+    that would be active after running opcodes [0, idx). Only opcodes that
+    change state allocate a new keyframe; the rest share the previous one.
+    """
+
+    def __init__(self, ops):
+        self.keyframes = []
+        self.chapters = []  # (command index, title)
+        state = Keyframe()
+        for idx, op in enumerate(ops):
+            self.keyframes.append(state)
+            changed = self._apply(state.copy(), op, idx)
+            if changed is not None:
+                state = changed
+        self.final_state = state
+
+    def _apply(self, state, op, idx):
+        """Return the new state after `op`, or None when nothing changed."""
+        if isinstance(op, Background):
+            state.background = op.file
+        elif isinstance(op, Character):
+            state.character, state.position = op, op.position
+        elif isinstance(op, HideCharacter):
+            state.character = state.position = None
+        elif isinstance(op, Sound) and op.ambient:
+            state.ambient = op.file if op.file and op.loop else None
+        elif isinstance(op, Music):
+            state.music, state.music_loop = op.file, op.loop
+        elif isinstance(op, StopMusic):
+            state.music, state.music_loop = None, False
+        elif isinstance(op, Dialogue) and op.chapter is not None:
+            state.chapter = op.chapter
+            self.chapters.append((idx, op.chapter))
+        else:
+            return None
+        return state
+
+    def state_at(self, idx):
+        """Return the keyframe in effect before command `idx` runs."""
+        if idx >= len(self.keyframes):
+            return self.final_state
+        return self.keyframes[max(0, idx)]
+
+    def chapter_start(self, number):
+        """Return the command index where chapter `number` (1-based) begins."""
+        if 1 <= number <= len(self.chapters):
+            return self.chapters[number - 1][0]
+        return 0
@@ -1,22 +1,37 @@
+import time
+STARTUP_T0 = time.perf_counter()
+
 import pygame
 import sys
 import os
+import logging
 from constants import *
-from dialogue_system import draw_dialogue
-from menu_system import create_button, create_mute_icon, draw_gallery_screen, draw_dialogue
-from script_loader import load_script
-from assets import ICONS, CHARACTERS
+from menu_system import (create_button, create_mute_icon, dialogue_box_rect,
+                         draw_dialogue_box, draw_dialogue_text)
+from script_compiler import compile_script
+from opcodes import (Background, Character, HideCharacter, Dialogue, Sound, Music,
+                     StopMusic, Fade, Wait, Minigame, Noop)
+from assets import ICONS
 from save_system import SaveSystem  # Import the SaveSystem class
-from minigame.main import start_minigame  # Adjust the import path if necessary
-from quiz import run_quiz  # Adjust the import path if necessary
+from autosave import Autosaver
+from save_writer import save_writer, SAVE_COMPLETE
+from thumbnails import thumbnail_store
+from save_browser import SaveBrowser
+from snapshot import Snapshot
+from rewind import RewindBuffer, RewindStep
+from surface_cache import load_image, surface_cache
+from sound_cache import sound_cache
+from audio_cache import audio_cache
+from channel_pool import channel_pool
+from music_engine import music_engine
+from asset_prefetcher import AssetPrefetcher
+from event_loop import wait_events
+from presenter import presenter
+from compositor import Compositor
+from font_registry import font_registry, get_font
+from minigame_registry import minigame_registry  # Minigames are imported on first use
+from minigame_host import QUIT_GAME
 from gallery_system import GallerySystem
-from tube_game.tire import run_graduated_tube_game  # Adjust the import path if necessary
-from test.challenge import UnderTheHoodGame
-from fuse import FuseMemoryGame  # Adjust the import path if necessary
-from cargame.game import start_cosmic_challenge
-from minigame2.main import start_minigame  # Adjust the import path if necessary
-from minigame2.main2 import start_oil_spill_challenge
-from minigame2.main3 import start_oil_drain_challenge
 
 # Set the working directory to the directory where main.py is located
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -24,6 +39,9 @@ os.chdir(os.path.dirname(os.path.abspath(__file__)))
 # Initialize Pygame
 pygame.init()
 
+# Create the common fonts in the background while the window comes up
+font_registry.warm()
+
 # Define colors
 RED = (255, 0, 0)
 
@@ -31,15 +49,18 @@ RED = (255, 0, 0)
 gallery = GallerySystem()
 
 
-# Initialize the screen
-screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+# Open the display at its native size and draw on a fixed-size canvas that
+# the presenter scales to it
+pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+low_end = LOW_END_MODE or "--low-end" in sys.argv
+screen = presenter.open_canvas(LOW_END_RENDER_SIZE if low_end else (WINDOW_WIDTH, WINDOW_HEIGHT))
 WINDOW_WIDTH, WINDOW_HEIGHT = screen.get_size()
 pygame.display.set_caption("CarCare")
 
 # Load and scale mute/unmute icons
 icon_size = 30  # Match the size defined in create_mute_icon
-volume_off = pygame.transform.scale(pygame.image.load(ICONS["volume_off"]), (icon_size, icon_size))
-volume_on = pygame.transform.scale(pygame.image.load(ICONS["volume_on"]), (icon_size, icon_size))
+volume_off = load_image(ICONS["volume_off"], (icon_size, icon_size))
+volume_on = load_image(ICONS["volume_on"], (icon_size, icon_size))
 
 # Initialize global states
 is_muted = False
@@ -50,10 +71,14 @@ current_screen = "main_menu"
 # Initialize the Save System
 save_system = SaveSystem()
 save_system.setup_buttons(WINDOW_WIDTH)
+autosaver = Autosaver(save_system)
 
-def draw_character(screen, character_surf, position):
-    """Draw `character_surf` at left/center/right on `screen`."""
-    w, h = screen.get_size()
+# Decodes upcoming script assets in the background
+prefetcher = AssetPrefetcher()
+
+def character_position(screen_size, character_surf, position):
+    """Return the top-left corner for `character_surf` at left/center/right."""
+    w, h = screen_size
     if position == "left":
         x, y = 50, h - character_surf.get_height() - 50
     elif position == "center":
@@ -64,7 +89,7 @@ def draw_character(screen, character_surf, position):
         y = h - character_surf.get_height() - 50
     else:
         x, y = 0, 0
-    screen.blit(character_surf, (x, y))
+    return x, y
 
 def show_pause_menu():
     """Display the pause menu."""
@@ -76,21 +101,24 @@ def show_pause_menu():
     overlay.fill(BLACK)
 
     # Draw menu options
-    font = pygame.font.Font(None, 50)
+    font = get_font(None, 50)
     return_text = font.render("Return to Main Menu", True, WHITE)
     return_rect = return_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
 
-    while menu_running:
-        screen.blit(overlay, (0, 0))
-        screen.blit(return_text, return_rect)
-        pygame.display.flip()
+    # The menu is static, so draw it once over the paused frame
+    screen.blit(overlay, (0, 0))
+    screen.blit(return_text, return_rect)
+    presenter.mark_all()
+    presenter.present()
 
-        for event in pygame.event.get():
+    while menu_running:
+        for event in wait_events():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                # Close the menu and let the game quit the usual way (saving first)
+                pygame.event.post(event)
+                return None
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = event.pos
                 if return_rect.collidepoint(mouse_pos):
                     return "main_menu"  # Return to the main menu
             elif event.type == pygame.KEYDOWN:
@@ -98,210 +126,435 @@ def show_pause_menu():
                     menu_running = False  # Close the pause menu
 
     return None  # Resume the game
-def show_save_selection_menu():
-    """Display the save selection menu."""
-    menu_running = True
-
-    # Get save information
-    save_info = save_system.get_save_info()
-
-    # Create a semi-transparent overlay
-    overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-    overlay.set_alpha(150)  # Set transparency
-    overlay.fill(BLACK)
-
-    # Draw menu options
-    font = pygame.font.Font(None, 36)
-    options = []
-    for i, save in enumerate(save_info):
-        text = f"Slot {save['slot']}: {save['timestamp']}" if save['exists'] else f"Slot {save['slot']}: Empty"
-        text_surface = font.render(text, True, WHITE)
-        text_rect = text_surface.get_rect(center=(WINDOW_WIDTH // 2, 150 + i * 50))
-        options.append((text_surface, text_rect, save['slot'], save['exists']))
-
-    delete_font = pygame.font.Font(None, 28)
-    delete_text = delete_font.render("Click to delete a save (Right-click)", True, RED)
-    delete_rect = delete_text.get_rect(center=(WINDOW_WIDTH // 2, 400))
-
-    while menu_running:
-        screen.blit(overlay, (0, 0))
-
-        # Draw save slots
-        for text_surface, text_rect, _, _ in options:
-            screen.blit(text_surface, text_rect)
-
-        # Draw delete instruction
-        screen.blit(delete_text, delete_rect)
-
-        pygame.display.flip()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                for _, text_rect, slot, exists in options:
-                    if text_rect.collidepoint(mouse_pos):
-                        if event.button == 1:  # Left-click to load
-                            if exists:
-                                return slot  # Return the selected slot
-                        elif event.button == 3:  # Right-click to delete
-                            if exists:
-                                save_system.delete_save(slot)
-                                save_info = save_system.get_save_info()  # Refresh save info
-                                options = []
-                                for i, save in enumerate(save_info):
-                                    text = f"Slot {save['slot']}: {save['timestamp']}" if save['exists'] else f"Slot {save['slot']}: Empty"
-                                    text_surface = font.render(text, True, WHITE)
-                                    text_rect = text_surface.get_rect(center=(WINDOW_WIDTH // 2, 150 + i * 50))
-                                    options.append((text_surface, text_rect, save['slot'], save['exists']))
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    menu_running = False  # Close the menu
-
-    return None  # No save selected
-
-def start_new_game(start_index=0):
-    global current_screen
-    script = load_script("script.json")
-    if not script: return
-    # Setup audio
-    pygame.mixer.set_num_channels(3)
-    sfx_channel = pygame.mixer.Channel(1)
-    amb_channel = pygame.mixer.Channel(2)
-
-    curr_bg = None; curr_bg_file = ""
-    curr_char = None; curr_char_pos = None
-    in_zoom = False
-
-    def size(): return screen.get_width(), screen.get_height()
-    font_b = pygame.font.Font(None, 28)
-    sw, sh = size()
-    save_s = font_b.render("Save", True, WHITE)
-    load_s = font_b.render("Load", True, WHITE)
-    save_r = save_s.get_rect(topleft=(sw-200, 10))
-    load_r = load_s.get_rect(topleft=(sw-100, 10))
-    skip = start_index > 0
-
-    for idx, cmd in enumerate(script['script']):
-        if idx < start_index and skip:
-            if cmd['type'] == 'background':
-                curr_bg_file, img = cmd['file'], pygame.image.load(cmd['file'])
-                curr_bg = pygame.transform.scale(img, size())
-            elif cmd['type'] == 'character':
-                ch = CHARACTERS.get(cmd['name'])
-                if ch:
-                    surf = pygame.transform.scale(pygame.image.load(ch['file']), ch['size'])
-                    curr_char, curr_char_pos = surf, cmd.get('position', ch['default_position'])
-            elif cmd['type'] == 'hide_character': curr_char = None; curr_char_pos = None
-            continue
-        skip = False
-        screen.fill(WHITE)
-        # background
-        if cmd['type'] == 'background':
-            curr_bg_file, img = cmd['file'], pygame.image.load(cmd['file'])
-            curr_bg = pygame.transform.scale(img, size()); screen.blit(curr_bg, (0, 0)); pygame.display.flip()
-        # character
-        elif cmd['type'] == 'character':
-            name = cmd.get('name', '')
-            if name and name in CHARACTERS and 'file' in CHARACTERS[name]:
-                ch = CHARACTERS[name]
-                img = pygame.image.load(ch['file'])
-                surf = pygame.transform.scale(img, ch['size'])
-                curr_char, curr_char_pos = surf, cmd.get('position', ch.get('default_position'))
-            else:
-                curr_char = None
-                curr_char_pos = None
-
-        # hide
-        elif cmd['type'] == 'hide_character': curr_char = None; curr_char_pos = None
-
-        elif cmd['type'] == 'dialogue':
-            if curr_bg: screen.blit(curr_bg, (0, 0))
-            if curr_char and curr_char_pos: draw_character(screen, curr_char, curr_char_pos)
-            draw_dialogue(screen, cmd.get('speaker', ''), cmd['text'])
-            pygame.draw.rect(screen, GRAY, save_r); pygame.draw.rect(screen, GRAY, load_r)
-            screen.blit(save_s, save_r); screen.blit(load_s, load_r); pygame.display.flip()
-            waiting = True
-            while waiting:
-                for e in pygame.event.get():
-                    if e.type == pygame.QUIT: save_system.save_game({'current_command_index': idx}, 1); pygame.quit(); sys.exit()
-                    if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
-                        r = show_pause_menu()
-                        if r == 'main_menu': return
-                    if e.type == pygame.MOUSEBUTTONDOWN:
-                        if save_r.collidepoint(e.pos): save_system.save_game({'current_command_index': idx}, 1)
-                        elif load_r.collidepoint(e.pos):
-                            slot = show_save_selection_menu()
-                            data = save_system.load_game(slot) if slot else None
-                            if data: start_new_game(data.get('current_command_index', 0)); return
-                        else: waiting = False
-        # sound
-        elif cmd['type'] == 'quiz':
-            run_quiz()
-
-        elif cmd['type'] == 'tube_game':
-            run_graduated_tube_game()  # Run the mini-game
-            continue  # Ensure the script continues to the next command
-        elif cmd['type'] == 'under_the_hood_game':
-            UnderTheHoodGame().start_game()
-            continue  # Ensure the script continues to the next command
-        if cmd['type'] == 'cosmic_challenge':
-            start_cosmic_challenge()  # Start the Cosmic Challenge game
-            continue  # Ensure the script continues to the next command
-        elif cmd['type'] == 'fuse_game':
-                game = FuseMemoryGame()
-                game.start_game_loop()  # Start the Fuse Memory Game
-                continue  # Ensure the script continues to the next command
-        if cmd['type'] == 'minigame2':
-            start_minigame()  # Start the minigame
-            continue  # Ensure the script continues to the next command
-        elif cmd['type'] == 'oil_spill_challenge':
-            start_oil_spill_challenge()# Start the Oil Spill Challenge minigame
-            continue  # Ensure the script continues to the next command
-        elif cmd['type'] == 'oil_drain_challenge':
-            start_oil_drain_challenge()# Start the Oil Spill Challenge minigame
-            continue  # Ensure the script continues to the next command
-        
-        elif cmd['type'] == 'sound':
-            snd = pygame.mixer.Sound(cmd['file']) if cmd.get('file') else None
-            if cmd.get('channel') == 'ambient':
-                if snd and cmd.get('loop'): amb_channel.play(snd, loops=-1)
-                else: amb_channel.stop()
-            elif snd: snd.set_volume(0.3); sfx_channel.play(snd)
-        # music
-        elif cmd['type'] == 'music':
-            if cmd.get('file'):
-                pygame.mixer.music.load(cmd['file'])
-                pygame.mixer.music.play(-1 if cmd.get('loop') else 0)
-            elif cmd.get('stop', False):  # Stop music if "stop" is explicitly set to True
-                pygame.mixer.music.stop()
-        # fade
-        elif cmd['type'] == 'fade':
-            col = cmd.get('color', 'BLACK').upper(); fc = BLACK if col == 'BLACK' else WHITE; dur = cmd.get('duration', 1.0)
-            fs = pygame.Surface(size()); fs.fill(fc); fs.set_alpha(0)
-            clock = pygame.time.Clock(); a_step = 255 / (dur * 60); a = 0
-            while a < 255:
-                fs.set_alpha(int(a))
-                if curr_bg: screen.blit(curr_bg, (0, 0))
-                screen.blit(fs, (0, 0)); pygame.display.flip(); a += a_step; clock.tick(60)
-        
-        # wait
-        elif cmd['type'] == 'wait':
-            d = cmd.get('duration', 1.0)
-            if 'black_screen' in curr_bg_file.lower():
-                in_zoom = True; clock = pygame.time.Clock(); zf = 1.0; tz = 1.05; steps = int(d * 60); zs = (tz - zf) / steps
-                ob = pygame.Surface(size()); ob.fill((20, 20, 20))
-                for _ in range(steps):
-                    zf += zs; zw = int(size()[0] * zf); zh = int(size()[1] * zf)
-                    zz = pygame.transform.smoothscale(ob, (zw, zh))
-                    screen.fill(BLACK); screen.blit(zz, ((size()[0] - zw) // 2, (size()[1] - zh) // 2)); pygame.display.flip(); clock.tick(60)
-                in_zoom = False
-            else: pygame.time.delay(int(d * 1000))
-        # minigame
-        elif cmd['type'] == 'minigame': start_minigame(screen)
-
+def show_save_selection_menu(mode="load"):
+    """Display the save browser; returns the slot picked to load (or, in "save" mode, to save into)."""
+    return SaveBrowser(screen, save_system, mode).run()
+
+class ScriptRun:
+    """Mutable state of one pass through the compiled script."""
+
+    def __init__(self, program):
+        self.program = program
+        self.curr_bg = None; self.curr_bg_file = ""
+        self.curr_char = None; self.curr_char_pos = None
+
+        # Cached background/character/dialogue layers for this run
+        self.compositor = Compositor(self.size())
+
+        font_b = get_font(None, 28)
+        sw, sh = self.size()
+        self.save_s = font_b.render("Save", True, WHITE)
+        self.load_s = font_b.render("Load", True, WHITE)
+        self.save_r = self.save_s.get_rect(topleft=(sw-200, 10))
+        self.load_r = self.load_s.get_rect(topleft=(sw-100, 10))
+        self.save_status = None; self.save_status_hide_at = 0
+
+        # Player state the script can't rebuild, kept for snapshots
+        self.history = []           # command indices of the dialogue seen
+        self.minigame_results = {}
+        self.ambient = None
+
+        # The last dialogue steps, for scrolling back
+        self.rewind = RewindBuffer()
+
+    def size(self):
+        return screen.get_width(), screen.get_height()
+
+    def invalidate(self):
+        """Recompose the whole frame next time (after menus, effects or minigames)."""
+        self.compositor.invalidate()
+
+    def set_scene(self, with_character=True):
+        """Point the background and character layers at the current state."""
+        c = self.compositor
+        c.set_layer('background', self.curr_bg, lambda: [(self.curr_bg, (0, 0))] if self.curr_bg else [])
+        char = (self.curr_char, self.curr_char_pos) if with_character and self.curr_char and self.curr_char_pos else None
+        c.set_layer('characters', char, lambda: [(char[0], character_position(self.size(), *char))] if char else [])
+
+    def build_chrome(self):
+        """Return the dialogue box and Save/Load buttons as layer sprites."""
+        box = dialogue_box_rect(self.size())
+        box_surf = pygame.Surface(box.size).convert()
+        draw_dialogue_box(box_surf, box_surf.get_rect())
+        sprites = [(box_surf, box.topleft)]
+        for label, rect in ((self.save_s, self.save_r), (self.load_s, self.load_r)):
+            button = pygame.Surface(rect.size).convert()
+            button.fill(GRAY); button.blit(label, (0, 0))
+            sprites.append((button, rect.topleft))
+        return sprites
+
+    def build_text(self, speaker, text):
+        """Return the speaker and wrapped dialogue text as a layer sprite."""
+        box = dialogue_box_rect(self.size())
+        surf = pygame.Surface((box.width, self.size()[1] - box.y), pygame.SRCALPHA)
+        local = pygame.Rect(0, 0, box.width, box.height)
+        drawn = local.unionall(draw_dialogue_text(surf, local, speaker, text)).clip(surf.get_rect())
+        return [(surf.subsurface(pygame.Rect(0, 0, box.width, drawn.bottom)), box.topleft)]
+
+    def snapshot(self, idx):
+        """Capture the state at command `idx` for a save."""
+        return Snapshot(
+            index=idx,
+            chapter=self.program.keyframes.state_at(idx + 1).chapter,
+            muted=is_muted,
+            ambient=self.ambient,
+            music=music_engine.current,
+            music_loop=music_engine.loop,
+            gallery=sorted(gallery.unlocked_items),
+            minigames=self.minigame_results,
+            history=self.history
+        )
+
+    def apply(self, state):
+        """Bring back what a Snapshot holds on top of the keyframe restore."""
+        global is_muted
+        self.history = list(state.history)
+        self.minigame_results = dict(state.minigames)
+        self.set_audio(state.ambient, state.music, state.music_loop)
+        is_muted = state.muted
+        channel_pool.set_muted(is_muted); channel_pool.apply()
+        # Unlocks are progress across saves: loading never locks anything again
+        if not gallery.unlocked_items.issuperset(state.gallery):
+            gallery.unlocked_items.update(state.gallery)
+            gallery.save_progress()
+
+    def set_audio(self, ambient, music, music_loop):
+        """Switch the ambient loop and music to the given ones, leaving what already matches."""
+        if ambient != self.ambient:
+            channel_pool.stop('ambient')
+            self.ambient = ambient
+            if ambient:
+                channel_pool.play(prefetcher.load_sound(ambient), 'ambient', loops=-1)
+        if music:
+            music_engine.play(music, music_loop)
+        else:
+            music_engine.stop()
+
+    def capture(self, idx):
+        """Record the dialogue step at `idx` for rewinding."""
+        self.rewind.push(RewindStep(idx, self.curr_bg, self.curr_bg_file, self.curr_char, self.curr_char_pos,
+                                    self.ambient, music_engine.current, music_engine.loop, len(self.history),
+                                    dict(self.minigame_results)))
+
+    def show_step(self, step):
+        """Put a rewind step's scene back on the run (audio changes only once the player continues)."""
+        self.curr_bg = step.background; self.curr_bg_file = step.background_file
+        self.curr_char = step.character; self.curr_char_pos = step.character_pos
+
+    def rewind_to(self, back):
+        """Continue from the step `back` lines ago: forget the newer ones and restore its state."""
+        step = self.rewind.step(back)
+        # The dialogue opcode captures this step again when it runs
+        self.rewind.truncate(back + 1)
+        self.show_step(step)
+        del self.history[step.history_len:]
+        self.minigame_results = dict(step.minigames)
+        self.set_audio(step.ambient, step.music, step.music_loop)
+        return step
+
+    def show_save_status(self, text):
+        """Show `text` under the Save button (None hides it) and present the change."""
+        self.save_status = text
+        def build():
+            label = get_font(None, 24).render(text, True, WHITE)
+            surf = pygame.Surface((label.get_width() + 10, label.get_height() + 6)).convert()
+            surf.fill(GRAY); surf.blit(label, (5, 3))
+            return [(surf, (self.save_r.x, self.save_r.bottom + 6))]
+        self.compositor.set_layer('overlay', text, build if text else list)
+        self.compositor.compose(screen); presenter.present()
+
+    def restore(self, idx):
+        """Restore the state in effect before `idx` with a single keyframe lookup."""
+        kf = self.program.keyframes.state_at(idx)
+        self.curr_bg_file = kf.background or ""
+        self.curr_bg = load_image(kf.background, self.size()) if kf.background else None
+        if kf.character:
+            self.curr_char = load_image(kf.character.file, presenter.asset_size(kf.character.size))
+            self.curr_char_pos = kf.position
+        else:
+            self.curr_char = None; self.curr_char_pos = None
+        channel_pool.stop('ambient')
+        self.ambient = kf.ambient
+        if kf.ambient:
+            channel_pool.play(prefetcher.load_sound(kf.ambient), 'ambient', loops=-1)
+        if kf.music and kf.music_loop:
+            # Keeps playing, without a reload, when the saved track is the current one
+            music_engine.play(kf.music)
+        else:
+            music_engine.stop()
+
+
+# Returned by an opcode handler to leave the script and go back to the menu
+STOP = object()
+
+# Fired once SAVE_STATUS_MS after a save completed, to hide the indicator
+SAVE_STATUS_HIDE = pygame.event.custom_type()
+
+# Fired every AUTOSAVE_INTERVAL_MS without another autosave
+AUTOSAVE = pygame.event.custom_type()
+
+def autosave(run, idx):
+    """Autosave the state at `idx`, with the frame on screen as its thumbnail, and restart the timer."""
+    autosaver.save(run.snapshot(idx), screen)
+    pygame.time.set_timer(AUTOSAVE, AUTOSAVE_INTERVAL_MS)
+
+def shutdown(run=None):
+    """Wait for queued saves, log every subsystem's counters (and the script run's, if any) and exit."""
+    save_system.flush()
+    prefetcher.log_stats(); surface_cache.log_stats(); presenter.log_stats()
+    font_registry.log_stats(); sound_cache.log_stats(); audio_cache.log_stats(); channel_pool.log_stats()
+    music_engine.log_stats(); save_writer.log_stats(); autosaver.log_stats(); thumbnail_store.log_stats()
+    minigame_registry.log_stats()
+    if run is not None:
+        run.compositor.log_stats(); run.rewind.log_stats()
+    pygame.quit(); sys.exit()
+
+def quit_game(run, idx):
+    """Save the state at `idx` to slot 1 and shut down."""
+    save_system.save_game(run.snapshot(idx), 1, screen)
+    shutdown(run)
+
+def op_background(run, idx, op):
+    run.curr_bg_file = op.file
+    run.curr_bg = prefetcher.load_image(op.file, run.size())
+    run.set_scene(with_character=False)
+    run.compositor.clear_layer('chrome'); run.compositor.clear_layer('text')
+    run.compositor.compose(screen); presenter.present()
+    # Scene boundary: a cheap delta autosave, showing the new scene
+    autosave(run, idx)
+
+def op_character(run, idx, op):
+    run.curr_char = prefetcher.load_image(op.file, presenter.asset_size(op.size))
+    run.curr_char_pos = op.position
+
+def op_hide_character(run, idx, op):
+    run.curr_char = None; run.curr_char_pos = None
+
+def draw_dialogue_frame(run, op):
+    """Compose a dialogue frame from the cached layers and present it."""
+    run.set_scene()
+    run.compositor.set_layer('chrome', run.size(), run.build_chrome)
+    run.compositor.set_layer('text', (op.speaker, op.text), lambda: run.build_text(op.speaker, op.text))
+    run.compositor.compose(screen); presenter.present()
+    # The completion and hide events may have gone to another screen's loop
+    if run.save_status == "Saving..." and not save_writer.busy():
+        save_finished(run, True)
+    elif run.save_status and run.save_status != "Saving..." and pygame.time.get_ticks() >= run.save_status_hide_at:
+        run.show_save_status(None)
+
+def save_finished(run, ok):
+    run.show_save_status("Saved" if ok else "Save failed")
+    run.save_status_hide_at = pygame.time.get_ticks() + SAVE_STATUS_MS
+    pygame.time.set_timer(SAVE_STATUS_HIDE, SAVE_STATUS_MS, loops=1)
+
+def rewind_direction(e):
+    """Return 1 for an event that scrolls back a line, -1 for forward, 0 otherwise."""
+    if e.type == pygame.MOUSEWHEEL:
+        return 1 if e.y > 0 else -1 if e.y < 0 else 0
+    if e.type == pygame.KEYDOWN:
+        return {pygame.K_PAGEUP: 1, pygame.K_PAGEDOWN: -1}.get(e.key, 0)
+    return 0
+
+def op_dialogue(run, idx, op):
+    run.capture(idx)
+    run.history.append(idx)
+    draw_dialogue_frame(run, op)
+    back = shown_back = 0; shown = op  # lines scrolled back, and the line on screen
+    while True:
+        for e in wait_events():
+            direction = rewind_direction(e)
+            if direction:
+                # Only the last position of a burst of wheel events gets drawn
+                back = max(0, min(len(run.rewind) - 1, back + direction))
+                continue
+            if e.type == SAVE_COMPLETE and run.save_status == "Saving...":
+                save_finished(run, e.ok)
+            if e.type == AUTOSAVE:
+                autosave(run, idx)
+            if e.type == SAVE_STATUS_HIDE:
+                run.show_save_status(None)
+            if e.type == pygame.QUIT:
+                quit_game(run, idx)
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
+                if show_pause_menu() == 'main_menu': return STOP
+                run.invalidate(); draw_dialogue_frame(run, shown)
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_F5:
+                save_system.save_game(run.snapshot(idx), "quicksave", screen)
+                run.show_save_status("Saving...")
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_F9:
+                data = save_system.load_game("quicksave")
+                if data: return data
+            # Wheel turns also arrive as buttons 4 and 5; MOUSEWHEEL handles them
+            if e.type == pygame.MOUSEBUTTONDOWN and e.button not in (4, 5):
+                if run.save_r.collidepoint(e.pos):
+                    # Capture before the browser covers the frame
+                    state, frame = run.snapshot(idx), screen.copy()
+                    slot = show_save_selection_menu("save")
+                    run.invalidate()
+                    if slot is not None:
+                        # Written in the background; SAVE_COMPLETE updates the indicator
+                        save_system.save_game(state, slot, frame)
+                        run.show_save_status("Saving...")
+                    else:
+                        draw_dialogue_frame(run, shown)
+                elif run.load_r.collidepoint(e.pos):
+                    slot = show_save_selection_menu()
+                    run.invalidate()
+                    data = save_system.load_game(slot) if slot else None
+                    if data: return data
+                    draw_dialogue_frame(run, shown)
+                elif back:
+                    # Continue from the line scrolled back to
+                    return run.rewind_to(back)
+                else: return None
+        if back != shown_back:
+            step = run.rewind.step(back)
+            run.show_step(step)
+            shown = run.program.ops[step.index]; shown_back = back
+            draw_dialogue_frame(run, shown)
+
+def op_sound(run, idx, op):
+    snd = prefetcher.load_sound(op.file) if op.file else None
+    if op.ambient:
+        channel_pool.stop('ambient')
+        run.ambient = op.file if snd and op.loop else None
+        if run.ambient: channel_pool.play(snd, 'ambient', loops=-1)
+    elif snd: channel_pool.play(snd, 'sfx', volume=0.3)
+
+def op_music(run, idx, op):
+    music_engine.play(op.file, op.loop)
+
+def op_stop_music(run, idx, op):
+    music_engine.stop()
+
+def op_fade(run, idx, op):
+    fs = pygame.Surface(run.size()); fs.fill(op.color); fs.set_alpha(0)
+    clock = pygame.time.Clock(); a_step = 255 / (op.duration * 60); a = 0
+    c = run.compositor
+    run.set_scene(with_character=False); c.clear_layer('chrome'); c.clear_layer('text')
+    while a < 255:
+        fs.set_alpha(int(a))
+        c.set_layer('overlay', int(a), lambda: [(fs, (0, 0))])
+        c.compose(screen); presenter.present(); a += a_step; clock.tick(60)
+    # The faded frame stays on the display until the next compose replaces it
+    c.clear_layer('overlay')
+
+def op_wait(run, idx, op):
+    d = op.duration
+    if 'black_screen' in run.curr_bg_file.lower():
+        clock = pygame.time.Clock(); zf = 1.0; tz = 1.05; steps = int(d * 60); zs = (tz - zf) / steps
+        w, h = run.size()
+        ob = pygame.Surface((w, h)); ob.fill((20, 20, 20))
+        for _ in range(steps):
+            zf += zs; zw = int(w * zf); zh = int(h * zf)
+            zz = pygame.transform.smoothscale(ob, (zw, zh))
+            screen.fill(BLACK); screen.blit(zz, ((w - zw) // 2, (h - zh) // 2)); presenter.mark_all(); presenter.present(); clock.tick(60)
+        run.invalidate()
+    else: pygame.time.delay(int(d * 1000))
+
+def op_minigame(run, idx, op):
+    result = minigame_registry.launch(op.kind, screen)
+    if result is QUIT_GAME:
+        # The window was closed inside the game: save at the minigame and quit like the dialogue does
+        quit_game(run, idx)
+    # Saves keep plain results (scores, win/lose); entry points may return anything
+    if result is None or isinstance(result, (bool, int, float, str)):
+        run.minigame_results[op.kind] = result
+    run.invalidate()
+
+def op_noop(run, idx, op):
+    pass
+
+# Opcode type -> handler. A handler returns None to continue with the next
+# opcode, STOP to return to the menu, a command index or Snapshot to jump to,
+# or the RewindStep the player scrolled back to.
+OP_HANDLERS = {
+    Background: op_background,
+    Character: op_character,
+    HideCharacter: op_hide_character,
+    Dialogue: op_dialogue,
+    Sound: op_sound,
+    Music: op_music,
+    StopMusic: op_stop_music,
+    Fade: op_fade,
+    Wait: op_wait,
+    Minigame: op_minigame,
+    Noop: op_noop
+}
+
+def start_new_game(start_index=0, state=None):
+    """Run the script from `start_index`, or from a loaded Snapshot."""
+    program = compile_script("script.json")
+    if not program: return
+    run = ScriptRun(program)
+    ops = program.ops
+    prefetcher.reset(ops, run.size())
+
+    # Restore the state at start_index with one lookup instead of replaying the prefix
+    if state is not None:
+        start_index = state.index
+    if start_index > 0:
+        run.restore(start_index)
+    if state is not None:
+        run.apply(state)
+
+    pygame.time.set_timer(AUTOSAVE, AUTOSAVE_INTERVAL_MS)
+    idx = start_index
+    while idx < len(ops):
+        op = ops[idx]
+        prefetcher.update(idx)
+        result = OP_HANDLERS[type(op)](run, idx, op)
+        if result is STOP:
+            break
+        if result is None:
+            idx += 1
+        else:
+            # Jump (e.g. loading a save): restore state in place, no script reload
+            if isinstance(result, RewindStep):
+                # Rewound: the run already holds that line's state
+                idx = result.index
+                continue
+            run.rewind.clear()
+            idx = result.index if isinstance(result, Snapshot) else result
+            prefetcher.reset(ops, run.size())
+            run.restore(idx)
+            if isinstance(result, Snapshot):
+                run.apply(result)
+    pygame.time.set_timer(AUTOSAVE, 0)
+
+
+def debug_start_index(argv):
+    """Return the command index requested with `--start N` or `--chapter N`, or None."""
+    for flag in ("--start", "--chapter"):
+        if flag in argv[:-1]:
+            arg = argv[argv.index(flag) + 1]
+            try:
+                value = int(arg)
+            except ValueError:
+                logging.warning(f"Ignoring {flag} {arg!r}: not a number")
+                return None
+            program = compile_script("script.json")
+            if not program:
+                return None
+            if flag == "--start":
+                if not 0 <= value < len(program.ops):
+                    logging.warning(f"Ignoring --start {value}: the script has commands 0-{len(program.ops) - 1}")
+                    return None
+                return value
+            if not 1 <= value <= len(program.keyframes.chapters):
+                logging.warning(f"Ignoring --chapter {value}: the script has chapters 1-{len(program.keyframes.chapters)}")
+                return None
+            return program.keyframes.chapter_start(value)
+    return None
+
+def report_first_frame(argv):
+    """Log time-to-first-menu-frame; with `--startup-benchmark` print it and exit."""
+    elapsed_ms = (time.perf_counter() - STARTUP_T0) * 1000
+    logging.info(f"First menu frame after {elapsed_ms:.1f} ms")
+    if "--startup-benchmark" in argv:
+        print(f"time to first menu frame: {elapsed_ms:.1f} ms")
+        pygame.quit()
+        sys.exit()
 
 def main():
     """Main game loop."""
@@ -309,15 +562,22 @@ def main():
 
     # Create buttons
     buttons = [
-        create_button("New Game", 300),
-        create_button("Continue", 400),
-        create_button("Gallery", 500)
+        create_button("New Game", WINDOW_HEIGHT * 3 // 8, WINDOW_WIDTH),
+        create_button("Continue", WINDOW_HEIGHT // 2, WINDOW_WIDTH),
+        create_button("Gallery", WINDOW_HEIGHT * 5 // 8, WINDOW_WIDTH)
     ]
 
-    mute_icon_rect = create_mute_icon()
-    gallery = GallerySystem()   # ← instantiate here
+    mute_icon_rect = create_mute_icon(WINDOW_WIDTH)
+
+    # Debug: jump straight into the script, e.g. `python main.py --start 42`
+    start_index = debug_start_index(sys.argv[1:])
+    if start_index is not None:
+        start_new_game(start_index)
 
-    clock = pygame.time.Clock()
+    # (screen, gallery page) and mute state currently on the display
+    shown_view = None
+    shown_muted = None
+    first_frame = True
 
     while True:
         screen.fill(WHITE)
@@ -326,7 +586,7 @@ def main():
         if current_screen == "main_menu":
             # Draw title
             title_text = TITLE_FONT.render("CarCare", True, BLACK)
-            title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 200))
+            title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
             screen.blit(title_text, title_rect)
 
             # Draw buttons
@@ -346,20 +606,29 @@ def main():
             gallery.draw(screen)
 
             # Draw Back button
-            back_font = pygame.font.Font(None, 36)
+            back_font = get_font(None, 36)
             back_text = back_font.render("← Back", True, BLACK)
             back_rect = back_text.get_rect(topleft=(20, 20))
             screen.blit(back_text, back_rect)
 
-        # Flip & tick here so both screens render first
-        pygame.display.flip()
-        clock.tick(60)
+        # Both screens are static: push everything only when the view changed,
+        # otherwise just the mute icon when it was toggled
+        view = (current_screen, gallery.current_page)
+        if view != shown_view:
+            presenter.mark_all()
+        elif current_screen == "main_menu" and is_muted != shown_muted:
+            presenter.mark(volume_on.get_rect(topleft=mute_icon_rect.topleft))
+        presenter.present()
+        shown_view, shown_muted = view, is_muted
+        if first_frame:
+            report_first_frame(sys.argv[1:])
+            first_frame = False
 
         # === EVENT HANDLING ===
-        for event in pygame.event.get():
+        # Both screens are static, so sleep until input arrives
+        for event in wait_events():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                shutdown()
 
             # Mouse clicks
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -370,6 +639,8 @@ def main():
                     # Buttons
                     for i, (_, _, btn_rect) in enumerate(buttons):
                         if btn_rect.collidepoint(mx, my):
+                            # Anything but the gallery leaves another screen on the display
+                            shown_view = None
                             if i == 0:
                                 start_new_game()
                             elif i == 1:
@@ -377,13 +648,15 @@ def main():
                                 if slot:
                                     data = save_system.load_game(slot)
                                     if data:
-                                        start_new_game(data.get("current_command_index", 0))
+                                        start_new_game(state=data)
                             elif i == 2:
                                 current_screen = "gallery"
 
                     # Mute icon
                     if mute_icon_rect.collidepoint(mx, my):
                         is_muted = not is_muted
+                        channel_pool.set_muted(is_muted)
+                        channel_pool.apply()
 
                 # Gallery clicks
                 elif current_screen == "gallery":
@@ -1,25 +1,27 @@
 import pygame
-from constants import WHITE, BLACK, GRAY, FONT, WINDOW_WIDTH, WINDOW_HEIGHT
+from constants import WHITE, BLACK, GRAY, FONT, WINDOW_WIDTH
+from text_layout import wrap_text, render_line
+from font_registry import get_font
 
-def create_button(text, y_position):
+def create_button(text, y_position, width=WINDOW_WIDTH):
     """Create a button with the given text at the specified y-position."""
     text_surface = FONT.render(text, True, BLACK)
-    button_rect = pygame.Rect(WINDOW_WIDTH // 2 - 100, y_position, 200, 50)
+    button_rect = pygame.Rect(width // 2 - 100, y_position, 200, 50)
     text_rect = text_surface.get_rect(center=button_rect.center)
     return text_surface, text_rect, button_rect
 
-def create_mute_icon():
+def create_mute_icon(width=WINDOW_WIDTH):
     """Create the mute icon in the upper-right corner."""
     padding = 20  # Space from the edges
     icon_size = 10  # Size of the icon (adjust as needed)
-    return pygame.Rect(WINDOW_WIDTH - icon_size - padding, padding, icon_size, icon_size)
+    return pygame.Rect(width - icon_size - padding, padding, icon_size, icon_size)
 
 def draw_gallery_screen(screen, gallery):
     """Draw the gallery screen."""
     screen.fill(WHITE)
     
     # Draw back button
-    back_button = create_button("Back", WINDOW_HEIGHT - 100)[2]
+    back_button = create_button("Back", screen.get_height() - 100, screen.get_width())[2]
     pygame.draw.rect(screen, GRAY, back_button)
     text = FONT.render("Back", True, BLACK)
     text_rect = text.get_rect(center=back_button.center)
@@ -29,8 +31,9 @@ def draw_gallery_screen(screen, gallery):
     gallery.draw(screen)
     
     return back_button
-def draw_dialogue(screen, speaker, text):
-    window_width, window_height = screen.get_size()
+def dialogue_box_rect(window_size):
+    """Return the dialogue box rect for a window of the given size."""
+    window_width, window_height = window_size
 
     # Set dialogue box to 80% of the window width
     dialogue_width = int(window_width * 0.8)
@@ -38,35 +41,37 @@ def draw_dialogue(screen, speaker, text):
     dialogue_x = (window_width - dialogue_width) // 2
     dialogue_y = window_height - dialogue_height - 30  # 30px margin from bottom
 
-    dialogue_box_rect = pygame.Rect(dialogue_x, dialogue_y, dialogue_width, dialogue_height)
+    return pygame.Rect(dialogue_x, dialogue_y, dialogue_width, dialogue_height)
+
+def draw_dialogue_box(surface, dialogue_box_rect):
+    """Draw the empty dialogue box."""
+    pygame.draw.rect(surface, (200, 200, 200), dialogue_box_rect)  # Light gray
+    pygame.draw.rect(surface, (0, 0, 0), dialogue_box_rect, 3)      # Black border
 
-    # Draw the dialogue box
-    pygame.draw.rect(screen, (200, 200, 200), dialogue_box_rect)  # Light gray
-    pygame.draw.rect(screen, (0, 0, 0), dialogue_box_rect, 3)      # Black border
+def draw_dialogue_text(surface, dialogue_box_rect, speaker, text):
+    """Draw the speaker and wrapped text inside the box and return the rects drawn."""
+    dialogue_width = dialogue_box_rect.width
 
     # Fonts
-    speaker_font = pygame.font.Font(None, 42)
-    text_font = pygame.font.Font(None, 32)
+    speaker_font = get_font(None, 42)
+    text_font = get_font(None, 32)
 
     # Render speaker name
-    speaker_surface = speaker_font.render(speaker, True, (0, 0, 0))
-    screen.blit(speaker_surface, (dialogue_box_rect.x + 20, dialogue_box_rect.y + 10))
-
-    # Word wrapping
-    words = text.split(' ')
-    lines = []
-    current_line = ""
+    speaker_surface = render_line(speaker, speaker_font, (0, 0, 0))
+    drawn = [surface.blit(speaker_surface, (dialogue_box_rect.x + 20, dialogue_box_rect.y + 10))]
 
-    for word in words:
-        test_line = current_line + word + " "
-        if text_font.size(test_line)[0] < dialogue_width - 40:
-            current_line = test_line
-        else:
-            lines.append(current_line)
-            current_line = word + " "
-    lines.append(current_line)
+    # Word wrapping (cached per text and width)
+    lines = wrap_text(text, text_font, dialogue_width - 40)
 
-    # Draw each wrapped line
+    # Draw each wrapped line; long text can spill below the box
     for i, line in enumerate(lines):
-        line_surface = text_font.render(line, True, (0, 0, 0))
-        screen.blit(line_surface, (dialogue_box_rect.x + 20, dialogue_box_rect.y + 60 + i * 35))
+        line_surface = render_line(line, text_font, (0, 0, 0))
+        drawn.append(surface.blit(line_surface, (dialogue_box_rect.x + 20, dialogue_box_rect.y + 60 + i * 35)))
+
+    return drawn
+
+def draw_dialogue(screen, speaker, text):
+    """Draw the dialogue box and return the screen area it covers."""
+    box = dialogue_box_rect(screen.get_size())
+    draw_dialogue_box(screen, box)
+    return box.unionall(draw_dialogue_text(screen, box, speaker, text))
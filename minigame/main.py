@@ -1,7 +1,8 @@
 import pygame
-import sys
 import os
 from pygame.locals import *
+from surface_cache import load_image
+from minigame_host import minigame_host, QUIT_GAME
 
 def start_minigame(screen):
     """Run the minigame."""
@@ -12,21 +13,12 @@ def start_minigame(screen):
     # Load images
     images_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
     try:
-        background = pygame.image.load(os.path.join(images_folder, 'Car_hood.png'))
-        background = pygame.transform.scale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-
-        oil_cap = pygame.image.load(os.path.join(images_folder, 'oil_cap.png'))
-        oil_cap = pygame.transform.scale(oil_cap, (80, 80))
-
-        oil_meter = pygame.image.load(os.path.join(images_folder, 'Oil_Meter.png'))
-        oil_meter = pygame.transform.scale(oil_meter, (100, 100))
-
-        inserted_meter = pygame.image.load(os.path.join(images_folder, 'Oil_meter_in.png'))
-        inserted_meter = pygame.transform.scale(inserted_meter, (200, 200))
-        
-        unfilled_meter = pygame.image.load(os.path.join(images_folder, 'Oil_meter_unfilled.png'))
-        unfilled_meter = pygame.transform.scale(unfilled_meter, (400, 400))
-    except pygame.error as e:
+        background = load_image(os.path.join(images_folder, 'Car_hood.png'), (SCREEN_WIDTH, SCREEN_HEIGHT))
+        oil_cap = load_image(os.path.join(images_folder, 'oil_cap.png'), (80, 80))
+        oil_meter = load_image(os.path.join(images_folder, 'Oil_Meter.png'), (100, 100))
+        inserted_meter = load_image(os.path.join(images_folder, 'Oil_meter_in.png'), (200, 200))
+        unfilled_meter = load_image(os.path.join(images_folder, 'Oil_meter_unfilled.png'), (400, 400))
+    except (pygame.error, OSError) as e:
         print(f"Couldn't load images: {e}")
         return "error"
 
@@ -70,19 +62,18 @@ def start_minigame(screen):
     error_timer = 0
 
     # Game loop
-    clock = pygame.time.Clock()
+    clock = minigame_host.clock
     running = True
 
     while running:
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = minigame_host.mouse_pos()
         oil_cap_hover = oil_cap_rect.collidepoint(mouse_pos) and not oil_cap_rising
         oil_meter_hover = oil_meter_rect.collidepoint(mouse_pos)
         unfilled_meter_hover = unfilled_meter_rect.collidepoint(mouse_pos)
 
-        for event in pygame.event.get():
+        for event in minigame_host.get_events():
             if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
+                return QUIT_GAME
 
             if event.type == MOUSEBUTTONDOWN and event.button == 1:  # Left click
                 if current_scene == SCENE_1:
@@ -177,7 +168,7 @@ def start_minigame(screen):
                 if fade_progress <= 0:
                     running = False
 
-        pygame.display.flip()
+        minigame_host.flip()
         clock.tick(60)
 
     return "success"  # Return a result when the minigame ends
\ No newline at end of file
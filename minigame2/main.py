@@ -1,7 +1,8 @@
 import pygame
-import sys
 import os
 from pygame.locals import *
+from surface_cache import load_image
+from minigame_host import minigame_host, QUIT_GAME
 
 def start_minigame():
     # Initialize pygame
@@ -10,7 +11,7 @@ def start_minigame():
     # Set up the display
     SCREEN_WIDTH = 800
     SCREEN_HEIGHT = 600
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = minigame_host.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption('Point-and-Click Adventure')
 
     # Get the directory of this file
@@ -18,23 +19,14 @@ def start_minigame():
 
     # Load images
     try:
-        background = pygame.image.load(os.path.join(base_dir, 'Car_hood.jpg'))
-        background = pygame.transform.scale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-
-        oil_cap = pygame.image.load(os.path.join(base_dir, 'oil_cap.png'))
-        oil_cap = pygame.transform.scale(oil_cap, (80, 80))
-
-        oil_meter = pygame.image.load(os.path.join(base_dir, 'Oil_Meter.jpg'))
-        oil_meter = pygame.transform.scale(oil_meter, (100, 100))
-
-        inserted_meter = pygame.image.load(os.path.join(base_dir, 'Oil_meter_in.png'))
-        inserted_meter = pygame.transform.scale(inserted_meter, (200, 200))
-
-        unfilled_meter = pygame.image.load(os.path.join(base_dir, 'Oil_meter_unfilled.png'))
-        unfilled_meter = pygame.transform.scale(unfilled_meter, (400, 400))
-    except pygame.error as e:
+        background = load_image(os.path.join(base_dir, 'Car_hood.jpg'), (SCREEN_WIDTH, SCREEN_HEIGHT))
+        oil_cap = load_image(os.path.join(base_dir, 'oil_cap.png'), (80, 80))
+        oil_meter = load_image(os.path.join(base_dir, 'Oil_Meter.jpg'), (100, 100))
+        inserted_meter = load_image(os.path.join(base_dir, 'Oil_meter_in.png'), (200, 200))
+        unfilled_meter = load_image(os.path.join(base_dir, 'Oil_meter_unfilled.png'), (400, 400))
+    except (pygame.error, OSError) as e:
         print(f"Couldn't load images: {e}")
-        sys.exit(1)
+        return "error"
 
     # Game states
     SCENE_1 = 0
@@ -84,18 +76,18 @@ def start_minigame():
     error_timer = 0
 
     # Game loop
-    clock = pygame.time.Clock()
+    clock = minigame_host.clock
     running = True
 
     while running:
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = minigame_host.mouse_pos()
         oil_cap_hover = oil_cap_rect.collidepoint(mouse_pos) and not oil_cap_rising
         oil_meter_hover = oil_meter_rect.collidepoint(mouse_pos)
         unfilled_meter_hover = unfilled_meter_rect.collidepoint(mouse_pos)
 
-        for event in pygame.event.get():
+        for event in minigame_host.get_events():
             if event.type == QUIT:
-                running = False
+                return QUIT_GAME
 
             if event.type == MOUSEBUTTONDOWN and event.button == 1:  # Left click
                 if current_scene == SCENE_1:
@@ -199,5 +191,5 @@ def start_minigame():
                 if fade_progress <= 0:
                     running = False
 
-        pygame.display.flip()
+        minigame_host.flip()
         clock.tick(60)
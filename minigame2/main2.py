@@ -1,9 +1,10 @@
 import pygame
-import sys
 import os
 import math
 import random
 from pygame.locals import *
+from surface_cache import load_image
+from minigame_host import minigame_host, QUIT_GAME
 
 def start_oil_spill_challenge():
     # Initialize pygame
@@ -12,7 +13,7 @@ def start_oil_spill_challenge():
     # Set up the display
     SCREEN_WIDTH = 800
     SCREEN_HEIGHT = 600
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = minigame_host.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption('Oil Spill Challenge')
 
     # Game states
@@ -28,12 +29,11 @@ def start_oil_spill_challenge():
     base_dir = os.path.dirname(__file__)  # Get the directory of this file
 
     try:
-        background = pygame.image.load(os.path.join(base_dir, 'Car_hood.jpg'))
-        background = pygame.transform.scale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        background = load_image(os.path.join(base_dir, 'Car_hood.jpg'), (SCREEN_WIDTH, SCREEN_HEIGHT))
 
         oil_container_path = os.path.join(base_dir, 'plastic-motor-oil-container-3d-model-max-obj-fbx.png')
         print("Loading oil container from:", oil_container_path)  # Debugging
-        oil_container_original = pygame.image.load(oil_container_path)
+        oil_container_original = load_image(oil_container_path)
         aspect_ratio = oil_container_original.get_height() / oil_container_original.get_width()
         target_width = 300
         oil_container = pygame.transform.scale(
@@ -41,10 +41,10 @@ def start_oil_spill_challenge():
         oil_container = pygame.transform.flip(oil_container, True, False)
     except FileNotFoundError as e:
         print(f"File not found: {e}")
-        sys.exit(1)
+        return "error"
     except pygame.error as e:
         print(f"Couldn't load images: {e}")
-        sys.exit(1)
+        return "error"
 
     # Helper function for text with background
     def create_text_with_background(text, font_obj, color=(255, 255, 255)):
@@ -108,15 +108,15 @@ def start_oil_spill_challenge():
     fade_surface.fill((0, 0, 0))
 
     # Game loop
-    clock = pygame.time.Clock()
+    clock = minigame_host.clock
     running = True
 
     while running:
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = minigame_host.mouse_pos()
 
-        for event in pygame.event.get():
+        for event in minigame_host.get_events():
             if event.type == QUIT:
-                running = False
+                return QUIT_GAME
 
             if event.type == MOUSEBUTTONDOWN:
                 if current_state == STATES["GAME_OVER"] and retry_button.collidepoint(mouse_pos):
@@ -172,7 +172,7 @@ def start_oil_spill_challenge():
 
                 else:
                     # Update container physics
-                    mouse_x = pygame.mouse.get_pos()[0]
+                    mouse_x = minigame_host.mouse_pos()[0]
                     tilt_factor = (mouse_x - (SCREEN_WIDTH // 2)) / 300.0
                     container_velocity += tilt_factor * 0.15
                     container_velocity *= 0.985
@@ -199,7 +199,7 @@ def start_oil_spill_challenge():
             screen.blit(victory_text, victory_rect)
             screen.blit(continue_text, continue_rect)
 
-        pygame.display.flip()
+        minigame_host.flip()
         clock.tick(60)
 
-    pygame.quit()
\ No newline at end of file
+    return "success"
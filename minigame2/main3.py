@@ -2,6 +2,8 @@ import pygame
 import sys
 import os
 from pygame.locals import *
+from surface_cache import load_image
+from minigame_host import minigame_host, QUIT_GAME
 
 def start_oil_drain_challenge():
     # Initialize pygame
@@ -10,7 +12,7 @@ def start_oil_drain_challenge():
     # Set up the display
     SCREEN_WIDTH = 800
     SCREEN_HEIGHT = 600
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = minigame_host.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption('Oil Drain Challenge')
 
     # Helper function for text with background
@@ -27,8 +29,7 @@ def start_oil_drain_challenge():
     try:
         background_path = os.path.join(base_dir, 'Car_hood.jpg')
         print(f"Loading background from: {background_path}")  # Debugging
-        background = pygame.image.load(background_path)
-        background = pygame.transform.scale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        background = load_image(background_path, (SCREEN_WIDTH, SCREEN_HEIGHT))
         has_background = True
     except (FileNotFoundError, pygame.error) as e:
         print(f"Warning: Could not load background image: {e}")
@@ -38,8 +39,7 @@ def start_oil_drain_challenge():
     try:
         oil_drain_path = os.path.join(base_dir, 'Oil_drain.png')
         print(f"Loading oil drain from: {oil_drain_path}")  # Debugging
-        oil_drain = pygame.image.load(oil_drain_path)
-        oil_drain = pygame.transform.scale(oil_drain, (400, 400))  # 2x bigger
+        oil_drain = load_image(oil_drain_path, (400, 400))  # 2x bigger
         has_oil_drain = True
     except (FileNotFoundError, pygame.error) as e:
         print(f"Warning: Could not load oil drain image: {e}")
@@ -80,15 +80,15 @@ def start_oil_drain_challenge():
     continue_text = create_text_with_background("Click to continue", font)
 
     # Game loop
-    clock = pygame.time.Clock()
+    clock = minigame_host.clock
     running = True
 
     while running:
         current_time = pygame.time.get_ticks()
 
-        for event in pygame.event.get():
+        for event in minigame_host.get_events():
             if event.type == QUIT:
-                running = False
+                return QUIT_GAME
 
             if current_state == STATES["WAITING"]:
                 if (event.type == KEYDOWN and event.key == K_SPACE) or event.type == MOUSEBUTTONDOWN:
@@ -167,10 +167,6 @@ def start_oil_drain_challenge():
             screen.blit(be_faster_text, be_faster_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)))
             screen.blit(retry_text, retry_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100)))
 
-        pygame.display.flip()
+        minigame_host.flip()
         clock.tick(60)
 
-    # Switch to fullscreen before exiting
-    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-    pygame.display.set_caption('Oil Drain Challenge - Fullscreen Mode')
-
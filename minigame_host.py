@@ -0,0 +1,125 @@
+import time
+import logging
+import pygame
+
+# What a minigame returns when the player closed the window; the novel saves and quits
+QUIT_GAME = object()
+
+class MinigameHost:
+    """Runs minigames on a fixed-size canvas inside the novel's existing window.
+
+    Minigames call `set_mode(size)` instead of `pygame.display.set_mode`
+    and get a virtual canvas of that size; `flip()` scales it onto the real
+    display once per frame (letterboxed, keeping the aspect ratio). When the
+    requested size matches the display the canvas *is* the display and
+    nothing is scaled. Mouse positions from `get_events()`/`mouse_pos()` are
+    translated into canvas coordinates. All games share one clock, and the
+    video mode is never changed, so entering and leaving a minigame costs
+    no mode switch. Minigames never quit pygame themselves: on QUIT they
+    return QUIT_GAME and the novel decides what to do.
+    """
+
+    def __init__(self):
+        self.clock = pygame.time.Clock()
+        self.canvas = None
+        self._dest = None
+        self._display_size = None
+        self._caption = None
+
+        # Counters
+        self.mode_switches = 0
+        self.frames = 0
+        self.scale_seconds = 0.0
+        self.enter_seconds = 0.0
+
+    def set_mode(self, size=(0, 0), flags=0):
+        """Return a canvas of `size` to draw on; FULLSCREEN or (0, 0) means the display size."""
+        start = time.perf_counter()
+        display = pygame.display.get_surface()
+        if display is None:
+            # Started on its own: there is no novel window to share
+            self.mode_switches += 1
+            display = pygame.display.set_mode(size, flags)
+        if self._caption is None:
+            self._caption = pygame.display.get_caption()[0]
+
+        if flags & pygame.FULLSCREEN or not (size[0] and size[1]):
+            size = display.get_size()
+        if tuple(size) == display.get_size():
+            self.canvas = display
+        else:
+            self.canvas = pygame.Surface(size).convert()
+        self._layout(display)
+        self.enter_seconds = time.perf_counter() - start
+        return self.canvas
+
+    def _layout(self, display):
+        """Fit the canvas into the display, centred with black bars."""
+        dw, dh = self._display_size = display.get_size()
+        cw, ch = self.canvas.get_size()
+        scale = min(dw / cw, dh / ch)
+        self._dest = pygame.Rect(0, 0, int(cw * scale), int(ch * scale))
+        self._dest.center = (dw // 2, dh // 2)
+        if self.canvas is not display:
+            display.fill((0, 0, 0))
+
+    def flip(self):
+        """Show the canvas on the display."""
+        display = pygame.display.get_surface()
+        if self.canvas is not None and self.canvas is not display:
+            if display.get_size() != self._display_size:
+                self._layout(display)
+            start = time.perf_counter()
+            pygame.transform.scale(self.canvas, self._dest.size, display.subsurface(self._dest))
+            self.scale_seconds += time.perf_counter() - start
+        self.frames += 1
+        pygame.display.flip()
+
+    def to_canvas(self, pos):
+        """Convert a display position to canvas coordinates."""
+        if self.canvas is None or self.canvas is pygame.display.get_surface():
+            return pos
+        cw, ch = self.canvas.get_size()
+        return (int((pos[0] - self._dest.x) * cw / self._dest.width),
+                int((pos[1] - self._dest.y) * ch / self._dest.height))
+
+    def mouse_pos(self):
+        """Return the mouse position on the canvas."""
+        return self.to_canvas(pygame.mouse.get_pos())
+
+    def get_events(self):
+        """Return pending events with mouse positions in canvas coordinates."""
+        events = pygame.event.get()
+        if self.canvas is None or self.canvas is pygame.display.get_surface():
+            return events
+        translated = []
+        for event in events:
+            if hasattr(event, 'pos'):
+                attrs = dict(event.dict, pos=self.to_canvas(event.pos))
+                event = pygame.event.Event(event.type, attrs)
+            translated.append(event)
+        return translated
+
+    def close(self):
+        """Drop the canvas and give the window back to the novel."""
+        if self._caption is not None:
+            pygame.display.set_caption(self._caption)
+        self.canvas = None
+        self._caption = None
+
+    def stats(self):
+        """Return mode-switch and scaling counters."""
+        return {
+            'mode_switches': self.mode_switches,
+            'last_enter_ms': round(self.enter_seconds * 1000, 2),
+            'frames': self.frames,
+            'avg_scale_ms': round(self.scale_seconds * 1000 / self.frames, 3) if self.frames else 0.0
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Minigame host: {self.stats()}")
+
+
+# Shared instance: every minigame draws through it
+minigame_host = MinigameHost()
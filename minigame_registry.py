@@ -0,0 +1,113 @@
+import time
+import logging
+import importlib
+import threading
+from minigame_host import minigame_host
+
+def _call(entry, screen):
+    return entry()
+
+def _call_with_screen(entry, screen):
+    # Draws through the host at the novel's canvas size, not on the canvas itself
+    return entry(minigame_host.set_mode(screen.get_size() if screen else (0, 0)))
+
+def _start_game(entry, screen):
+    return entry().start_game()
+
+def _start_game_loop(entry, screen):
+    return entry().start_game_loop()
+
+# Script command type -> (module, entry point, how to launch it)
+MINIGAMES = {
+    'quiz': ('quiz', 'run_quiz', _call),
+    'tube_game': ('tube_game.tire', 'run_graduated_tube_game', _call),
+    'under_the_hood_game': ('test.challenge', 'UnderTheHoodGame', _start_game),
+    'cosmic_challenge': ('cargame.game', 'start_cosmic_challenge', _call),
+    'fuse_game': ('fuse', 'FuseMemoryGame', _start_game_loop),
+    'minigame': ('minigame.main', 'start_minigame', _call_with_screen),
+    'minigame2': ('minigame2.main', 'start_minigame', _call),
+    'oil_spill_challenge': ('minigame2.main2', 'start_oil_spill_challenge', _call),
+    'oil_drain_challenge': ('minigame2.main3', 'start_oil_drain_challenge', _call)
+}
+
+class MinigameRegistry:
+    """Maps script command types to minigames, importing each module on first use.
+
+    `preload(kind)` imports a module on a background thread ahead of time
+    (the asset prefetcher calls it when a minigame command enters its
+    look-ahead window), so the jump into the game doesn't pay for the import.
+    Minigame modules must not open windows, load art or create fonts at
+    import time: fonts and surfaces are only ever created on the main thread.
+    """
+
+    def __init__(self, games=MINIGAMES):
+        self.games = dict(games)
+        self._entries = {}
+        self._lock = threading.Lock()
+        # Kinds with a preload thread running; its own lock, as _lock is held for whole imports
+        self._preloading = set()
+        self._preloading_lock = threading.Lock()
+        self.import_seconds = {}
+
+    def register(self, kind, module, attr, launch=_call):
+        """Add or replace the minigame for a command type."""
+        self.games[kind] = (module, attr, launch)
+        self._entries.pop(kind, None)
+
+    def load(self, kind):
+        """Import the minigame's module if needed and return its entry point."""
+        entry = self._entries.get(kind)
+        if entry is not None:
+            return entry
+        module_name, attr, _ = self.games[kind]
+        with self._lock:
+            entry = self._entries.get(kind)
+            if entry is None:
+                start = time.perf_counter()
+                entry = getattr(importlib.import_module(module_name), attr)
+                self.import_seconds[kind] = time.perf_counter() - start
+                self._entries[kind] = entry
+        return entry
+
+    def preload(self, kind):
+        """Import a minigame in the background; a no-op once it is loaded or being preloaded."""
+        if kind in self._entries or kind not in self.games:
+            return None
+        with self._preloading_lock:
+            if kind in self._preloading:
+                return None
+            self._preloading.add(kind)
+        thread = threading.Thread(target=self._preload, args=(kind,), name=f"preload-{kind}", daemon=True)
+        thread.start()
+        return thread
+
+    def _preload(self, kind):
+        try:
+            self.load(kind)
+        except Exception as e:
+            # The real launch will import again and report the error in context
+            logging.warning(f"Preloading minigame '{kind}' failed: {e}")
+        finally:
+            with self._preloading_lock:
+                self._preloading.discard(kind)
+
+    def launch(self, kind, screen=None):
+        """Run the minigame for a command type."""
+        _, _, launch = self.games[kind]
+        try:
+            return launch(self.load(kind), screen)
+        finally:
+            minigame_host.close()
+
+    def stats(self):
+        """Return which minigames are loaded and how long each import took."""
+        return {kind: round(seconds * 1000, 1) for kind, seconds in self.import_seconds.items()}
+
+    def log_stats(self):
+        """Log the import times (ms)."""
+        logging.info(f"Minigame imports (ms): {self.stats()}")
+        minigame_host.log_stats()
+
+
+# Shared instance used by the script runner
+minigame_registry = MinigameRegistry()
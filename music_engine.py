@@ -0,0 +1,160 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from constants import MUSIC_CROSSFADE_MS, MUSIC_DUCK_GAIN, MUSIC_DUCK_MS, MUSIC_DUCK_BUSES, MUSIC_PRELOAD_TRACKS
+from audio_cache import audio_cache
+from channel_pool import channel_pool
+
+class MusicEngine:
+    """Plays music tracks on the "music" bus with crossfades and ducking.
+
+    Tracks are decoded on a worker thread (`preload`, which the asset
+    prefetcher calls when a music command enters its window), so `play()`
+    never opens a file on the main thread: if the track isn't decoded yet
+    it starts from `update()` once it is. Decoded tracks are whole PCM
+    Sounds, so besides the playing and the starting track only the newest
+    `max_preloads` unplayed ones are kept. A new track fades in while the
+    old one fades out on the bus's other voice; asking for the track that
+    is already playing does nothing. While anything plays on
+    MUSIC_DUCK_BUSES the music bus gain ramps down to MUSIC_DUCK_GAIN.
+
+    `update()` must be called from the loop; `event_loop.wait_events`
+    does, and wakes up more often while `active()`.
+    """
+
+    def __init__(self, max_preloads=MUSIC_PRELOAD_TRACKS):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music")
+        self.max_preloads = max(0, max_preloads)
+        self._tracks = {}  # path -> Future of its Sound, oldest preload first
+        self.current = None
+        self.loop = False
+        self._channel = None
+        self._pending = None
+        self.duck = 1.0
+        self._last_update = None
+
+        # Counters
+        self.crossfades = 0
+        self.skipped_reloads = 0
+        self.late_starts = 0
+        self.evicted = 0
+
+    @staticmethod
+    def _decode(path):
+        return pygame.mixer.Sound(audio_cache.resolve(path))
+
+    def preload(self, path):
+        """Start decoding a track in the background."""
+        if path and path not in self._tracks:
+            self._tracks[path] = self._executor.submit(self._decode, path)
+            self._evict()
+
+    def _evict(self):
+        """Drop the oldest unplayed preloads beyond `max_preloads`."""
+        keep = {self.current, self._pending[0] if self._pending else None}
+        preloads = [path for path in self._tracks if path not in keep]
+        for path in preloads[:max(0, len(preloads) - self.max_preloads)]:
+            self._tracks.pop(path).cancel()
+            self.evicted += 1
+
+    def playing(self, path=None):
+        """Whether music (or the given track) is playing or about to."""
+        if self._pending and (path is None or self._pending[0] == path):
+            return True
+        busy = self._channel is not None and self._channel.get_busy()
+        return busy and (path is None or self.current == path)
+
+    def play(self, path, loop=True, fade_ms=MUSIC_CROSSFADE_MS):
+        """Crossfade to `path`; a no-op if it is already playing."""
+        if self.playing(path):
+            if self._pending and self._pending[0] != path:
+                # Asked for the playing track again: drop the one queued behind it
+                self._pending = None
+            self.skipped_reloads += 1
+            return
+        self._pending = (path, -1 if loop else 0, fade_ms)
+        self.preload(path)
+        if not self._tracks[path].done():
+            self.late_starts += 1
+        self.update()
+
+    def stop(self, fade_ms=MUSIC_CROSSFADE_MS):
+        """Fade out whatever is playing."""
+        self._pending = None
+        channel_pool.stop('music', fade_ms)
+        # The fading channel holds the Sound until it ends
+        self._tracks.pop(self.current, None)
+        self.current = None
+        self.loop = False
+        self._channel = None
+
+    def active(self):
+        """Whether `update()` has work to do soon (a pending start or a gain ramp)."""
+        return self._pending is not None or self.duck != self._duck_target()
+
+    def _duck_target(self):
+        ducked = any(channel_pool.playing(bus) for bus in MUSIC_DUCK_BUSES)
+        return MUSIC_DUCK_GAIN if ducked else 1.0
+
+    def update(self):
+        """Start a decoded pending track and advance the ducking ramp."""
+        now = time.perf_counter()
+        elapsed_ms = 1000 * (now - self._last_update) if self._last_update else 0
+        self._last_update = now
+
+        if self._pending and self._tracks[self._pending[0]].done():
+            path, loops, fade_ms = self._pending
+            self._pending = None
+            self._start(path, loops, fade_ms)
+
+        target = self._duck_target()
+        if self.duck != target:
+            if target < self.duck:
+                # Duck immediately so the effect isn't masked, recover smoothly
+                self.duck = target
+            else:
+                self.duck = min(target, self.duck + (1.0 - MUSIC_DUCK_GAIN) * elapsed_ms / MUSIC_DUCK_MS)
+            channel_pool.set_gain('music', self.duck)
+            channel_pool.apply()
+
+    def _start(self, path, loops, fade_ms):
+        try:
+            sound = self._tracks[path].result()
+        except Exception as e:
+            logging.error(f"Could not load music {path}: {e}")
+            self._tracks.pop(path, None)
+            return
+        if self._channel is not None and self._channel.get_busy():
+            self._channel.fadeout(fade_ms)
+            self.crossfades += 1
+        self._channel = channel_pool.play(sound, 'music', loops=loops, fade_ms=fade_ms)
+        if self.current not in (None, path):
+            # The faded-out track keeps its Sound until the fade ends; drop our copy
+            self._tracks.pop(self.current, None)
+        self.current = path
+        self.loop = loops != 0
+
+    def stats(self):
+        """Return crossfade, skipped-reload and late-start counters."""
+        return {
+            'current': self.current,
+            'crossfades': self.crossfades,
+            'skipped_reloads': self.skipped_reloads,
+            'late_starts': self.late_starts,
+            'decoded': len(self._tracks),
+            'evicted': self.evicted,
+            'duck': round(self.duck, 2)
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Music engine: {self.stats()}")
+
+    def shutdown(self):
+        """Stop the decode thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Shared instance for the script runner, SceneManager and SoundManager
+music_engine = MusicEngine()
@@ -0,0 +1,16 @@
+from collections import namedtuple
+
+# Opcode records produced by script_compiler. Every field is resolved at
+# compile time so the runner never touches the raw JSON dicts or the
+# CHARACTERS table.
+Background = namedtuple('Background', 'file')
+Character = namedtuple('Character', 'name file size position')
+HideCharacter = namedtuple('HideCharacter', '')
+Dialogue = namedtuple('Dialogue', 'speaker text chapter')
+Sound = namedtuple('Sound', 'file ambient loop')
+Music = namedtuple('Music', 'file loop')
+StopMusic = namedtuple('StopMusic', '')
+Fade = namedtuple('Fade', 'color duration')
+Wait = namedtuple('Wait', 'duration')
+Minigame = namedtuple('Minigame', 'kind')
+Noop = namedtuple('Noop', 'kind')
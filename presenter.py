@@ -0,0 +1,213 @@
+import math
+import time
+import logging
+import pygame
+from constants import PRESENTER_FULL_FLIP_FRACTION, WINDOW_HEIGHT
+
+class Presenter:
+    """Pushes only the changed regions of the game canvas to the display.
+
+    The game draws on a canvas at a fixed internal resolution (see
+    `open_canvas`), which is scaled to the display exactly once per
+    `present()`. If the display is the same size the canvas *is* the
+    display; otherwise only the dirty rects are scaled (nearest-neighbour
+    at an exact integer ratio, smooth-scaled otherwise) and pushed.
+
+    Drawing code marks what it touched with `mark(rect)` (or `mark_all()`
+    for full-screen changes) and the loop calls `present()` once per frame.
+    Anything that moved must mark both its old and new area so the old
+    spot is cleared on the display too.
+    """
+
+    def __init__(self, full_threshold=PRESENTER_FULL_FLIP_FRACTION):
+        self.full_threshold = full_threshold
+        self._dirty = []
+        self._full = False
+        self.canvas = None
+        self._display_size = None
+        self._dest = None
+        self._factor = 1
+        self.scale_path = None
+
+        # Counters
+        self.frames = 0
+        self.full_frames = 0
+        self.last_pixels = 0
+        self.total_pixels = 0
+        self.scale_seconds = 0.0
+
+    def open_canvas(self, render_size):
+        """Create the canvas the game draws on and return it."""
+        display = pygame.display.get_surface()
+        if tuple(render_size) == display.get_size():
+            self.canvas = display
+        else:
+            self.canvas = pygame.Surface(render_size).convert()
+        self._layout(display)
+        return self.canvas
+
+    def _layout(self, display):
+        """Fit the canvas into the display, centred with black bars."""
+        dw, dh = self._display_size = display.get_size()
+        cw, ch = self.canvas.get_size()
+        scale = min(dw / cw, dh / ch)
+        if self.canvas is display:
+            self.scale_path = "none"
+        elif scale >= 1 and scale == int(scale):
+            self.scale_path = "integer"
+        else:
+            self.scale_path = "smooth"
+        self._factor = scale
+        self._dest = pygame.Rect(0, 0, int(cw * scale), int(ch * scale))
+        self._dest.center = (dw // 2, dh // 2)
+        self._full = True
+
+    def asset_size(self, size):
+        """Scale a size authored for the WINDOW_HEIGHT canvas to the current one (low-end mode)."""
+        if size is None or self.canvas is None or self.canvas.get_height() == WINDOW_HEIGHT:
+            return size
+        ratio = self.canvas.get_height() / WINDOW_HEIGHT
+        return (round(size[0] * ratio), round(size[1] * ratio))
+
+    def to_canvas(self, pos):
+        """Convert a display position to canvas coordinates."""
+        if self.canvas is None or self.scale_path == "none":
+            return pos
+        return (int((pos[0] - self._dest.x) / self._factor),
+                int((pos[1] - self._dest.y) / self._factor))
+
+    def _to_display(self, rect):
+        f = self._factor
+        x0 = math.floor(rect.x * f)
+        y0 = math.floor(rect.y * f)
+        x1 = math.ceil(rect.right * f)
+        y1 = math.ceil(rect.bottom * f)
+        # Rounding outward can pass the letterboxed area (and the display) by a pixel
+        return pygame.Rect(self._dest.x + x0, self._dest.y + y0, x1 - x0, y1 - y0).clip(self._dest)
+
+    def _scale(self, source, dest):
+        if self.scale_path == "integer":
+            pygame.transform.scale(source, dest.get_size(), dest)
+            return
+        try:
+            pygame.transform.smoothscale(source, dest.get_size(), dest)
+        except ValueError:
+            # smoothscale needs 24/32-bit surfaces
+            pygame.transform.scale(source, dest.get_size(), dest)
+
+    def mark(self, rect):
+        """Mark a region of the canvas as changed."""
+        if rect:
+            self._dirty.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        """Mark the whole canvas as changed."""
+        self._full = True
+
+    def present(self):
+        """Scale the canvas to the display and push the marked regions, flipping if most of it changed."""
+        display = pygame.display.get_surface()
+        if display is None:
+            return
+        if self.canvas is None:
+            self.canvas = display
+            self._layout(display)
+        elif display.get_size() != self._display_size:
+            # The mode changed under us (e.g. a minigame run standalone)
+            if self.canvas is not display and self.canvas.get_size() == display.get_size():
+                self.canvas = display
+            self._layout(display)
+
+        bounds = self.canvas.get_rect()
+        canvas_area = bounds.width * bounds.height
+        rects = _merge([r.clip(bounds) for r in self._dirty])
+        area = sum(r.width * r.height for r in rects)
+        full = self._full or area > self.full_threshold * canvas_area
+
+        start = time.perf_counter()
+        if self.scale_path != "none":
+            if full:
+                display.fill((0, 0, 0))  # Clear the bars in case something else drew there
+                self._scale(self.canvas, display.subsurface(self._dest))
+                rects = [self._dest]
+            else:
+                if self.scale_path == "smooth":
+                    # Filtering reads neighbouring pixels: take a 1px margin so region edges match
+                    rects = [r.inflate(2, 2).clip(bounds) for r in rects]
+                scaled = []
+                for rect in rects:
+                    dest = self._to_display(rect)
+                    if dest.width and dest.height:
+                        self._scale(self.canvas.subsurface(rect), display.subsurface(dest))
+                        scaled.append(dest)
+                rects = scaled
+        self.scale_seconds += time.perf_counter() - start
+
+        if full:
+            pygame.display.flip()
+            pushed = display.get_width() * display.get_height()
+            self.full_frames += 1
+        else:
+            if rects:
+                pygame.display.update(rects)
+            pushed = sum(r.width * r.height for r in rects)
+
+        self.frames += 1
+        self.last_pixels = pushed
+        self.total_pixels += pushed
+        self._dirty = []
+        self._full = False
+
+    def stats(self):
+        """Return frame, pixel and scaling counters."""
+        return {
+            'frames': self.frames,
+            'full_frames': self.full_frames,
+            'last_pixels': self.last_pixels,
+            'avg_pixels_per_frame': self.total_pixels // self.frames if self.frames else 0,
+            'canvas': self.canvas.get_size() if self.canvas else None,
+            'scale_path': self.scale_path,
+            'avg_scale_ms': round(self.scale_seconds * 1000 / self.frames, 3) if self.frames else 0.0
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Presenter: {self.stats()}")
+
+
+def _merge(rects):
+    """Union overlapping rects so shared pixels are pushed (and counted) once."""
+    merged = []
+    for rect in rects:
+        if not (rect.width and rect.height):
+            continue
+        hit = rect.collidelist(merged)
+        while hit != -1:
+            rect = rect.union(merged.pop(hit))
+            hit = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+# Shared instance for the script runner, menus and VisualNovel
+presenter = Presenter()
+
+
+if __name__ == "__main__":
+    # Present full and partial frames of the 1280x720 canvas on displays it
+    # doesn't divide evenly; any rect outside the display raises here
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    for size in ((1366, 768), (1600, 900), (1280, 800), (1920, 1200), (1024, 768), (2560, 1440)):
+        pygame.display.set_mode(size)
+        check = Presenter()
+        canvas = check.open_canvas((1280, 720))
+        check.mark_all()
+        check.present()
+        for rect in ((0, 0, 1, 1), (1279, 719, 1, 1), (0, 540, 1280, 180), (1000, 0, 280, 720), (637, 311, 7, 13)):
+            canvas.fill((255, 255, 255), rect)
+            check.mark(rect)
+            check.present()
+        print(f"{size[0]}x{size[1]}: {check.scale_path}, dest {tuple(check._dest)}, ok")
+    pygame.quit()
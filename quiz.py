@@ -1,6 +1,7 @@
 import pygame
-import sys
 import os
+from surface_cache import load_image
+from minigame_host import minigame_host, QUIT_GAME
 BASE_DIR = os.path.dirname(__file__)                         # …\VisualNovel
 CHAR_DIR = os.path.join(BASE_DIR, 'images', 'characters')
 def run_quiz():
@@ -24,24 +25,21 @@ def run_quiz():
     }
 
     # Display and caption
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = minigame_host.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Car Parts Education Quiz with Nebula")
-    clock = pygame.time.Clock()
+    clock = minigame_host.clock
 
     # Load Nebula images
     try:
         nebula_images = {
-            "neutral":      pygame.image.load(os.path.join(CHAR_DIR, "nebulaNeutral.png")).convert_alpha(),
-            "angry":        pygame.image.load(os.path.join(CHAR_DIR, "nebulaAngry.png")).convert_alpha(),
-            "confirm":      pygame.image.load(os.path.join(CHAR_DIR, "nebulaConfirm.png")).convert_alpha(),
-            "notification": pygame.image.load(os.path.join(CHAR_DIR, "nebulaNotification.png")).convert_alpha()
+            "neutral":      load_image(os.path.join(CHAR_DIR, "nebulaNeutral.png"), (250, 250), "alpha"),
+            "angry":        load_image(os.path.join(CHAR_DIR, "nebulaAngry.png"), (250, 250), "alpha"),
+            "confirm":      load_image(os.path.join(CHAR_DIR, "nebulaConfirm.png"), (250, 250), "alpha"),
+            "notification": load_image(os.path.join(CHAR_DIR, "nebulaNotification.png"), (250, 250), "alpha")
         }
-        for key in nebula_images:
-            nebula_images[key] = pygame.transform.scale(nebula_images[key], (250, 250))
     except Exception as e:
         print(f"Error loading Nebula images from {CHAR_DIR}: {e}")
-        pygame.quit()
-        sys.exit()
+        return "error"
 
     # Fonts
     font_large = pygame.font.Font(None, 42)
@@ -163,13 +161,12 @@ def run_quiz():
 
     update_question()
 
-    # Main loop
-    running = True
-    while running:
-        mouse_pos = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+    # Main loop; the quiz runs until the window is closed
+    while True:
+        mouse_pos = minigame_host.mouse_pos()
+        for event in minigame_host.get_events():
             if event.type == pygame.QUIT:
-                running = False
+                return QUIT_GAME
 
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if current_state == STATES["QUIZ"]:
@@ -197,12 +194,10 @@ def run_quiz():
         if current_state == STATES["DIALOGUE"]:
             current_dialogue.draw(screen)
 
-        pygame.display.flip()
+        minigame_host.flip()
         clock.tick(FPS)
 
-    pygame.quit()
-    sys.exit()
-
 # Only run if executed directly
 if __name__ == "__main__":
     run_quiz()
+    pygame.quit()
@@ -1,4 +1,5 @@
 import pygame
+from font_registry import get_font
 
 def draw_background(screen, background, width, height):
     """Draw the background image scaled to fit the screen."""
@@ -13,11 +14,11 @@ def draw_text_box(screen, text_box_height, text_box_padding, text, speaker, widt
     screen.blit(text_box_surface, (0, height - text_box_height))
 
     if text:
-        font = pygame.font.SysFont('Arial', 28)
+        font = get_font('Arial', 28)
         text_surface = font.render(text, True, (0, 0, 0))
         screen.blit(text_surface, (text_box_padding, height - text_box_height + text_box_padding))
 
     if speaker:
-        name_font = pygame.font.SysFont('Arial', 32, bold=True)
+        name_font = get_font('Arial', 32, bold=True)
         name_surface = name_font.render(speaker, True, (0, 0, 0))
         screen.blit(name_surface, (text_box_padding, height - text_box_height - 40))
\ No newline at end of file
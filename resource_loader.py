@@ -1,5 +1,7 @@
 import pygame
 import os
+from surface_cache import load_image
+from font_registry import get_font
 
 class ResourceLoader:
     @staticmethod
@@ -22,18 +24,15 @@ class ResourceLoader:
                 pygame.draw.line(surface, (0, 0, 0), (0, surface.get_height()), (surface.get_width(), 0), 2)
                 
                 # Draw text "Missing" on the placeholder
-                font = pygame.font.Font(None, 24)
+                font = get_font(None, 24)
                 text = font.render("Missing", True, (0, 0, 0))
                 text_rect = text.get_rect(center=(surface.get_width()//2, surface.get_height()//2))
                 surface.blit(text, text_rect)
                 
                 return surface
                 
-            image = pygame.image.load(path)
+            image = load_image(path, size)
             print(f"Image loaded successfully: {path}")
-            
-            if size:
-                image = pygame.transform.scale(image, size)
             return image
         except pygame.error as e:
             print(f"Error loading image {path}: {e}")
@@ -41,7 +40,7 @@ class ResourceLoader:
             surface.fill((255, 0, 255))
             
             # Draw text with error message
-            font = pygame.font.Font(None, 24)
+            font = get_font(None, 24)
             text = font.render("Error", True, (0, 0, 0))
             text_rect = text.get_rect(center=(surface.get_width()//2, surface.get_height()//2))
             surface.blit(text, text_rect)
@@ -0,0 +1,160 @@
+import logging
+from constants import REWIND_STEPS, REWIND_BUDGET
+from surface_cache import SurfaceCache
+
+class RewindStep:
+    """The state shown at one dialogue line, as references rather than copies.
+
+    Surfaces are the ones the surface cache handed out, so stepping back
+    never loads or scales anything. Fields that didn't change since the
+    previous step point at the same objects, which keeps a step at a few
+    hundred bytes.
+    """
+
+    __slots__ = ('index', 'background', 'background_file', 'character', 'character_pos',
+                 'ambient', 'music', 'music_loop', 'history_len', 'minigames')
+
+    def __init__(self, index, background, background_file, character, character_pos,
+                 ambient, music, music_loop, history_len, minigames):
+        self.index = index
+        self.background = background
+        self.background_file = background_file
+        self.character = character
+        self.character_pos = character_pos
+        self.ambient = ambient
+        self.music = music
+        self.music_loop = music_loop
+        self.history_len = history_len
+        self.minigames = minigames
+
+    def surfaces(self):
+        return [s for s in (self.background, self.character) if s is not None]
+
+
+class RewindBuffer:
+    """Fixed-size ring buffer of the last dialogue steps, newest last.
+
+    `push()` is called at every dialogue line. The oldest steps are dropped
+    once there are `max_steps`, or once the distinct surfaces the buffer
+    keeps alive exceed `budget_bytes` (a surface shared by many steps is
+    counted once). `step(back)` is a constant-time lookup, so scrolling
+    back any number of lines costs the same; `truncate(back)` forgets
+    everything newer when the player continues from an earlier line.
+    """
+
+    def __init__(self, max_steps=REWIND_STEPS, budget_bytes=REWIND_BUDGET):
+        self.max_steps = max(1, max_steps)
+        self.budget_bytes = budget_bytes
+        self._ring = [None] * self.max_steps
+        self._head = 0      # slot of the oldest step
+        self.count = 0
+        self._pinned = {}   # id(surface) -> [surface, references, bytes]
+        self.pinned_bytes = 0
+
+        # Counters
+        self.pushed = 0
+        self.evicted = 0
+        self.rewinds = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, step):
+        """Add the newest step, sharing unchanged minigame results with the previous one."""
+        if self.count:
+            last = self.step(0)
+            if last.minigames == step.minigames:
+                step.minigames = last.minigames
+        if self.count == self.max_steps:
+            self._drop_oldest()
+        self._ring[(self._head + self.count) % self.max_steps] = step
+        self.count += 1
+        for surface in step.surfaces():
+            self._pin(surface)
+        while self.pinned_bytes > self.budget_bytes and self.count > 1:
+            self._drop_oldest()
+        self.pushed += 1
+
+    def step(self, back):
+        """Return the step `back` lines before the newest (0 is the newest)."""
+        if not 0 <= back < self.count:
+            raise IndexError(back)
+        return self._ring[(self._head + self.count - 1 - back) % self.max_steps]
+
+    def truncate(self, back):
+        """Drop the newest `back` steps, e.g. to continue from step(back)."""
+        for _ in range(min(back, self.count)):
+            slot = (self._head + self.count - 1) % self.max_steps
+            self._release(self._ring[slot])
+            self._ring[slot] = None
+            self.count -= 1
+        self.rewinds += 1
+
+    def clear(self):
+        """Forget every step (a save was loaded)."""
+        self._ring = [None] * self.max_steps
+        self._head = 0
+        self.count = 0
+        self._pinned.clear()
+        self.pinned_bytes = 0
+
+    def _drop_oldest(self):
+        self._release(self._ring[self._head])
+        self._ring[self._head] = None
+        self._head = (self._head + 1) % self.max_steps
+        self.count -= 1
+        self.evicted += 1
+
+    def _pin(self, surface):
+        entry = self._pinned.get(id(surface))
+        if entry is None:
+            size = SurfaceCache.surface_bytes(surface)
+            self._pinned[id(surface)] = [surface, 1, size]
+            self.pinned_bytes += size
+        else:
+            entry[1] += 1
+
+    def _release(self, step):
+        for surface in step.surfaces():
+            entry = self._pinned[id(surface)]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._pinned[id(surface)]
+                self.pinned_bytes -= entry[2]
+
+    def stats(self):
+        """Return buffer occupancy and counters."""
+        return {
+            'steps': self.count,
+            'pinned_surfaces': len(self._pinned),
+            'pinned_mb': round(self.pinned_bytes / (1024 * 1024), 1),
+            'pushed': self.pushed,
+            'evicted': self.evicted,
+            'rewinds': self.rewinds
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Rewind buffer: {self.stats()}")
+
+
+if __name__ == "__main__":
+    # Time a 100-line rewind on a full buffer, surfaces shared the way a script shares them
+    import time
+    import pygame
+    backgrounds = [pygame.Surface((1280, 720)) for _ in range(10)]
+    characters = [pygame.Surface((400, 600), pygame.SRCALPHA) for _ in range(20)]
+    buffer = RewindBuffer()
+    for i in range(5000):
+        buffer.push(RewindStep(i, backgrounds[i // 60 % 10], f"bg_{i // 60 % 10}.png", characters[i // 7 % 20],
+                               "left", None, "sounds/music/intrigue.mp3", True, i, {'quiz': 3}))
+    print(f"after 5000 pushes: {buffer.stats()}")
+
+    start = time.perf_counter()
+    for back in range(100):
+        buffer.step(back)
+    lookup_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    buffer.truncate(100)
+    truncate_ms = (time.perf_counter() - start) * 1000
+    print(f"step back 100 lines: {lookup_ms:.3f} ms, continue from there: {truncate_ms:.3f} ms")
@@ -0,0 +1,251 @@
+import os
+from collections import OrderedDict
+import pygame
+from constants import WHITE, BLACK, GRAY, THUMBNAIL_SIZE
+from event_loop import wait_events
+from presenter import presenter
+from font_registry import get_font
+from thumbnails import thumbnail_store, THUMBNAIL_READY
+
+# Order of the Tab key's sort modes
+SORTS = ('newest', 'oldest', 'chapter')
+
+# The row that creates a slot when the browser is opened for saving
+NEW_SAVE = {'slot': None, 'label': "New save", 'timestamp': None, 'chapter': None, 'exists': False}
+
+class SaveBrowser:
+    """Scrollable list of every save slot, for loading or picking where to save.
+
+    Only the rows on screen are drawn, from label surfaces cached per slot,
+    and only their thumbnails are requested, so drawing and scrolling cost
+    the same with ten slots or a thousand; sorting and filtering run over
+    the slot list once per key press. Up/Down, PageUp/PageDown, Home/End
+    and the wheel move through the list, Enter picks the selected slot,
+    Delete (or right-click) deletes it, Tab changes the sort (newest,
+    oldest, chapter, i.e. script position), typing filters by label, timestamp or chapter, and
+    Escape clears the filter or closes the browser.
+    """
+
+    def __init__(self, screen, save_system, mode="load"):
+        self.screen = screen
+        self.save_system = save_system
+        self.mode = mode
+        width, height = screen.get_size()
+        self.font = get_font(None, 32)
+        self.small_font = get_font(None, 24)
+        self.row_height = THUMBNAIL_SIZE[1] + 10
+        self.top = 90
+        self.visible = max(1, (height - self.top - 70) // self.row_height)
+        self.row_width = min(width - 40, 760)
+        self.x = (width - self.row_width) // 2
+        self.footer_y = self.top + self.visible * self.row_height + 10
+
+        # The frame behind the menu, dimmed once instead of on every redraw
+        self.background = screen.copy()
+        overlay = pygame.Surface(self.background.get_size())
+        overlay.set_alpha(150)
+        overlay.fill(BLACK)
+        self.background.blit(overlay, (0, 0))
+
+        self.sort = SORTS[0]
+        self.query = ""
+        self.first = 0
+        self.selected = 0
+        self._labels = OrderedDict()  # (slot, timestamp, chapter) -> rendered row text
+        self._load()
+
+    def _load(self):
+        """Read the slot list from the save index and rebuild the view."""
+        self.entries = self.save_system.get_save_info()
+        self._refilter()
+
+    def _refilter(self):
+        query = self.query.lower()
+        if query:
+            for entry in self.entries:
+                if 'search' not in entry:
+                    entry['search'] = " ".join(str(entry.get(k) or "") for k in ('label', 'timestamp', 'chapter')).lower()
+        view = [e for e in self.entries if query in e['search']] if query else list(self.entries)
+        view.sort(key=lambda e: e['timestamp'] or "", reverse=self.sort != 'oldest')
+        if self.sort == 'chapter':
+            # By position in the script, so "Chapter 10" comes after "Chapter 2"; stable, newest first at a line
+            view.sort(key=lambda e: (e.get('index') is None, e.get('index') or 0))
+        self.view = [NEW_SAVE] + view if self.mode == "save" else view
+        self._select(self.selected)
+
+    def _select(self, index):
+        """Move the selection, scrolling just enough to keep it on screen."""
+        self.selected = max(0, min(len(self.view) - 1, index))
+        if self.selected < self.first:
+            self.first = self.selected
+        elif self.selected >= self.first + self.visible:
+            self.first = self.selected - self.visible + 1
+        self._scroll(0)
+
+    def _scroll(self, rows):
+        self.first = max(0, min(len(self.view) - self.visible, self.first + rows))
+
+    def _rows(self):
+        """Return (view index, entry, rect) for the rows on screen."""
+        return [(i, self.view[i], pygame.Rect(self.x, self.top + (i - self.first) * self.row_height,
+                                               self.row_width, THUMBNAIL_SIZE[1]))
+                for i in range(self.first, min(len(self.view), self.first + self.visible))]
+
+    def _label(self, entry):
+        key = (entry['slot'], entry['timestamp'], entry.get('chapter'))
+        label = self._labels.get(key)
+        if label is None:
+            title = self.font.render(f"{entry['label']}: {entry['timestamp']}" if entry['exists'] else entry['label'],
+                                     True, WHITE)
+            chapter = self.small_font.render(entry.get('chapter') or "", True, GRAY)
+            label = pygame.Surface((max(title.get_width(), chapter.get_width()),
+                                    title.get_height() + 4 + chapter.get_height()), pygame.SRCALPHA)
+            label.blit(title, (0, 0))
+            label.blit(chapter, (0, title.get_height() + 4))
+            self._labels[key] = label
+            # A few pages' worth, however many slots there are
+            while len(self._labels) > 4 * self.visible:
+                self._labels.popitem(last=False)
+        else:
+            self._labels.move_to_end(key)
+        return label
+
+    def draw(self):
+        """Draw the header, the visible rows and the footer."""
+        screen = self.screen
+        screen.blit(self.background, (0, 0))
+        title = "Save to..." if self.mode == "save" else "Load"
+        if self.query:
+            title += f"  filter: {self.query}"
+        header = self.font.render(title, True, WHITE)
+        screen.blit(header, (self.x, self.top - header.get_height() - 20))
+
+        for i, entry, rect in self._rows():
+            thumb = None
+            if entry['exists'] and entry.get('thumbnail'):
+                thumb = thumbnail_store.get(os.path.join(self.save_system.save_folder, entry['thumbnail']))
+            if thumb:
+                screen.blit(thumb, rect.topleft)
+            else:
+                pygame.draw.rect(screen, GRAY, (rect.topleft, THUMBNAIL_SIZE), 1)
+            label = self._label(entry)
+            screen.blit(label, label.get_rect(midleft=(rect.x + THUMBNAIL_SIZE[0] + 20, rect.centery)))
+            if i == self.selected:
+                pygame.draw.rect(screen, WHITE, rect.inflate(8, 8), 2)
+
+        pages = max(1, -(-len(self.view) // self.visible))
+        page = min(pages, self.first // self.visible + 1)
+        action = "save" if self.mode == "save" else "load"
+        footer = self.small_font.render(
+            f"Page {page}/{pages}, {len(self.view) - (self.mode == 'save')} saves, sorted by {self.sort}   "
+            f"Enter: {action}   Tab: sort   type to filter   Del / right-click: delete   Esc: close", True, WHITE)
+        screen.blit(footer, footer.get_rect(midtop=(screen.get_width() // 2, self.footer_y)))
+        presenter.mark_all()
+        presenter.present()
+
+    def _pick(self, entry):
+        """Return the slot to load or save into, or None if the row can't be picked."""
+        if entry is NEW_SAVE:
+            return self.save_system.next_slot()
+        return entry['slot'] if entry['exists'] else None
+
+    def _delete(self, entry):
+        if entry['exists']:
+            self.save_system.delete_save(entry['slot'])
+            self._load()
+
+    def run(self):
+        """Show the browser until a slot is picked (returned) or it is closed (None).
+
+        Closing the window closes the browser and leaves the QUIT event queued
+        for the caller, so the game quits through its own save-and-exit path.
+        """
+        redraw = True
+        while True:
+            if redraw:
+                self.draw()
+                redraw = False
+            for event in wait_events():
+                if event.type == pygame.QUIT:
+                    # Close; the screen that opened the browser quits the usual way
+                    pygame.event.post(event)
+                    return None
+                elif event.type == THUMBNAIL_READY:
+                    redraw = True
+                elif event.type == pygame.MOUSEWHEEL:
+                    self._scroll(-event.y)
+                    redraw = True
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                    for i, entry, rect in self._rows():
+                        if rect.collidepoint(event.pos):
+                            self.selected = i
+                            if event.button == 3:
+                                self._delete(entry)
+                            else:
+                                slot = self._pick(entry)
+                                if slot is not None:
+                                    return slot
+                            redraw = True
+                            break
+                elif event.type == pygame.KEYDOWN:
+                    redraw = True
+                    steps = {pygame.K_UP: -1, pygame.K_DOWN: 1, pygame.K_PAGEUP: -self.visible,
+                             pygame.K_PAGEDOWN: self.visible, pygame.K_HOME: -len(self.view),
+                             pygame.K_END: len(self.view)}
+                    if event.key in steps:
+                        self._select(self.selected + steps[event.key])
+                    elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER) and self.view:
+                        slot = self._pick(self.view[self.selected])
+                        if slot is not None:
+                            return slot
+                    elif event.key == pygame.K_DELETE and self.view:
+                        self._delete(self.view[self.selected])
+                    elif event.key == pygame.K_TAB:
+                        self.sort = SORTS[(SORTS.index(self.sort) + 1) % len(SORTS)]
+                        self._refilter()
+                    elif event.key == pygame.K_ESCAPE:
+                        if not self.query:
+                            return None
+                        self.query = ""
+                        self._refilter()
+                    elif event.key == pygame.K_BACKSPACE:
+                        self.query = self.query[:-1]
+                        self._refilter()
+                    elif event.unicode and event.unicode.isprintable():
+                        self.query += event.unicode
+                        self._refilter()
+
+if __name__ == "__main__":
+    # Time opening and paging the browser with 10, 100 and 1000 slots in a scratch folder
+    import time
+    import tempfile
+    from snapshot import Snapshot
+    from save_system import SaveSystem
+
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    os.chdir(tempfile.mkdtemp())
+    save_system = SaveSystem()
+    created = 0
+    for count in (10, 100, 1000):
+        while created < count:
+            created += 1
+            save_system.save_game(Snapshot(index=created, chapter=f"Chapter {created % 7}"), created)
+        save_system.flush()
+        save_system.get_save_info()  # The index is read once per session
+
+        start = time.perf_counter()
+        browser = SaveBrowser(screen, save_system)
+        browser.draw()
+        open_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for _ in range(20):
+            browser._select(browser.selected + browser.visible)
+            browser.draw()
+        page_ms = (time.perf_counter() - start) * 1000 / 20
+        start = time.perf_counter()
+        browser.query = "chapter 3"
+        browser._refilter()
+        filter_ms = (time.perf_counter() - start) * 1000
+        print(f"{count:5d} slots: open {open_ms:6.2f} ms, page down {page_ms:5.2f} ms, filter {filter_ms:5.2f} ms")
+    pygame.quit()
@@ -0,0 +1,127 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+
+INDEX_VERSION = 1
+# Numbered slots (snapshots, or JSON saves from before snapshots), and the
+# quick-save and autosave slots, which are named by their file
+SAVE_NAME = re.compile(r"(?:save_(\d+)|(quicksave|autosave_\d+))\.(sav|json)$")
+
+def slot_key(name):
+    """Index keys are strings in JSON: numbered slots are ints, the others their names."""
+    return int(name) if name.isdigit() else name
+
+def slot_meta(state, raw):
+    """Build the index entry for a save from its Snapshot and serialized bytes."""
+    return {
+        'timestamp': state.timestamp,
+        'index': state.index,
+        'chapter': state.chapter,
+        'thumbnail': state.thumbnail,
+        'size': len(raw),
+        'checksum': hashlib.sha1(raw).hexdigest(),
+        'mtime': None
+    }
+
+class SaveIndex:
+    """Slot metadata for the save folder, kept in one small `index.json`.
+
+    The menu lists slots from the index instead of opening every save. It
+    is updated on each save and delete; when it is first read, each entry's
+    mtime and size are checked against a directory scan and only missing or
+    changed slots are parsed again (`read_save` is given by SaveSystem).
+    """
+
+    def __init__(self, folder, read_save):
+        self.path = os.path.join(folder, "index.json")
+        self.folder = folder
+        self.read_save = read_save
+        self._slots = None
+        self._lock = threading.Lock()
+        self.rebuilt_slots = 0
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                return {slot_key(k): v for k, v in index['slots'].items()}
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
+
+    def slots(self):
+        """Return {slot: metadata} for every save on disk."""
+        with self._lock:
+            if self._slots is None:
+                self._slots = self._refresh(self._load())
+            return dict(self._slots)
+
+    def _refresh(self, slots):
+        """Drop entries whose file is gone and re-read the ones that are new or changed."""
+        on_disk = {}
+        if os.path.isdir(self.folder):
+            for entry in os.scandir(self.folder):
+                match = SAVE_NAME.match(entry.name)
+                if match:
+                    slot = slot_key(match.group(1) or match.group(2))
+                    if match.group(3) == "json" and slot in on_disk:
+                        continue
+                    st = entry.stat()
+                    on_disk[slot] = (entry.path, st.st_mtime_ns, st.st_size)
+
+        fresh = {}
+        changed = set(slots) - set(on_disk)
+        for slot, (path, mtime, size) in on_disk.items():
+            meta = slots.get(slot)
+            if meta and (meta.get('mtime'), meta.get('size')) == (mtime, size):
+                fresh[slot] = meta
+                continue
+            changed.add(slot)
+            data = self.read_save(path)
+            if data is None:
+                continue
+            with open(path, "rb") as f:
+                meta = slot_meta(data, f.read())
+            meta['mtime'] = mtime
+            fresh[slot] = meta
+            self.rebuilt_slots += 1
+        if changed or not os.path.exists(self.path):
+            self._slots = fresh
+            self.save()
+        return fresh
+
+    def update(self, slot, meta, filepath):
+        """Record a save that just reached the disk."""
+        try:
+            meta = dict(meta, mtime=os.stat(filepath).st_mtime_ns)
+        except OSError:
+            return
+        with self._lock:
+            if self._slots is None:
+                self._slots = self._load()
+            self._slots[slot] = meta
+            self.save()
+
+    def remove(self, slot):
+        """Forget a deleted slot."""
+        with self._lock:
+            if self._slots is None:
+                self._slots = self._load()
+            if self._slots.pop(slot, None) is not None:
+                self.save()
+
+    def save(self):
+        """Write the index (callers hold the lock)."""
+        index = {'version': INDEX_VERSION, 'slots': {str(k): v for k, v in sorted(self._slots.items(), key=lambda item: str(item[0]))}}
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Could not write save index {self.path}: {e}")
@@ -1,13 +1,25 @@
-import json
 import os
 from datetime import datetime
+import logging
 import pygame
+from save_writer import save_writer, backup_path
+from save_index import SaveIndex, slot_meta
+from thumbnails import thumbnail_store
+import snapshot
+
+def slot_label(slot):
+    """Return how the load menu names a slot."""
+    if slot == "quicksave":
+        return "Quick save"
+    if isinstance(slot, str) and slot.startswith("autosave_"):
+        return f"Autosave {slot[len('autosave_'):]}"
+    return f"Slot {slot}"
 
 class SaveSystem:
     def __init__(self):
         self.save_folder = "saves"
-        self.max_saves = 3
         self.ensure_save_folder_exists()
+        self.index = SaveIndex(self.save_folder, self._read)
         self.save_button_rect = None
         self.load_button_rect = None
         self.font = pygame.font.Font(None, 24)
@@ -24,65 +36,127 @@ class SaveSystem:
         self.save_button_rect = pygame.Rect(screen_width - 160, 20, 60, 40)
         self.load_button_rect = pygame.Rect(screen_width - 230, 20, 60, 40)
 
-    def save_game(self, game_state, slot_number):
-        """Save game to a specific slot."""
-        filename = f"save_{slot_number}.json"
-        filepath = os.path.join(self.save_folder, filename)
-        
-        # Add timestamp to save data
-        game_state['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        with open(filepath, "w") as f:
-            json.dump(game_state, f)
-            print("Game progress saved.")
-        return filename
+    def slot_path(self, slot):
+        """Return the snapshot file of a slot (a number, or a name such as "quicksave")."""
+        name = f"save_{slot}" if isinstance(slot, int) else slot
+        return os.path.join(self.save_folder, f"{name}.sav")
+
+    def thumbnail_path(self, slot):
+        """Return the thumbnail image kept next to a slot."""
+        return os.path.splitext(self.slot_path(slot))[0] + ".png"
+
+    def legacy_path(self, slot):
+        """Return the JSON save a slot had before snapshots."""
+        return os.path.join(self.save_folder, f"save_{slot}.json")
+
+    def save_game(self, state, slot_number, frame=None):
+        """Save a Snapshot to a specific slot, with a thumbnail of `frame` if given."""
+        filepath = self.slot_path(slot_number)
+
+        self.stamp(state)
+        if frame is not None:
+            self.capture_thumbnail(state, slot_number, frame)
+
+        # Serialize now (the state may change next frame), write in the background
+        self.write_slot(slot_number, state, snapshot.encode(state))
+        print("Game progress saving.")
+        return os.path.basename(filepath)
+
+    def stamp(self, state):
+        """Set the save time on a Snapshot."""
+        state.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def capture_thumbnail(self, state, slot, frame):
+        """Record the slot's thumbnail in `state` and have it written in the background."""
+        path = self.thumbnail_path(slot)
+        state.thumbnail = os.path.basename(path)
+        thumbnail_store.capture(frame, path)
+
+    def write_slot(self, slot, state, data):
+        """Queue already-encoded `data` for `state` into a slot and index it once written."""
+        filepath = self.slot_path(slot)
+        meta = slot_meta(state, data)
+        save_writer.write(filepath, data, lambda: self.index.update(slot, meta, filepath))
+
+    def flush(self, timeout=5.0):
+        """Wait for queued saves to reach the disk."""
+        return save_writer.flush(timeout)
+
+    def _read(self, filepath):
+        """Return the Snapshot in `filepath`, falling back to its backup if it is missing or damaged."""
+        for path in (filepath, backup_path(filepath)):
+            try:
+                with open(path, "rb") as f:
+                    state = self._decode(f.read())
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                logging.warning(f"Save file {path} is damaged: {e}")
+                continue
+            if path != filepath:
+                logging.warning(f"Using the backup of {filepath}")
+            return state
+        return None
+
+    def _decode(self, data):
+        """Decode a full snapshot, or an autosave delta against the autosave base or its backup."""
+        if not snapshot.is_delta(data):
+            return snapshot.decode(data)
+        bases = []
+        base = self.slot_path("autosave_base")
+        for path in (base, backup_path(base)):
+            try:
+                with open(path, "rb") as f:
+                    bases.append(f.read())
+            except OSError:
+                pass
+        return snapshot.decode_delta(data, bases)
+
     def delete_save(self, slot):
         """Delete a save file."""
-        filename = f"save_{slot}.json"
-        filepath = os.path.join(self.save_folder, filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
+        self.flush()
+        paths = [p for f in (self.slot_path(slot), self.legacy_path(slot)) for p in (f, backup_path(f))]
+        if any(os.path.exists(p) for p in paths):
+            thumbnail = self.thumbnail_path(slot)
+            thumbnail_store.forget(thumbnail)
+            for path in paths + [thumbnail]:
+                if os.path.exists(path):
+                    os.remove(path)
+            self.index.remove(slot)
             print(f"Save slot {slot} deleted.")
         else:
             print(f"Save slot {slot} does not exist.")
 
     def load_game(self, slot):
-        """Load the saved game progress."""
-        filename = f"save_{slot}.json"  # Corrected filename format
-        filepath = os.path.join(self.save_folder, filename)
-        try:
-            with open(filepath, "r") as save_file:
-                save_data = json.load(save_file)
-                if "current_command_index" in save_data:
-                    print("Game progress loaded.")
-                    return save_data
-                else:
-                    print("Invalid save data format.")
-                    return None
-        except FileNotFoundError:
+        """Load the saved game progress as a Snapshot."""
+        self.flush()
+        save_data = self._read(self.slot_path(slot))
+        if save_data is None:
+            # Slots saved before snapshots are migrated on load
+            save_data = self._read(self.legacy_path(slot))
+        if save_data is None:
             print("No saved game found.")
             return None
+        print("Game progress loaded.")
+        return save_data
+
+    def next_slot(self):
+        """Return the number after the highest numbered slot in use; slots are unlimited."""
+        return max((slot for slot in self.index.slots() if isinstance(slot, int)), default=0) + 1
 
     def get_save_info(self):
-        """Get information about all save slots."""
-        save_info = []
-        for slot in range(1, self.max_saves + 1):
-            filepath = os.path.join(self.save_folder, f"save_{slot}.json")
-            if os.path.exists(filepath):
-                with open(filepath, "r") as f:
-                    data = json.load(f)
-                    save_info.append({
-                        'slot': slot,
-                        'timestamp': data.get('timestamp', 'Unknown'),
-                        'exists': True
-                    })
-            else:
-                save_info.append({
-                    'slot': slot,
-                    'timestamp': None,
-                    'exists': False
-                })
-        return save_info
+        """Get information about every saved slot, numbered, quick-save and autosaves."""
+        self.flush()
+        # One index read instead of parsing every save file
+        return [{
+            'slot': slot,
+            'label': slot_label(slot),
+            'timestamp': meta.get('timestamp') or 'Unknown',
+            'index': meta.get('index'),
+            'chapter': meta.get('chapter'),
+            'thumbnail': meta.get('thumbnail'),
+            'exists': True
+        } for slot, meta in self.index.slots().items()]
 
     def draw_buttons(self, screen):
         """Draw save/load text buttons."""
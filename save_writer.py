@@ -0,0 +1,140 @@
+import os
+import time
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+import pygame
+
+# Posted when a queued write finished: event.path, event.ok
+SAVE_COMPLETE = pygame.event.custom_type()
+
+def backup_path(path):
+    """Return where the last good copy of `path` is kept."""
+    return path + ".bak"
+
+class SaveWriter:
+    """Writes save files on a background thread, atomically.
+
+    `write(path, data)` takes already-serialized bytes and returns at once.
+    The writer puts them in `<path>.tmp`, fsyncs, moves the current file
+    to `<path>.bak` (the last good copy) and renames the temp file into
+    place, so a crash at any point leaves either the new file or the backup
+    intact. Writes land oldest first, so a file written after another
+    (an autosave delta after its base) never reaches disk before it; writes
+    to the same path that pile up are coalesced into the newest one, queued
+    behind everything written before it. A SAVE_COMPLETE event is posted
+    after each write.
+    """
+
+    def __init__(self):
+        self._pending = OrderedDict()  # path -> (data, on_done), oldest first
+        self._cond = threading.Condition()
+        self._busy = False
+        self._thread = None
+
+        # Counters
+        self.writes = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.write_seconds = 0.0
+
+    def write(self, path, data, on_done=None):
+        """Queue `data` (bytes) to be written to `path`; `on_done()` runs on the writer after a successful write."""
+        with self._cond:
+            if path in self._pending:
+                self.coalesced += 1
+                self._pending.move_to_end(path)
+            self._pending[path] = (data, on_done)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+                # The thread is a daemon: don't let the interpreter exit with writes still queued
+                atexit.register(self.flush)
+            self._cond.notify()
+
+    def busy(self):
+        """Whether writes are queued or in progress."""
+        with self._cond:
+            return self._busy or bool(self._pending)
+
+    def flush(self, timeout=5.0):
+        """Wait until every queued write is on disk. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._busy or self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                path, (data, on_done) = self._pending.popitem(last=False)
+                self._busy = True
+            start = time.perf_counter()
+            ok = self._write_atomic(path, data)
+            if ok and on_done is not None:
+                try:
+                    on_done()
+                except Exception as e:
+                    logging.error(f"After writing {path}: {e}")
+            with self._cond:
+                self.write_seconds += time.perf_counter() - start
+                self._busy = False
+                self._cond.notify_all()
+            if pygame.get_init():
+                pygame.event.post(pygame.event.Event(SAVE_COMPLETE, path=path, ok=ok))
+
+    def _write_atomic(self, path, data):
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(path):
+                os.replace(path, backup_path(path))
+            os.replace(tmp_path, path)
+            _fsync_dir(os.path.dirname(path) or ".")
+            self.writes += 1
+            return True
+        except OSError as e:
+            logging.error(f"Could not write save {path}: {e}")
+            self.failures += 1
+            return False
+
+    def stats(self):
+        """Return write counters and the average write time (ms)."""
+        return {
+            'writes': self.writes,
+            'coalesced': self.coalesced,
+            'failures': self.failures,
+            'avg_write_ms': round(self.write_seconds * 1000 / self.writes, 2) if self.writes else 0.0
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Save writer: {self.stats()}")
+
+
+def _fsync_dir(path):
+    """Make the renames durable; not every platform can open a directory."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# Shared instance used by SaveSystem
+save_writer = SaveWriter()
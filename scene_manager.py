@@ -2,6 +2,8 @@ import pygame
 import os
 from typing import Dict, Optional
 from dataclasses import dataclass
+from surface_cache import load_image
+from music_engine import music_engine
 
 @dataclass
 class Scene:
@@ -40,15 +42,14 @@ class SceneManager:
                 # Otherwise load from path
                 print(f"Background is a path: {background}")
                 print(f"File exists: {os.path.exists(background)}")
-                bg_surface = pygame.image.load(background)
+                bg_surface = load_image(background, (self.screen_width, self.screen_height))
                 print(f"Image loaded from path: {bg_surface.get_width()}x{bg_surface.get_height()}")
-                bg_surface = pygame.transform.scale(bg_surface, (self.screen_width, self.screen_height))
             
             loaded_characters = {}
             if characters:
                 for char_name, char_path in characters.items():
                     print(f"Loading character: {char_name} from {char_path}")
-                    char_img = pygame.image.load(char_path)
+                    char_img = load_image(char_path)
                     loaded_characters[char_name] = char_img
             
             scene = Scene(
@@ -77,10 +78,7 @@ class SceneManager:
             print(f"Background size: {self.current_scene.background.get_width()}x{self.current_scene.background.get_height()}")
             
             if self.current_scene.music:
-                try:
-                    pygame.mixer.music.load(self.current_scene.music)
-                    pygame.mixer.music.play(-1)                    
-                except Exception as e:
-                    print(f"Error playing scene music: {e}")
+                # Crossfades in the background; the same track keeps playing untouched
+                music_engine.play(self.current_scene.music)
         else:
             print(f"Scene {scene_name} not found in available scenes!")
\ No newline at end of file
@@ -0,0 +1,167 @@
+import os
+import hashlib
+import logging
+import pickle
+from assets import CHARACTERS
+from constants import BLACK, WHITE, SCRIPT_CACHE_DIR
+from keyframe_index import KeyframeIndex
+from opcodes import (Background, Character, HideCharacter, Dialogue, Sound, Music,
+                     StopMusic, Fade, Wait, Minigame, Noop)
+from script_loader import load_script
+
+# Bump when the opcode layout changes so stale caches are rebuilt
+COMPILER_VERSION = 1
+
+# Character files and sizes are baked into the program, so assets.py is part of the cache key
+ASSETS_HASH = hashlib.sha1(repr(sorted(CHARACTERS.items())).encode("utf-8")).hexdigest()
+
+MINIGAME_TYPES = {
+    'quiz', 'tube_game', 'under_the_hood_game', 'cosmic_challenge', 'fuse_game',
+    'minigame', 'minigame2', 'oil_spill_challenge', 'oil_drain_challenge'
+}
+
+
+class ScriptCompileError(Exception):
+    """Raised when a script command is missing a required field."""
+
+
+class CompiledScript:
+    """Opcode program plus the keyframe index built over it."""
+
+    def __init__(self, ops):
+        self.ops = ops
+        self.keyframes = KeyframeIndex(ops)
+
+    def __len__(self):
+        return len(self.ops)
+
+
+def chapter_title(cmd):
+    """Return the chapter heading of a "~Place: time~" narrator line, if any."""
+    text = cmd.get('text', '')
+    if not text.startswith('~'):
+        return None
+    end = text.find('~', 1)
+    return (text[1:end] if end > 0 else text[1:]).strip()
+
+def _resolve_color(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return BLACK if str(value).upper() == 'BLACK' else WHITE
+
+def _require(cmd, field, idx):
+    if field not in cmd:
+        raise ScriptCompileError(f"Command {idx} ({cmd.get('type')}) is missing '{field}'")
+    return cmd[field]
+
+def compile_command(cmd, idx=0):
+    """Validate one JSON command and turn it into an opcode record."""
+    kind = cmd.get('type')
+    if kind == 'background':
+        return Background(_require(cmd, 'file', idx))
+    if kind == 'character':
+        ch = CHARACTERS.get(cmd.get('name', ''))
+        if ch and 'file' in ch:
+            return Character(cmd['name'], ch['file'], tuple(ch['size']),
+                             cmd.get('position', ch.get('default_position')))
+        return HideCharacter()
+    if kind == 'hide_character':
+        return HideCharacter()
+    if kind == 'dialogue':
+        return Dialogue(cmd.get('speaker', ''), _require(cmd, 'text', idx), chapter_title(cmd))
+    if kind == 'sound':
+        return Sound(cmd.get('file'), cmd.get('channel') == 'ambient', bool(cmd.get('loop')))
+    if kind == 'music':
+        if cmd.get('file'):
+            return Music(cmd['file'], bool(cmd.get('loop')))
+        if cmd.get('stop', False):
+            return StopMusic()
+        return Noop(kind)
+    if kind == 'fade':
+        return Fade(_resolve_color(cmd.get('color', 'BLACK')), float(cmd.get('duration', 1.0)))
+    if kind == 'wait':
+        return Wait(float(cmd.get('duration', 1.0)))
+    if kind in MINIGAME_TYPES:
+        return Minigame(kind)
+    logging.warning(f"Command {idx}: unsupported type '{kind}' is ignored")
+    return Noop(kind)
+
+def compile_commands(commands):
+    """Compile a list of JSON commands into a CompiledScript."""
+    return CompiledScript([compile_command(cmd, idx) for idx, cmd in enumerate(commands)])
+
+
+def _cache_path(file_path):
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(SCRIPT_CACHE_DIR, f"{name}.compiled.pickle")
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def compile_script(file_path):
+    """Return the compiled program for a script file, reusing the on-disk cache.
+
+    The cache is keyed by the script's mtime and size first; if those changed
+    the content hash is compared before falling back to a full JSON parse
+    and validation.
+    """
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    full_path = os.path.join(base_dir, file_path)
+    cache_path = os.path.join(base_dir, _cache_path(file_path))
+    try:
+        st = os.stat(full_path)
+    except OSError as e:
+        logging.error(f"Script file not found: {full_path} ({e})")
+        return None
+
+    cached = None
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # A stale or incompatible pickle can fail in many ways (TypeError when a
+        # namedtuple's fields changed, ...); any of them just means recompiling
+        logging.warning(f"Ignoring unreadable script cache {cache_path}: {e!r}")
+    if not isinstance(cached, dict):
+        cached = None
+
+    if cached and (cached.get('version'), cached.get('assets')) == (COMPILER_VERSION, ASSETS_HASH):
+        if (cached['mtime'], cached['size']) == (st.st_mtime_ns, st.st_size):
+            return cached['program']
+        digest = _file_hash(full_path)
+        if cached['hash'] == digest:
+            _write_cache(cache_path, cached['program'], st, digest)
+            return cached['program']
+    else:
+        digest = _file_hash(full_path)
+
+    script = load_script(file_path)
+    if not script:
+        return None
+    try:
+        program = compile_commands(script['script'])
+    except ScriptCompileError as e:
+        logging.error(f"Invalid script: {e}")
+        return None
+    _write_cache(cache_path, program, st, digest)
+    return program
+
+def _write_cache(cache_path, program, st, digest):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({
+                'version': COMPILER_VERSION,
+                'assets': ASSETS_HASH,
+                'mtime': st.st_mtime_ns,
+                'size': st.st_size,
+                'hash': digest,
+                'program': program
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.warning(f"Could not write script cache {cache_path}: {e}")
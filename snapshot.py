@@ -0,0 +1,327 @@
+import sys
+import json
+import zlib
+import struct
+from array import array
+from constants import SNAPSHOT_COMPRESS_BYTES
+
+MAGIC = b"CCSV"
+DELTA_MAGIC = b"CCSD"
+SNAPSHOT_VERSION = 1
+
+# magic, format version, section count
+HEADER = struct.Struct("<4sHH")
+# tag, flags, stored length, raw length
+SECTION = struct.Struct("<4sBII")
+FLAG_ZLIB = 1
+# command index, muted, chapter, timestamp, thumbnail (string ids)
+CORE = struct.Struct("<iBIII")
+# ambient, music (string ids), music loops
+AUDIO = struct.Struct("<IIB")
+NONE = 0xFFFFFFFF
+# crc32 and length of the full snapshot a delta applies to
+BASE = struct.Struct("<II")
+# Fields a delta stores by number when they changed: ints, then string ids
+DELTA_INTS = ('index', 'muted', 'music_loop')
+DELTA_STRINGS = ('timestamp', 'chapter', 'thumbnail', 'ambient', 'music')
+DELTA_FIELDS = DELTA_INTS + DELTA_STRINGS
+
+class Snapshot:
+    """Everything needed to resume a game, including state the script can't rebuild.
+
+    Command-derived state (background, character, music at that point) comes
+    back from the keyframe index; the snapshot adds what the player did:
+    mute, minigame results, gallery unlocks, the ambient loop and music that
+    were actually playing, and the dialogue history. History is kept as the
+    command indices of the Dialogue opcodes seen, so even a long backlog
+    is a flat int array; the text comes from the compiled script.
+    """
+
+    __slots__ = ('index', 'timestamp', 'chapter', 'thumbnail', 'muted', 'ambient', 'music', 'music_loop',
+                 'gallery', 'minigames', 'history')
+
+    def __init__(self, index=0, timestamp=None, chapter=None, thumbnail=None, muted=False, ambient=None,
+                 music=None, music_loop=False, gallery=(), minigames=None, history=()):
+        self.index = index
+        self.timestamp = timestamp
+        self.chapter = chapter
+        self.thumbnail = thumbnail
+        self.muted = muted
+        self.ambient = ambient
+        self.music = music
+        self.music_loop = music_loop
+        self.gallery = list(gallery)            # unlocked gallery item ids
+        self.minigames = dict(minigames or {})  # kind -> result (any JSON value)
+        self.history = list(history)            # command indices of the dialogue lines seen, oldest first
+
+    def as_dict(self):
+        """Return the snapshot as plain JSON-compatible data."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['gallery'] = list(self.gallery)
+        data['minigames'] = dict(self.minigames)
+        data['history'] = list(self.history)
+        return data
+
+    def copy(self):
+        return Snapshot(**self.as_dict())
+
+
+class _Strings:
+    """Deduplicating string table: each distinct string is stored once."""
+
+    def __init__(self):
+        self.ids = {}
+        self.items = []
+
+    def id(self, value):
+        if value is None:
+            return NONE
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.items)
+            self.items.append(value)
+        return sid
+
+    def pack(self):
+        encoded = [s.encode("utf-8") for s in self.items]
+        return _pack_ints([len(self.items)] + [len(b) for b in encoded]) + b"".join(encoded)
+
+
+def _pack_ints(values):
+    ints = array("I", values)
+    if sys.byteorder == "big":
+        ints.byteswap()
+    return ints.tobytes()
+
+def _unpack_ints(data, offset=0, count=None):
+    if count is None:
+        count = (len(data) - offset) // 4
+    ints = array("I")
+    ints.frombytes(data[offset:offset + 4 * count])
+    if sys.byteorder == "big":
+        ints.byteswap()
+    return ints
+
+def _unpack_strings(data):
+    count = _unpack_ints(data, 0, 1)[0]
+    lengths = _unpack_ints(data, 4, count)
+    strings = []
+    pos = 4 + 4 * count
+    for length in lengths:
+        strings.append(data[pos:pos + length].decode("utf-8"))
+        pos += length
+    return strings
+
+
+def encode(snapshot, compress_bytes=SNAPSHOT_COMPRESS_BYTES):
+    """Serialize a snapshot. Sections over `compress_bytes` are zlib-compressed."""
+    strings = _Strings()
+    sid = strings.id
+    core = CORE.pack(snapshot.index, snapshot.muted, sid(snapshot.chapter), sid(snapshot.timestamp),
+                     sid(snapshot.thumbnail))
+    audio = AUDIO.pack(sid(snapshot.ambient), sid(snapshot.music), snapshot.music_loop)
+    gallery = _pack_ints([sid(item) for item in snapshot.gallery])
+    minigames = _pack_ints([i for kind, result in snapshot.minigames.items()
+                            for i in (sid(kind), sid(json.dumps(result)))])
+    history = _pack_ints(snapshot.history)
+
+    sections = [(b"STRS", strings.pack()), (b"CORE", core), (b"AUDI", audio),
+                (b"GALL", gallery), (b"GAME", minigames), (b"HIST", history)]
+    return _pack_sections(MAGIC, sections, compress_bytes)
+
+
+def _pack_sections(magic, sections, compress_bytes):
+    out = [HEADER.pack(magic, SNAPSHOT_VERSION, len(sections))]
+    for tag, raw in sections:
+        stored, flags = raw, 0
+        if len(raw) > compress_bytes:
+            packed = zlib.compress(raw, 1)
+            if len(packed) < len(raw):
+                stored, flags = packed, FLAG_ZLIB
+        out.append(SECTION.pack(tag, flags, len(stored), len(raw)))
+        out.append(stored)
+    return b"".join(out)
+
+
+def _read_sections(data, expected=MAGIC):
+    magic, version, count = HEADER.unpack_from(data, 0)
+    if magic != expected:
+        raise ValueError("not a snapshot")
+    pos = HEADER.size
+    sections = {}
+    for _ in range(count):
+        tag, flags, stored_len, raw_len = SECTION.unpack_from(data, pos)
+        pos += SECTION.size
+        raw = data[pos:pos + stored_len]
+        if len(raw) != stored_len:
+            raise ValueError(f"section {tag!r} is truncated")
+        pos += stored_len
+        if flags & FLAG_ZLIB:
+            raw = zlib.decompress(raw)
+        if len(raw) != raw_len:
+            raise ValueError(f"section {tag!r} has the wrong length")
+        sections[tag.decode("ascii")] = raw
+    return version, sections
+
+
+def _fields_v1(sections):
+    """Decode the sections of a version 1 snapshot into Snapshot fields."""
+    strings = _unpack_strings(sections['STRS'])
+    def s(i):
+        return None if i == NONE else strings[i]
+    index, muted, chapter, timestamp, thumbnail = CORE.unpack(sections['CORE'])
+    ambient, music, music_loop = AUDIO.unpack(sections['AUDI'])
+    minigames = _unpack_ints(sections.get('GAME', b""))
+    history = _unpack_ints(sections.get('HIST', b""))
+    return {
+        'index': index, 'muted': bool(muted), 'chapter': s(chapter), 'timestamp': s(timestamp),
+        'thumbnail': s(thumbnail), 'ambient': s(ambient), 'music': s(music), 'music_loop': bool(music_loop),
+        'gallery': [s(i) for i in _unpack_ints(sections.get('GALL', b""))],
+        'minigames': {s(minigames[i]): json.loads(s(minigames[i + 1])) for i in range(0, len(minigames), 2)},
+        'history': history.tolist()
+    }
+
+
+def _migrate_v0(data):
+    """Version 0 is the old JSON save: {'current_command_index', 'timestamp', 'chapter'}."""
+    return {'index': data.get('current_command_index', 0), 'timestamp': data.get('timestamp'),
+            'chapter': data.get('chapter')}
+
+# Version -> function turning that version's fields into the next version's
+MIGRATIONS = {0: _migrate_v0}
+
+def migrate(fields, version):
+    """Upgrade decoded fields from `version` to SNAPSHOT_VERSION."""
+    while version < SNAPSHOT_VERSION:
+        fields = MIGRATIONS[version](fields)
+        version += 1
+    return Snapshot(**fields)
+
+
+def decode(data):
+    """Parse snapshot bytes (or an old JSON save) into a Snapshot. Raises ValueError if damaged."""
+    if not data.startswith(MAGIC):
+        legacy = json.loads(data)
+        if not isinstance(legacy, dict) or "current_command_index" not in legacy:
+            raise ValueError("not a save")
+        return migrate(legacy, 0)
+    try:
+        version, sections = _read_sections(data)
+    except (struct.error, zlib.error) as e:
+        raise ValueError(f"damaged snapshot: {e}")
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"snapshot version {version} is newer than this game ({SNAPSHOT_VERSION})")
+    try:
+        # Every version so far keeps the version 1 section layout
+        return migrate(_fields_v1(sections), max(version, 1))
+    except (KeyError, IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"damaged snapshot: {e}")
+
+
+def is_delta(data):
+    """Whether `data` is a delta written by `encode_delta`."""
+    return data.startswith(DELTA_MAGIC)
+
+
+def encode_delta(snapshot, base, base_data, compress_bytes=SNAPSHOT_COMPRESS_BYTES):
+    """Serialize only what changed since `base`, the Snapshot encoded as `base_data`.
+
+    Changed scalar fields are stored by number; history, which only grows
+    while playing, as the length of the prefix it shares with the base plus
+    the new entries; gallery and minigame sections only when they differ.
+    """
+    strings = _Strings()
+    changed = []
+    for number, name in enumerate(DELTA_FIELDS):
+        value = getattr(snapshot, name)
+        if value != getattr(base, name):
+            changed += [number, strings.id(value) if name in DELTA_STRINGS else int(value)]
+
+    old, new = base.history, snapshot.history
+    keep = min(len(old), len(new))
+    if old[:keep] != new[:keep]:
+        keep = next(i for i, (a, b) in enumerate(zip(old, new)) if a != b)
+
+    sections = [(b"BASE", BASE.pack(zlib.crc32(base_data), len(base_data))),
+                (b"FLDS", _pack_ints(changed)), (b"HIST", _pack_ints([keep] + new[keep:]))]
+    if snapshot.gallery != base.gallery:
+        sections.append((b"GALL", _pack_ints([strings.id(item) for item in snapshot.gallery])))
+    if snapshot.minigames != base.minigames:
+        sections.append((b"GAME", _pack_ints([i for kind, result in snapshot.minigames.items()
+                                              for i in (strings.id(kind), strings.id(json.dumps(result)))])))
+    sections.insert(0, (b"STRS", strings.pack()))
+    return _pack_sections(DELTA_MAGIC, sections, compress_bytes)
+
+
+def decode_delta(data, bases):
+    """Rebuild a Snapshot from a delta and the full snapshot it was made against.
+
+    `bases` are candidate full snapshots (bytes); the one whose checksum the
+    delta recorded is used. Raises ValueError if none matches or the delta
+    is damaged.
+    """
+    try:
+        version, sections = _read_sections(data, DELTA_MAGIC)
+        crc, length = BASE.unpack(sections['BASE'])
+    except (KeyError, struct.error, zlib.error) as e:
+        raise ValueError(f"damaged delta: {e}")
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"delta version {version} is newer than this game ({SNAPSHOT_VERSION})")
+    base_data = next((b for b in bases if len(b) == length and zlib.crc32(b) == crc), None)
+    if base_data is None:
+        raise ValueError("the snapshot this delta was made against is gone")
+    fields = decode(base_data).as_dict()
+
+    try:
+        strings = _unpack_strings(sections['STRS'])
+        def s(i):
+            return None if i == NONE else strings[i]
+        changed = _unpack_ints(sections['FLDS'])
+        for i in range(0, len(changed), 2):
+            name = DELTA_FIELDS[changed[i]]
+            value = changed[i + 1]
+            fields[name] = s(value) if name in DELTA_STRINGS else value if name == 'index' else bool(value)
+        history = _unpack_ints(sections['HIST'])
+        fields['history'] = fields['history'][:history[0]] + history[1:].tolist()
+        if 'GALL' in sections:
+            fields['gallery'] = [s(i) for i in _unpack_ints(sections['GALL'])]
+        if 'GAME' in sections:
+            minigames = _unpack_ints(sections['GAME'])
+            fields['minigames'] = {s(minigames[i]): json.loads(s(minigames[i + 1]))
+                                   for i in range(0, len(minigames), 2)}
+    except (KeyError, IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"damaged delta: {e}")
+    return Snapshot(**fields)
+
+
+def to_json(snapshot):
+    """Debug export: the snapshot as readable JSON."""
+    return json.dumps(dict(snapshot.as_dict(), version=SNAPSHOT_VERSION), indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    # Dump a save as JSON: python snapshot.py saves/save_1.sav
+    # (a delta also needs its base: saves/autosave_1.sav saves/autosave_base.sav)
+    # Without arguments, time save/load with a long dialogue history
+    import time
+    if len(sys.argv) > 1:
+        files = []
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                files.append(f.read())
+        print(to_json(decode_delta(files[0], files[1:]) if is_delta(files[0]) else decode(files[0])))
+        sys.exit()
+
+    lines = list(range(0, 20000, 2))
+    snap = Snapshot(index=1234, timestamp="2025-05-08 19:05:49", chapter="Chapter 3", muted=True,
+                    ambient="sounds/sound_effects/cricketSound.mp3", music="sounds/music/intrigue.mp3",
+                    music_loop=True, gallery=["car_1", "car_2"], minigames={'quiz': 4, 'fuse_game': True},
+                    history=lines)
+    for name, func, arg in (("encode", encode, snap), ("decode", decode, encode(snap))):
+        start = time.perf_counter()
+        for _ in range(100):
+            func(arg)
+        print(f"{name} ({len(lines)} history lines)  {10 * (time.perf_counter() - start):6.3f} ms")
+    data = encode(snap)
+    print(f"binary {len(data)} bytes, JSON {len(to_json(snap).encode('utf-8'))} bytes")
+    assert decode(data).as_dict() == snap.as_dict()
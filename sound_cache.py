@@ -0,0 +1,128 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+import pygame
+from constants import SOUND_CACHE_BUDGET
+from audio_cache import audio_cache
+
+class SoundCache:
+    """Process-wide LRU cache of decoded sound effects.
+
+    Every effect is decoded once per run (an MP3 decode costs milliseconds;
+    the transcoded WAV from the audio cache is used when there is one)
+    and shared by the script runner, SoundManager and the minigames. Entries
+    are evicted least recently used first once their PCM size passes the
+    byte budget. Loads are thread-safe so the asset prefetcher can decode
+    upcoming effects on its worker. Cached sounds are shared: a `set_volume`
+    on one is seen by every user of that file.
+    """
+
+    def __init__(self, budget_bytes=SOUND_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Counters for sizing the budget
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.decode_seconds = {}
+
+    @staticmethod
+    def make_key(path):
+        """Build the cache key for a file."""
+        return os.path.normpath(path)
+
+    @staticmethod
+    def sound_bytes(sound):
+        """Memory held by a sound's decoded samples."""
+        init = pygame.mixer.get_init()
+        if not init:
+            return 0
+        frequency, size, channels = init
+        return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+    def load(self, path):
+        """Return the Sound for `path`, decoding it on a miss."""
+        key = self.make_key(path)
+        with self._lock:
+            sound = self._entries.get(key)
+            if sound is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return sound
+            self.misses += 1
+
+        # Decode outside the lock; a racing load of the same file just decodes twice
+        start = time.perf_counter()
+        sound = pygame.mixer.Sound(audio_cache.resolve(path))
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.decode_seconds[key] = elapsed
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.used_bytes -= self.sound_bytes(old)
+            self._entries[key] = sound
+            self.used_bytes += self.sound_bytes(sound)
+            self._evict(keep=key)
+        return sound
+
+    def contains(self, path):
+        """Check whether a load would hit, without counting it."""
+        return self.make_key(path) in self._entries
+
+    def preload(self, paths):
+        """Decode `paths` now so their first play doesn't stall."""
+        for path in paths:
+            if not self.contains(path):
+                try:
+                    self.load(path)
+                except (pygame.error, FileNotFoundError) as e:
+                    logging.warning(f"Could not preload sound {path}: {e}")
+
+    def _evict(self, keep=None):
+        while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep:
+                # Never evict the entry that was just requested
+                self._entries.move_to_end(key)
+                continue
+            sound = self._entries.pop(key)
+            self.used_bytes -= self.sound_bytes(sound)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached sound. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counters, memory usage and decode times (ms)."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'used_bytes': self.used_bytes,
+            'budget_bytes': self.budget_bytes,
+            'decode_ms': {os.path.basename(k): round(s * 1000, 2) for k, s in self.decode_seconds.items()}
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Sound cache: {self.stats()}")
+
+
+# Shared instance used by the script runner, SoundManager and minigames
+sound_cache = SoundCache()
+
+def load_sound(path):
+    """Load a sound effect through the shared sound cache."""
+    return sound_cache.load(path)
@@ -1,13 +1,15 @@
 import pygame
 import logging
 import os
+from sound_cache import sound_cache
+from music_engine import music_engine
+from channel_pool import channel_pool
 
 class SoundManager:
     def __init__(self):
         """Initialize the sound manager."""
         self.is_muted = False
         self.previous_volume = 1.0
-        self.sounds = {}
         self.current_music = None
         try:
             pygame.mixer.init()
@@ -41,11 +43,11 @@ class SoundManager:
         if volume is not None:
             self.previous_volume = max(0.0, min(1.0, volume))
             
-        current_volume = 0 if self.is_muted else self.previous_volume
         try:
-            pygame.mixer.music.set_volume(current_volume)
-            for sound in self.sounds.values():
-                sound.set_volume(current_volume)
+            # One gain update per bus channel instead of touching every cached sound
+            channel_pool.set_muted(self.is_muted)
+            channel_pool.set_master(self.previous_volume)
+            channel_pool.apply()
         except Exception as e:
             logging.error(f"Error setting volume: {e}")
 
@@ -85,9 +87,7 @@ class SoundManager:
             print(f"File exists: {os.path.exists(file)}")
             print(f"Full path: {os.path.abspath(file)}")
             
-            pygame.mixer.music.load(file)
-            pygame.mixer.music.set_volume(0 if self.is_muted else self.previous_volume)
-            pygame.mixer.music.play(-1 if loop else 0)
+            music_engine.play(file, loop)
             self.current_music = file
             logging.info(f"Playing music: {file}, loop={loop}")
             print(f"Successfully started music playback: {file}")
@@ -102,11 +102,7 @@ class SoundManager:
             print(f"File exists: {os.path.exists(file)}")
             print(f"Full path: {os.path.abspath(file)}")
             
-            if file not in self.sounds:
-                self.sounds[file] = pygame.mixer.Sound(file)
-            sound = self.sounds[file]
-            sound.set_volume(0 if self.is_muted else self.previous_volume)
-            sound.play()
+            channel_pool.play(sound_cache.load(file), 'sfx')
             logging.info(f"Playing sound: {file}")
             print(f"Successfully started sound playback: {file}")
         except Exception as e:
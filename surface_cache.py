@@ -0,0 +1,218 @@
+import os
+import logging
+from collections import OrderedDict
+import pygame
+from constants import SURFACE_CACHE_BUDGET, SURFACE_RLE
+
+# Modes whose surfaces are in the display format and must follow it when it changes
+DISPLAY_MODES = ("auto", "convert", "alpha")
+
+def display_format():
+    """Return a signature of the display's pixel format, or None without a display."""
+    display = pygame.display.get_surface()
+    if display is None:
+        return None
+    return display.get_bitsize(), display.get_masks()
+
+def normalize(surface, mode):
+    """Convert a surface to the display format.
+
+    "auto" picks by content: per-pixel alpha images get `convert_alpha`,
+    colorkeyed ones `convert` with RLE acceleration (if SURFACE_RLE), and
+    opaque ones plain `convert`. None returns the surface unchanged.
+    """
+    if mode == "auto":
+        if surface.get_flags() & pygame.SRCALPHA:
+            mode = "alpha"
+        elif surface.get_colorkey() is not None:
+            colorkey = surface.get_colorkey()
+            surface = surface.convert()
+            surface.set_colorkey(colorkey, pygame.RLEACCEL if SURFACE_RLE else 0)
+            return surface
+        else:
+            mode = "convert"
+    if mode == "alpha":
+        return surface.convert_alpha()
+    if mode == "convert":
+        return surface.convert()
+    return surface
+
+class SurfaceCache:
+    """Process-wide LRU cache of decoded and scaled surfaces.
+
+    Entries are keyed by (path, target size, mode) where mode is None for the
+    raw decoded surface, "convert" for opaque display-format surfaces,
+    "alpha" for per-pixel alpha display-format surfaces and "auto" (the
+    default) to pick by the image's content, see `normalize`. Cached surfaces
+    are shared, so callers must copy before mutating them (set_alpha, fill, ...).
+
+    Display-format entries are re-converted when the display's pixel format
+    changes, so a mode switch never leaves blits paying for conversion.
+    """
+
+    def __init__(self, budget_bytes=SURFACE_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._entries = OrderedDict()
+        self._format = None
+
+        # Counters for sizing the budget
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reconversions = 0
+
+    @staticmethod
+    def make_key(path, size=None, mode="auto"):
+        """Build the cache key for a load request."""
+        # Convert modes need a display; without one the raw surface is what we get
+        if mode and not pygame.display.get_surface():
+            mode = None
+        return (os.path.normpath(path), tuple(size) if size else None, mode)
+
+    @staticmethod
+    def surface_bytes(surface):
+        """Approximate memory held by a surface's pixel buffer."""
+        return surface.get_pitch() * surface.get_height()
+
+    def load(self, path, size=None, mode="auto"):
+        """Return the surface for `path`, decoding and scaling it on a miss."""
+        self.check_format()
+        key = self.make_key(path, size, mode)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self._decode(*key)
+        self.put(key, surface)
+        return surface
+
+    def _decode(self, path, size, mode):
+        """Decode, scale and convert a surface without touching the cache."""
+        surface = pygame.image.load(path)
+        if size and surface.get_size() != size:
+            surface = pygame.transform.scale(surface, size)
+        return normalize(surface, mode)
+
+    def check_format(self):
+        """Re-convert display-format entries if the display's pixel format changed."""
+        current = display_format()
+        if current == self._format:
+            return
+        previous, self._format = self._format, current
+        if previous is None or current is None:
+            # First display, or it went away: nothing converted to re-do
+            return
+        for key, surface in self._entries.items():
+            if key[2] in DISPLAY_MODES:
+                self._entries[key] = normalize(surface, key[2])
+                self.reconversions += 1
+        self.used_bytes = sum(self.surface_bytes(s) for s in self._entries.values())
+        logging.info(f"Display format changed, re-converted {self.reconversions} cached surfaces")
+
+    def put(self, key, surface):
+        """Insert a surface and evict least recently used entries over budget."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.used_bytes -= self.surface_bytes(old)
+        self._entries[key] = surface
+        self.used_bytes += self.surface_bytes(surface)
+        self._evict(keep=key)
+
+    def contains(self, path, size=None, mode="auto"):
+        """Check whether a load request would hit, without counting it."""
+        return self.make_key(path, size, mode) in self._entries
+
+    def set_budget(self, budget_bytes):
+        """Change the byte budget, evicting immediately if it shrank."""
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def _evict(self, keep=None):
+        while self.used_bytes > self.budget_bytes and self._entries:
+            key = next(iter(self._entries))
+            if key == keep:
+                # Never evict the entry that was just requested
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(key)
+                continue
+            surface = self._entries.pop(key)
+            self.used_bytes -= self.surface_bytes(surface)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached surface. Counters are kept."""
+        self._entries.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counters and memory usage."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'reconversions': self.reconversions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'used_bytes': self.used_bytes,
+            'budget_bytes': self.budget_bytes
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Surface cache: {self.stats()}")
+
+
+# Shared instance used by the script runner, scene manager and minigames
+surface_cache = SurfaceCache()
+
+def load_image(path, size=None, mode="auto"):
+    """Load an image through the shared surface cache, in the display format."""
+    return surface_cache.load(path, size, mode)
+
+
+if __name__ == "__main__":
+    # Blit cost of every shipped image, raw vs display format: python surface_cache.py
+    import sys
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    root = os.path.dirname(os.path.abspath(__file__))
+    paths = sorted(os.path.join(d, f) for d, _, files in os.walk(root) for f in files
+                   if f.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".gif")))
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    def blit_seconds(surface):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            screen.blit(surface, (0, 0))
+        return (time.perf_counter() - start) / repeat
+
+    totals = {"raw": 0.0, "normalized": 0.0}
+    kinds = {}
+    for path in paths:
+        try:
+            raw = pygame.image.load(path)
+        except pygame.error:
+            continue
+        # Game assets are drawn at most canvas-sized
+        if raw.get_width() > 1280 or raw.get_height() > 720:
+            raw = pygame.transform.scale(raw, (min(raw.get_width(), 1280), min(raw.get_height(), 720)))
+        converted = normalize(raw, "auto")
+        kind = "alpha" if converted.get_flags() & pygame.SRCALPHA else "colorkey" if converted.get_colorkey() else "opaque"
+        kinds[kind] = kinds.get(kind, 0) + 1
+        totals["raw"] += blit_seconds(raw)
+        totals["normalized"] += blit_seconds(converted)
+
+    print(f"{len(paths)} images ({', '.join(f'{n} {k}' for k, n in sorted(kinds.items()))}), one blit of each:")
+    for name, seconds in totals.items():
+        print(f"  {name:10s} {seconds * 1000:8.2f} ms")
+    if totals["normalized"]:
+        print(f"  speedup    {totals['raw'] / totals['normalized']:8.1f}x")
+    pygame.quit()
@@ -1,12 +1,13 @@
 import os
 import pygame
-import sys
 import random
+from surface_cache import load_image
+from sound_cache import load_sound
+from channel_pool import channel_pool
+from minigame_host import minigame_host, QUIT_GAME
+from font_registry import get_font
 from pygame.locals import *
 
-# Initialize Pygame
-pygame.init()
-
 # Constants
 SCREEN_WIDTH = 1535
 SCREEN_HEIGHT = 810
@@ -29,18 +30,19 @@ GAME_LOST = 2
 class UnderTheHoodGame:
     def start_game(self):
         self.run()  # Call the run method to start the game
-        return
+        return self.result
     def __init__(self):
         self.base_dir = os.path.dirname(__file__)
+        self.result = None  # QUIT_GAME if the window was closed
         
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = minigame_host.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Under the Hood Challenge")
-        self.clock = pygame.time.Clock()
+        self.clock = minigame_host.clock
         # Use bold fonts for better readability
-        self.font = pygame.font.SysFont('Arial', 24, bold=True)
-        self.small_font = pygame.font.SysFont('Arial', 20)
-        self.large_font = pygame.font.SysFont('Arial', 36, bold=True)
-        self.tooltip_font = pygame.font.SysFont('Arial', 18)
+        self.font = get_font('Arial', 24, bold=True)
+        self.small_font = get_font('Arial', 20)
+        self.large_font = get_font('Arial', 36, bold=True)
+        self.tooltip_font = get_font('Arial', 18)
 
         # Load component images
         self.components = {}
@@ -49,8 +51,7 @@ class UnderTheHoodGame:
         # Try to load the real engine bay background
         try:
             engine_bay_path = os.path.join(self.base_dir, "engine_bay.png")
-            self.engine_background = pygame.image.load(engine_bay_path)
-            self.engine_background = pygame.transform.scale(self.engine_background, (1200, 650))
+            self.engine_background = load_image(engine_bay_path, (1200, 650))
         except:
             # Create a fallback engine background if image isn't available
             self.engine_background = pygame.Surface((700, 450))
@@ -59,10 +60,10 @@ class UnderTheHoodGame:
 
         # Load sound effects (optional)
         try:
-            self.correct_sound = pygame.mixer.Sound(os.path.join(self.base_dir, "correct.wav"))
-            self.wrong_sound = pygame.mixer.Sound(os.path.join(self.base_dir, "wrong.wav"))
-            self.win_sound = pygame.mixer.Sound(os.path.join(self.base_dir, "win.wav"))
-            self.lose_sound = pygame.mixer.Sound(os.path.join(self.base_dir, "lose.wav"))
+            self.correct_sound = load_sound(os.path.join(self.base_dir, "correct.wav"))
+            self.wrong_sound = load_sound(os.path.join(self.base_dir, "wrong.wav"))
+            self.win_sound = load_sound(os.path.join(self.base_dir, "win.wav"))
+            self.lose_sound = load_sound(os.path.join(self.base_dir, "lose.wav"))
             self.sounds_loaded = True
         except:
             self.sounds_loaded = False
@@ -126,8 +127,7 @@ class UnderTheHoodGame:
             width, height = size
             try:
                 img_full_path = os.path.join(self.base_dir, img_path)
-                img = pygame.image.load(img_full_path).convert_alpha()
-                img = pygame.transform.scale(img, size)
+                img = load_image(img_full_path, size, "alpha")
             except:
                 img = pygame.Surface(size, pygame.SRCALPHA)
                 img.fill(colors[key])
@@ -158,13 +158,13 @@ class UnderTheHoodGame:
                 self.feedback_text = "✅ You Win! Press R to play again."
                 self.feedback_color = GREEN
                 if self.sounds_loaded:
-                    self.win_sound.play()
+                    channel_pool.play(self.win_sound, 'minigame', priority=1)
             else:  # Lose condition
                 self.game_state = GAME_LOST
                 self.feedback_text = f"❌ Try Again! Score: {self.correct_answers}/6. Press R to restart."
                 self.feedback_color = RED
                 if self.sounds_loaded:
-                    self.lose_sound.play()
+                    channel_pool.play(self.lose_sound, 'minigame', priority=1)
 
     def check_answer(self, selected_component):
         if self.game_state != GAME_PLAYING:
@@ -178,12 +178,12 @@ class UnderTheHoodGame:
             self.feedback_text = f"Correct! That was the {component_name}."
             self.feedback_color = GREEN
             if self.sounds_loaded:
-                self.correct_sound.play()
+                channel_pool.play(self.correct_sound, 'minigame')
         else:
             self.feedback_text = f"Wrong! That was the {component_name}."
             self.feedback_color = RED
             if self.sounds_loaded:
-                self.wrong_sound.play()
+                channel_pool.play(self.wrong_sound, 'minigame')
 
         # Set a timer for the popup with enhanced styling
         self.popup = {
@@ -209,10 +209,12 @@ class UnderTheHoodGame:
         self.set_next_question()
 
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in minigame_host.get_events():
             if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
+                # Stop the game loop and let the novel decide whether to quit
+                self.game_state = None
+                self.result = QUIT_GAME
+                return
 
             # Handle key presses
             elif event.type == KEYDOWN:
@@ -220,9 +222,6 @@ class UnderTheHoodGame:
                     self.restart_game()
                 elif event.key == K_ESCAPE:
                 # Exit the game loop by setting the game state to None
-                    self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                    global SCREEN_WIDTH, SCREEN_HEIGHT
-                    SCREEN_WIDTH, SCREEN_HEIGHT = self.screen.get_size()
                     self.game_state = None
                     
                     return  # Exit the method to stop further event handling
@@ -230,7 +229,7 @@ class UnderTheHoodGame:
             # Handle mouse events
             elif event.type == MOUSEBUTTONDOWN and event.button == 1:  # Left mouse button
                 if self.game_state == GAME_PLAYING:
-                    mouse_pos = pygame.mouse.get_pos()
+                    mouse_pos = minigame_host.mouse_pos()
 
                     # Adjust mouse position for engine area
                     engine_x = (SCREEN_WIDTH - self.engine_background.get_width()) // 2
@@ -263,7 +262,7 @@ class UnderTheHoodGame:
             self.popup = None
 
         # Update hovered component and tooltip
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = minigame_host.mouse_pos()
         self.hovered_component = None
         self.tooltip = None
 
@@ -519,7 +518,7 @@ class UnderTheHoodGame:
                 BLACK)
             self.screen.blit(instructions, (SCREEN_WIDTH // 2 - instructions.get_width() // 2, SCREEN_HEIGHT - 25))
 
-        pygame.display.flip()
+        minigame_host.flip()
 
     def run(self):
         while self.game_state is not None:  # Continue running while the game state is valid
@@ -531,5 +530,7 @@ class UnderTheHoodGame:
 
 # Run the game
 if __name__ == "__main__":
+    pygame.init()
     game = UnderTheHoodGame()
-    game.run()
\ No newline at end of file
+    game.run()
+    pygame.quit()
\ No newline at end of file
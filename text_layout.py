@@ -0,0 +1,149 @@
+import logging
+from collections import OrderedDict
+import pygame
+from constants import TEXT_LAYOUT_CACHE_SIZE, TEXT_LINE_CACHE_BUDGET
+
+class TextLayout:
+    """Shared cache of wrapped line breaks and rendered text lines.
+
+    Line breaks are keyed by (text, font, max width) and measured with
+    `font.size` on single words, so wrapping never renders anything and is
+    linear in the length of the text. Rendered lines are kept in an LRU with
+    a byte budget; they are shared, so callers must not draw on them.
+    """
+
+    def __init__(self, max_layouts=TEXT_LAYOUT_CACHE_SIZE, line_budget_bytes=TEXT_LINE_CACHE_BUDGET):
+        self.max_layouts = max_layouts
+        self.line_budget_bytes = line_budget_bytes
+        self.line_bytes = 0
+        self._layouts = OrderedDict()
+        self._widths = OrderedDict()
+        self._lines = OrderedDict()
+
+        # Counters
+        self.layout_hits = 0
+        self.layout_misses = 0
+        self.line_hits = 0
+        self.line_misses = 0
+
+    def _word_width(self, font, word):
+        key = (font, word)
+        width = self._widths.get(key)
+        if width is None:
+            width = font.size(word)[0]
+            self._widths[key] = width
+            if len(self._widths) > self.max_layouts * 8:
+                self._widths.popitem(last=False)
+        return width
+
+    def wrap(self, text, font, max_width):
+        """Return the lines `text` breaks into at `max_width` pixels."""
+        key = (text, font, max_width)
+        lines = self._layouts.get(key)
+        if lines is not None:
+            self._layouts.move_to_end(key)
+            self.layout_hits += 1
+            return lines
+
+        self.layout_misses += 1
+        space = self._word_width(font, ' ')
+        lines = []
+        current = []
+        width = 0
+        for word in text.split():
+            word_width = self._word_width(font, word)
+            if current and width + space + word_width > max_width:
+                lines.append(' '.join(current))
+                current, width = [word], word_width
+            else:
+                width += (space if current else 0) + word_width
+                current.append(word)
+        lines.append(' '.join(current))
+
+        lines = tuple(lines)
+        self._layouts[key] = lines
+        if len(self._layouts) > self.max_layouts:
+            self._layouts.popitem(last=False)
+        return lines
+
+    def render(self, text, font, color, antialias=True):
+        """Return a rendered surface for one line of text."""
+        key = (text, font, tuple(color), antialias)
+        surface = self._lines.get(key)
+        if surface is not None:
+            self._lines.move_to_end(key)
+            self.line_hits += 1
+            return surface
+
+        self.line_misses += 1
+        surface = font.render(text, antialias, color)
+        self._lines[key] = surface
+        self.line_bytes += surface.get_pitch() * surface.get_height()
+        while self.line_bytes > self.line_budget_bytes and len(self._lines) > 1:
+            _, old = self._lines.popitem(last=False)
+            self.line_bytes -= old.get_pitch() * old.get_height()
+        return surface
+
+    def stats(self):
+        """Return hit/miss counters and memory usage."""
+        return {
+            'layout_hits': self.layout_hits,
+            'layout_misses': self.layout_misses,
+            'line_hits': self.line_hits,
+            'line_misses': self.line_misses,
+            'lines': len(self._lines),
+            'line_bytes': self.line_bytes
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Text layout: {self.stats()}")
+
+
+# Shared instance used by every dialogue drawer
+text_layout = TextLayout()
+
+def wrap_text(text, font, max_width):
+    """Wrap text to fit within `max_width` pixels, using the shared layout cache."""
+    return text_layout.wrap(text, font, max_width)
+
+def render_line(text, font, color, antialias=True):
+    """Render one line of text through the shared line cache."""
+    return text_layout.render(text, font, color, antialias)
+
+
+def _wrap_by_rendering(text, font, max_width):
+    # The old dialogue_system.wrap_text: re-renders the growing line per word
+    lines, current = [], []
+    for word in text.split(' '):
+        current.append(word)
+        if font.render(' '.join(current), True, (0, 0, 0)).get_width() > max_width:
+            current.pop()
+            lines.append(' '.join(current))
+            current = [word]
+    if current:
+        lines.append(' '.join(current))
+    return lines
+
+
+if __name__ == "__main__":
+    # Layout microbenchmark: python text_layout.py
+    import json
+    import time
+    pygame.font.init()
+    font = pygame.font.Font(None, 32)
+    with open("script.json", encoding="utf-8") as f:
+        texts = [c['text'] for c in json.load(f)['script'] if c.get('type') == 'dialogue']
+
+    def per_line(wrap, rounds=20):
+        start = time.perf_counter()
+        count = 0
+        for _ in range(rounds):
+            for text in texts:
+                count += len(wrap(text, font, 760))
+        return (time.perf_counter() - start) / count * 1e6
+
+    print(f"{len(texts)} dialogue lines, 760px wide")
+    print(f"render to measure (old)  {per_line(_wrap_by_rendering):8.2f} us/line")
+    print(f"font.size, cold cache    {per_line(lambda t, f, w: TextLayout().wrap(t, f, w), 1):8.2f} us/line")
+    print(f"font.size, cached        {per_line(wrap_text):8.2f} us/line")
@@ -0,0 +1,139 @@
+import os
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from constants import THUMBNAIL_SIZE, THUMBNAIL_CACHE_SIZE
+
+# Posted when a thumbnail finished encoding or decoding: event.path
+THUMBNAIL_READY = pygame.event.custom_type()
+
+class ThumbnailStore:
+    """Save-slot thumbnails: written off the main thread, decoded lazily, cached.
+
+    `capture(frame, path)` only copies the frame; downscaling to
+    THUMBNAIL_SIZE and the PNG encode run on a worker thread, so saving
+    doesn't hitch. `get(path)` returns a cached thumbnail or None, starting
+    a background decode the first time a path is asked for, so a menu
+    only loads the thumbnails of the rows it draws. A THUMBNAIL_READY event
+    is posted when one becomes available; the cache keeps the most
+    recently shown `cache_size` thumbnails.
+    """
+
+    def __init__(self, size=THUMBNAIL_SIZE, cache_size=THUMBNAIL_CACHE_SIZE):
+        self.size = tuple(size)
+        self.cache_size = cache_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+        self._cache = OrderedDict()
+        self._jobs = {}
+        self._missing = set()
+
+        # Counters
+        self.captures = 0
+        self.capture_seconds = 0.0
+        self.encodes = 0
+        self.encode_seconds = 0.0
+        self.decodes = 0
+        self.decode_seconds = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def capture(self, frame, path):
+        """Queue a thumbnail of `frame` (copied now) to be written to `path`."""
+        start = time.perf_counter()
+        copy = frame.copy()
+        self.forget(path)
+        self._jobs[path] = self._executor.submit(self._encode, copy, path)
+        self.captures += 1
+        self.capture_seconds += time.perf_counter() - start
+
+    def _encode(self, frame, path):
+        start = time.perf_counter()
+        try:
+            thumb = pygame.transform.smoothscale(frame, self.size)
+        except ValueError:
+            # smoothscale needs 24/32-bit surfaces
+            thumb = pygame.transform.scale(frame, self.size)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pygame.image.save(thumb, f, "png")
+            os.replace(tmp_path, path)
+        except (OSError, pygame.error) as e:
+            logging.warning(f"Could not write thumbnail {path}: {e}")
+        self.encodes += 1
+        self.encode_seconds += time.perf_counter() - start
+        self._ready(path)
+        return thumb
+
+    def _decode(self, path):
+        start = time.perf_counter()
+        try:
+            thumb = pygame.image.load(path)
+        except (OSError, pygame.error):
+            thumb = None
+        self.decodes += 1
+        self.decode_seconds += time.perf_counter() - start
+        self._ready(path)
+        return thumb
+
+    @staticmethod
+    def _ready(path):
+        if pygame.get_init():
+            pygame.event.post(pygame.event.Event(THUMBNAIL_READY, path=path))
+
+    def get(self, path):
+        """Return the thumbnail stored at `path`, or None while it loads (or if there is none)."""
+        thumb = self._cache.get(path)
+        if thumb is not None:
+            self._cache.move_to_end(path)
+            self.hits += 1
+            return thumb
+        if path in self._missing:
+            return None
+        job = self._jobs.get(path)
+        if job is None:
+            self.misses += 1
+            self._jobs[path] = self._executor.submit(self._decode, path)
+            return None
+        if not job.done():
+            return None
+        del self._jobs[path]
+        thumb = job.result()
+        if thumb is None:
+            self._missing.add(path)
+            return None
+        if pygame.display.get_surface():
+            thumb = thumb.convert()
+        self._cache[path] = thumb
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return thumb
+
+    def forget(self, path):
+        """Drop what is known about `path` (the slot was saved again or deleted)."""
+        self._cache.pop(path, None)
+        self._missing.discard(path)
+        job = self._jobs.pop(path, None)
+        if job is not None:
+            job.cancel()
+
+    def stats(self):
+        """Return cache counters and the average capture (main thread), encode and decode times (ms)."""
+        return {
+            'cached': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'avg_capture_ms': round(self.capture_seconds * 1000 / self.captures, 3) if self.captures else 0.0,
+            'avg_encode_ms': round(self.encode_seconds * 1000 / self.encodes, 2) if self.encodes else 0.0,
+            'avg_decode_ms': round(self.decode_seconds * 1000 / self.decodes, 2) if self.decodes else 0.0
+        }
+
+    def log_stats(self):
+        """Log the current counters."""
+        logging.info(f"Thumbnails: {self.stats()}")
+
+
+# Shared instance for SaveSystem and the load menu
+thumbnail_store = ThumbnailStore()
@@ -2,9 +2,8 @@ import os
 import sys
 import pygame
 import random
-
-# Initialize pygame
-pygame.init()
+from surface_cache import load_image
+from minigame_host import minigame_host, QUIT_GAME
 
 # Constants
 WIDTH, HEIGHT = 1535, 810
@@ -79,7 +78,8 @@ def run_graduated_tube_game():
     global WIDTH, HEIGHT  # Update WIDTH and HEIGHT dynamically for fullscreen
 
     # Screen setup
-    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)  # Fullscreen mode
+    pygame.init()  # No-op when started from the novel
+    screen = minigame_host.set_mode((0, 0), pygame.FULLSCREEN)  # Fullscreen mode
     WIDTH, HEIGHT = screen.get_size()  # Update WIDTH and HEIGHT to match fullscreen resolution
     pygame.display.set_caption("Graduated Tube Game")
 
@@ -90,8 +90,7 @@ def run_graduated_tube_game():
     title_font = pygame.font.Font(None, 72)
 
     # Load background image
-    background = pygame.image.load(os.path.join(os.path.dirname(__file__), "novaGarage.png"))
-    background = pygame.transform.scale(background, (WIDTH, HEIGHT))
+    background = load_image(os.path.join(os.path.dirname(__file__), "novaGarage.png"), (WIDTH, HEIGHT))
 
     # Button setup
     button_rect = pygame.Rect(WIDTH // 2 - 60, HEIGHT - 50, 120, 40)
@@ -116,7 +115,7 @@ def run_graduated_tube_game():
 
     # Main game loop
     running = True
-    clock = pygame.time.Clock()
+    clock = minigame_host.clock
     while running:
         screen.fill(WHITE)
 
@@ -126,7 +125,7 @@ def run_graduated_tube_game():
             draw_level_complete(screen, font, current_level)
         elif game_finished:
             draw_game_finished(screen, title_font)
-            pygame.display.flip()
+            minigame_host.flip()
             pygame.time.delay(2000)  # Wait for 2 seconds to show the "Game Done" message
             running = False  # Exit the game loop
         elif game_active:
@@ -134,9 +133,9 @@ def run_graduated_tube_game():
             screen.blit(background, (0, 0))
 
             # Event handling
-            for event in pygame.event.get():
+            for event in minigame_host.get_events():
                 if event.type == pygame.QUIT:
-                    running = False
+                    return QUIT_GAME
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and not stopped:
                     stopped = True
                     if TARGET_MIN <= green_value <= TARGET_MAX:
@@ -194,9 +193,9 @@ def run_graduated_tube_game():
                 screen.blit(button_text, (button_rect.x + 15, button_rect.y + 8))
 
         # Event handling for menu and level complete screens
-        for event in pygame.event.get():
+        for event in minigame_host.get_events():
             if event.type == pygame.QUIT:
-                running = False
+                return QUIT_GAME
             if menu_active and event.type == pygame.MOUSEBUTTONDOWN:
                 for i in range(1, 5):
                     button_y = 300 + i * 100
@@ -219,7 +218,7 @@ def run_graduated_tube_game():
                     level_complete = False
                     game_finished = True
 
-        pygame.display.flip()
+        minigame_host.flip()
         clock.tick(FPS)
 
     # Quit the game properly
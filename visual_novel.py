@@ -4,13 +4,19 @@ from scene_manager import SceneManager
 from state_manager import StateManager
 from dialogue_manager import DialogueManager
 from sound_manager import SoundManager
+from event_loop import wait_events
+from presenter import presenter
+from compositor import Compositor
+from font_registry import get_font
 
 class VisualNovel:
     def __init__(self, width=1280, height=720):
         logging.info("Initializing Visual Novel")
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
+        pygame.display.set_mode((width, height))
+        self.screen = presenter.open_canvas((width, height))
+        self.compositor = Compositor((width, height), fill=(0, 0, 0))  # Black background as fallback
         self.clock = pygame.time.Clock()
         self.running = True
 
@@ -49,8 +55,8 @@ class VisualNovel:
         )
         
         # Initialize fonts
-        self.font = pygame.font.SysFont('Arial', 28)
-        self.gui_font = pygame.font.SysFont('Arial', 20)
+        self.font = get_font('Arial', 28)
+        self.gui_font = get_font('Arial', 20)
 
         # Dialogue box setup
         self.dialogue_box_rect = pygame.Rect(0, height - 200, width, 200)
@@ -123,17 +129,60 @@ class VisualNovel:
         for alpha in range(0, 255, 5):
             fade_surface.set_alpha(alpha)
             self.screen.blit(fade_surface, (0, 0))
-            pygame.display.flip()
+            presenter.mark_all()
+            presenter.present()
+            self.compositor.invalidate()
             pygame.time.wait(int((duration * 1000) / 51))
         print("Fade screen effect completed")
 
-    def draw_gui_buttons(self):
-        """Draw GUI buttons including volume control."""
+    def build_chrome(self, is_muted, volume_on, volume_off):
+        """Return the dialogue box, GUI buttons and volume control as layer sprites."""
+        sprites = []
+        if self.current_text:
+            box = pygame.Surface(self.dialogue_box_rect.size).convert()
+            box.fill((255, 255, 255))
+            sprites.append((box, self.dialogue_box_rect.topleft))
         for button_name, button_rect in self.buttons.items():
-            pygame.draw.rect(self.screen, (200, 200, 200), button_rect)
+            button = pygame.Surface(button_rect.size).convert()
+            button.fill((200, 200, 200))
             text = self.gui_font.render(button_name.upper(), True, (0, 0, 0))
-            text_rect = text.get_rect(center=button_rect.center)
-            self.screen.blit(text, text_rect)
+            button.blit(text, text.get_rect(center=button.get_rect().center))
+            sprites.append((button, button_rect.topleft))
+        sprites.append((volume_off if is_muted else volume_on, self.sound_button_rect.topleft))
+        return sprites
+
+    def build_text(self):
+        """Return the current dialogue line as a layer sprite."""
+        if not self.current_text:
+            return []
+        return [(self.font.render(self.current_text, True, (0, 0, 0)), (20, self.height - 180))]
+
+    def current_background(self):
+        """Return the current scene's background, or None if it can't be drawn."""
+        try:
+            if (self.scene_manager and 
+                self.scene_manager.current_scene and 
+                hasattr(self.scene_manager.current_scene, 'background') and 
+                self.scene_manager.current_scene.background is not None):
+                
+                return self.scene_manager.current_scene.background
+            else:
+                missing_elements = []
+                if not self.scene_manager:
+                    missing_elements.append("scene_manager is None")
+                elif not self.scene_manager.current_scene:
+                    missing_elements.append("current_scene is None")
+                elif not hasattr(self.scene_manager.current_scene, 'background'):
+                    missing_elements.append("current_scene has no background attribute")
+                elif self.scene_manager.current_scene.background is None:
+                    missing_elements.append("background is None")
+                
+                print(f"Cannot draw background. Missing elements: {', '.join(missing_elements)}")
+        except Exception as e:
+            logging.error(f"Failed to draw scene: {e}")
+            print(f"ERROR drawing scene: {e}")
+        # Continue with black background
+        return None
 
     def handle_gui_click(self, pos):
         """Handle GUI button clicks."""
@@ -161,52 +210,23 @@ class VisualNovel:
             print("Setting initial scene to 'train'")
             self.scene_manager.change_scene("train")
         self.advance_script()
+        self.compositor.invalidate()
 
         while self.running:
-            self.screen.fill((0, 0, 0))  # Black background as fallback
-
-            # Draw current scene if exists
-            try:
-                if (self.scene_manager and 
-                    self.scene_manager.current_scene and 
-                    hasattr(self.scene_manager.current_scene, 'background') and 
-                    self.scene_manager.current_scene.background is not None):
-                    
-                    self.screen.blit(self.scene_manager.current_scene.background, (0, 0))                                        
-                else:
-                    missing_elements = []
-                    if not self.scene_manager:
-                        missing_elements.append("scene_manager is None")
-                    elif not self.scene_manager.current_scene:
-                        missing_elements.append("current_scene is None")
-                    elif not hasattr(self.scene_manager.current_scene, 'background'):
-                        missing_elements.append("current_scene has no background attribute")
-                    elif self.scene_manager.current_scene.background is None:
-                        missing_elements.append("background is None")
-                    
-                    print(f"Cannot draw background. Missing elements: {', '.join(missing_elements)}")
-            except Exception as e:
-                logging.error(f"Failed to draw scene: {e}")
-                print(f"ERROR drawing scene: {e}")
-                # Continue with black background
-
-            # Draw dialogue box if we have text
-            if self.current_text:
-                pygame.draw.rect(self.screen, (255, 255, 255), self.dialogue_box_rect)
-                text_surface = self.font.render(self.current_text, True, (0, 0, 0))
-                self.screen.blit(text_surface, (20, self.height - 180))
-
-            # Draw GUI components
-            self.draw_gui_buttons()
-            
-            # Draw sound button
-            self.screen.blit(
-                volume_off if is_muted else volume_on, 
-                self.sound_button_rect
-            )
-
-            # Handle events
-            for event in pygame.event.get():
+            # Each layer is only rebuilt when its inputs change
+            background = self.current_background()
+            self.compositor.set_layer('background', background,
+                                      lambda: [(background, (0, 0))] if background is not None else [])
+            self.compositor.set_layer('chrome', (bool(self.current_text), is_muted),
+                                      lambda: self.build_chrome(is_muted, volume_on, volume_off))
+            self.compositor.set_layer('text', self.current_text, self.build_text)
+
+            # Push only what changed since the last frame
+            self.compositor.compose(self.screen)
+            presenter.present()
+
+            # Handle events; only run timed frames while text is still animating
+            for event in wait_events(self.dialogue_manager.is_animating, self.clock):
                 if event.type == pygame.QUIT:
                     logging.info("Quit event received")
                     self.running = False
@@ -224,7 +244,4 @@ class VisualNovel:
                             self.waiting_for_click = False
                             self.advance_script()
 
-            pygame.display.flip()
-            self.clock.tick(60)
-
         logging.info("Visual novel game loop ended")
\ No newline at end of file